@@ -1,129 +1,419 @@
-from flask import Flask, render_template, request, session, redirect, url_for, send_file
-from scraper_enhanced import fetch_case_data
-import sqlite3
-from datetime import datetime
-import random
-import string
-from PIL import Image, ImageDraw, ImageFont
-import io
+from flask import Flask, render_template, request, redirect, url_for, send_file, jsonify, abort, Response, stream_with_context, g
+from scraper_enhanced import fetch_case_data, validate_case_input
+from suggest import build_default_index, party_names
+import cause_list
+from case_graph import build_default_graph
+from case_provider import EnhancedMockCaseData, data_version, full_record, is_full_record, project
+from serialization import EncodedCache
+from case_timeline import TimelineCache
+from case_id import CaseId
+from captcha_tokens import CaptchaTokens
+from rate_limiter import RateLimiter, rate_limited, build_backend
+from refresh_scheduler import CaseRefreshScheduler
+from court_shards import CourtShards
+from notifications import NotificationHub, sse_stream
+from document_store import DocumentStore, DocumentNotFound, DocumentUnavailable
+from extraction import DocumentSearch, document_urls
+from storage_router import StorageRouter
+from resilience import UpstreamUnavailable
+from captcha_render import captcha_png
+from traffic_capture import TrafficCapture
+from warmup import CacheWarmer, RenderedResults
 import os
+from datetime import date
 
 app = Flask(__name__)
-app.secret_key = 'your-secret-key-change-this-in-production'
-
-def generate_captcha_text(length=5):
-    """Generate a random alphanumeric CAPTCHA text"""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
-
-def create_captcha_image(text):
-    """Create a CAPTCHA image using PIL"""
-    # Create image with white background
-    width, height = 200, 80
-    image = Image.new('RGB', (width, height), 'white')
-    draw = ImageDraw.Draw(image)
-    
-    # Try to use a default font, fallback to basic if not available
-    try:
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 36)
-    except:
-        try:
-            font = ImageFont.load_default()
-        except:
-            font = None
-    
-    # Draw the text
-    text_width = draw.textlength(text, font=font) if font else len(text) * 20
-    text_height = 36
-    x = (width - text_width) // 2
-    y = (height - text_height) // 2
-    
-    # Draw text with some distortion
-    for i, char in enumerate(text):
-        char_x = x + i * 35 + random.randint(-5, 5)
-        char_y = y + random.randint(-5, 5)
-        draw.text((char_x, char_y), char, fill='black', font=font)
-    
-    # Add some noise lines
-    for _ in range(3):
-        x1 = random.randint(0, width)
-        y1 = random.randint(0, height)
-        x2 = random.randint(0, width)
-        y2 = random.randint(0, height)
-        draw.line([(x1, y1), (x2, y2)], fill='gray', width=1)
-    
-    return image
+app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-this-in-production')
+
+# Sampled requests to /, /captcha and /result for replay.py (TRAFFIC_SAMPLE_RATE)
+traffic_capture = TrafficCapture(app.secret_key)
+traffic_capture.init_app(app)
+
+# In-memory typeahead index, seeded with known cases and updated on lookups
+suggest_index = build_default_index()
+
+# Hearings per court and judge, by date, for cause-list views
+cause_list_index = cause_list.build_default_index()
+
+# Cases linked by shared citations, parties and advocates
+case_graph = build_default_graph()
+
+# Encoded JSON bodies of case records, reused until the record version changes
+encoded_cache = EncodedCache()
+
+# Proceedings and documents of recently requested cases, sorted for keyset paging
+timelines = TimelineCache()
+
+# Signed CAPTCHA tokens carry their own state, so no session is needed
+captcha_tokens = CaptchaTokens(app.secret_key)
+
+# Requests per minute and burst size per client, checked before any work
+limiter = RateLimiter({
+    'captcha': (30, 10),
+    'result': (10, 5)
+}, build_backend())
+
+# Query log writes go to queries.db; stats reads to a replica of it
+storage = StorageRouter()
+storage.start()
+
+# Per-court shards: each court has its own record cache (kept warm by the
+# refresh scheduler), versioned history database and bounded fetch pool
+CACHE_MAX_AGE = 6 * 60 * 60
+shards = CourtShards(fetch_case_data)
+
+# Pushes status/date/document changes to SSE clients and webhooks
+notification_hub = NotificationHub()
+notification_hub.start()
+
+def record_case(case_id, record):
+    """Track a freshly fetched record and notify subscribers of changes"""
+    if record.get('result') is False:
+        # "Not Found" is the absence of a case, not a version of one
+        return
+    # Indexes are fed complete records only; the lookup summary has no court,
+    # dates or real parties and would replace what they already hold
+    detail = full_record(case_id, record)
+    if detail is not None:
+        cause_list_index.add_case(case_id, detail)
+        case_graph.add_case(case_id, detail)
+        # Downloading and extraction are left to the offline extraction.py run
+        document_search.link_case(str(case_id), document_urls(detail))
+    version = shards.history(case_id).record(case_id, record)
+    # The first version is the initial snapshot, not a change
+    if version and version['version'] > 1:
+        notification_hub.publish(case_id, version)
+
+# Order/judgment PDFs, fetched from DOCUMENT_UPSTREAM once and cached on disk;
+# only documents some case links to are fetched
+document_store = DocumentStore(allow=lambda url: document_search.is_linked(url))
+
+# Full-text search over document text produced offline by extraction.py;
+# fetched cases are linked to their documents for its next run
+document_search = DocumentSearch(document_store)
+
+refresh_scheduler = CaseRefreshScheduler(shards.fetch, shards, on_record=record_case)
+if os.environ.get('CASE_REFRESH_ENABLED', '1') == '1':
+    refresh_scheduler.start()
+
+def fetch_fresh(case_id):
+    """Fetch a case upstream, then cache, record and watch it unless it is an error or not found"""
+    record = shards.fetch(*case_id.parts)
+    if 'error' not in record and record.get('result') is not False:
+        shards.put(case_id, record)
+        record_case(case_id, record)
+        refresh_scheduler.watch(case_id, record)
+    return record
+
+# Result pages of cached records, rendered once per record
+rendered_results = RenderedResults()
+
+def render_result(case_id, record):
+    html = rendered_results.get(case_id, record)
+    if html is None:
+        html = render_template('result.html', result=record)
+        # Stale fallbacks are built per request, so caching them would never hit;
+        # error and not-found pages would only push warmed pages out
+        if not record.get('stale') and 'error' not in record and record.get('result') is not False:
+            rendered_results.put(case_id, record, html)
+    return html
+
+def warm_case(case_id):
+    """Resolve a case through the fetch path and pre-render its result page"""
+    record = shards.get(case_id, CACHE_MAX_AGE) or fetch_fresh(case_id)
+    if 'error' in record or record.get('result') is False:
+        return False
+    with app.test_request_context('/result', method='POST'):
+        render_result(case_id, record)
+    return True
+
+# Top searched cases of the last WARMUP_DAYS days, resolved on boot (WARMUP_TOP=0 disables)
+warmer = CacheWarmer(
+    lambda: [CaseId.of(*row) for row in storage.top_cases(int(os.environ.get('WARMUP_DAYS', 7)),
+                                                          int(os.environ.get('WARMUP_TOP', 100)))],
+    warm_case,
+    concurrency=int(os.environ.get('WARMUP_CONCURRENCY', 4)),
+    timeout=float(os.environ.get('WARMUP_TIMEOUT', 120)))
+if int(os.environ.get('WARMUP_TOP', 100)) > 0:
+    warmer.start()
 
 @app.route('/')
 def index():
-    # Generate new CAPTCHA for each page load
-    captcha_text = generate_captcha_text()
-    session['captcha'] = captcha_text
-    return render_template('index.html')
+    # Issue a new CAPTCHA token for each page load
+    return render_template('index.html', captcha_token=captcha_tokens.issue())
 
 @app.route('/captcha')
+@rate_limited(limiter, 'captcha')
 def captcha_image():
-    """Serve the CAPTCHA image"""
-    captcha_text = session.get('captcha', '')
+    """Serve the CAPTCHA image for a signed token"""
+    captcha_text = captcha_tokens.text_for(request.args.get('token', ''))
     if not captcha_text:
-        captcha_text = generate_captcha_text()
-        session['captcha'] = captcha_text
+        abort(400)
     
-    image = create_captcha_image(captcha_text)
-    img_io = io.BytesIO()
-    image.save(img_io, 'PNG')
-    img_io.seek(0)
-    return send_file(img_io, mimetype='image/png')
+    return Response(captcha_png(captcha_text), mimetype='image/png')
+
+@app.route('/captcha/token')
+@rate_limited(limiter, 'captcha')
+def captcha_token():
+    """Issue a fresh CAPTCHA token for the refresh button"""
+    return jsonify(token=captcha_tokens.issue())
+
+@app.route('/suggest')
+def suggest():
+    """Return typeahead matches for case ids and party names"""
+    query = request.args.get('q', '')
+    limit = min(max(request.args.get('k', 8, type=int), 1), 25)
+    return jsonify(suggestions=suggest_index.search(query, limit))
+
+@app.route('/history/<path:case_id>')
+def history(case_id):
+    """What changed for a case since a version number or timestamp"""
+    try:
+        case_id = CaseId.parse(case_id)
+    except ValueError:
+        abort(404)
+    since = request.args.get('since', '0')
+    since = int(since) if since.isdigit() else since
+    case_history = shards.history(case_id)
+    return jsonify(case_id=str(case_id),
+                   version=case_history.latest_version(case_id),
+                   versions=case_history.changes_since(case_id, since))
+
+def fetched_record(case_id):
+    """The fetched record the API serves over the stored one, if any
+
+    /result shows the last fetch, so a complete fetched record wins; a summary
+    is served only for cases with no stored record at all.
+    """
+    record = shards.get(case_id, float('inf'))
+    if record is None or 'error' in record:
+        return None
+    if is_full_record(record) or not EnhancedMockCaseData.has_record(case_id):
+        return record
+    return None
+
+@app.route('/api/cases/<path:case_id>')
+def api_case(case_id):
+    """A case record as JSON; ?fields=parties,judgment.outcome returns only those fields"""
+    try:
+        case_id = CaseId.parse(case_id)
+    except ValueError:
+        abort(404)
+    fields = sorted({field.strip() for field in request.args.get('fields', '').split(',') if field.strip()})
+    fetched = fetched_record(case_id)
+    if fetched is not None:
+        # Fetched records have no version; the entry lives as long as the record object
+        encoded = encoded_cache.get((case_id, 'fetched', tuple(fields)),
+                                    lambda: project(fetched, fields) if fields else fetched, source=fetched)
+    else:
+        if fields:
+            build = lambda: EnhancedMockCaseData.get_fields(case_id, fields)
+        else:
+            build = lambda: EnhancedMockCaseData.get_record(case_id)
+        encoded = encoded_cache.get((case_id, data_version(), tuple(fields)), build)
+    if encoded is None:
+        abort(404)
+    return encoded_json_response(encoded)
+
+@app.route('/api/cases/<path:case_id>/<any(proceedings, documents):kind>')
+def case_timeline(case_id, kind):
+    """A page of a case's proceedings or documents, newest first; ?cursor= continues from the last page"""
+    try:
+        case_id = CaseId.parse(case_id)
+    except ValueError:
+        abort(404)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    fetched = fetched_record(case_id)
+    if fetched is not None:
+        timeline = timelines.get((case_id, 'fetched', kind), lambda: fetched.get(kind) or [], source=fetched)
+    else:
+        def load():
+            partial = EnhancedMockCaseData.get_fields(case_id, [kind])
+            return partial.get(kind) or [] if partial is not None else None
+
+        timeline = timelines.get((case_id, data_version(), kind), load)
+    if timeline is None:
+        abort(404)
+    try:
+        page = timeline.page(request.args.get('cursor'), limit)
+    except ValueError:
+        abort(400)
+    return jsonify(case_id=str(case_id), **{kind: page['items']},
+                   total=page['total'], next_cursor=page['next_cursor'])
+
+def encoded_json_response(encoded):
+    """Serve cached JSON bytes, gzipped when the client accepts it, with ETag revalidation"""
+    if 'gzip' in request.accept_encodings:
+        response = Response(encoded.gzipped(), mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(encoded.etag + '-gz')
+    else:
+        response = Response(encoded.body, mimetype='application/json')
+        response.set_etag(encoded.etag)
+    response.vary.add('Accept-Encoding')
+    return response.make_conditional(request)
+
+@app.route('/related/<path:case_id>')
+def related(case_id):
+    """Related cases, or everything within k hops when k > 1"""
+    try:
+        case_id = CaseId.parse(case_id)
+    except ValueError:
+        abort(404)
+    k = min(max(request.args.get('k', 1, type=int), 1), 3)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    if k == 1:
+        return jsonify(case_id=str(case_id), related=case_graph.related(case_id, limit))
+    return jsonify(case_id=str(case_id), related=case_graph.k_hop(case_id, k, limit))
+
+@app.route('/events')
+def events():
+    """Server-Sent Events stream of changes for the given case ids"""
+    try:
+        case_ids = [CaseId.parse(case_id) for case_id in request.args.getlist('case_id')]
+    except ValueError:
+        abort(400)
+    if not case_ids:
+        abort(400)
+    for case_id in case_ids:
+        refresh_scheduler.watch(case_id)
+    return Response(stream_with_context(sse_stream(notification_hub, case_ids)),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/subscriptions', methods=['POST'])
+def create_subscription():
+    """Register a webhook URL for change notifications on some case ids"""
+    data = request.get_json(silent=True) or {}
+    url = data.get('url', '')
+    try:
+        case_ids = [CaseId.parse(case_id) for case_id in data.get('case_ids') or []]
+    except ValueError:
+        case_ids = []
+    if not url.startswith(('http://', 'https://')) or not case_ids:
+        return jsonify(error="A webhook url and valid case_ids are required"), 400
+    if not notification_hub.url_allowed(url):
+        return jsonify(error="Webhooks must point at a public address"), 400
+    for case_id in case_ids:
+        refresh_scheduler.watch(case_id)
+    return jsonify(id=notification_hub.add_webhook(url, case_ids)), 201
+
+@app.route('/subscriptions/<sub_id>', methods=['DELETE'])
+def delete_subscription(sub_id):
+    """Remove a webhook subscription"""
+    if not notification_hub.remove_webhook(sub_id):
+        abort(404)
+    return '', 204
+
+@app.route('/documents/<path:doc_path>')
+def document(doc_path):
+    """Serve a cached order or judgment PDF, with HTTP Range support"""
+    for attempt in range(2):
+        try:
+            path = document_store.get('/' + doc_path)
+        except DocumentUnavailable:
+            abort(502)
+        except DocumentNotFound:
+            abort(404)
+        try:
+            # send_file hands the open file to the server's file wrapper (sendfile)
+            # and answers Range / If-None-Match requests itself
+            return send_file(path, mimetype='application/pdf', conditional=True,
+                             download_name=os.path.basename(doc_path), max_age=24 * 60 * 60)
+        except FileNotFoundError:
+            # Another worker evicted the blob after the lookup; the next get fetches it again
+            continue
+    abort(404)
+
+@app.route('/search')
+def search():
+    """Find cases by text inside their orders and judgments"""
+    query = request.args.get('q', '')
+    return jsonify(results=document_search.search(query))
+
+def _date_arg(name, default=None):
+    """Day ordinal from a DD-MM-YYYY or ISO query argument; 400 if malformed"""
+    value = request.args.get(name)
+    if not value:
+        return default
+    ordinal = cause_list.date_ordinal(value)
+    if ordinal is None:
+        abort(400)
+    return ordinal
+
+@app.route('/cause-list/court/<court>')
+def court_cause_list(court):
+    """All hearings and other dated events in a court between two dates"""
+    today = date.today().toordinal()
+    start = _date_arg('from', today)
+    end = _date_arg('to', start + 30)
+    return jsonify(court=court, events=cause_list_index.court_range(court, start, end))
+
+@app.route('/cause-list/judge/<judge>')
+def judge_cause_list(judge):
+    """A judge's daily cause list"""
+    day = _date_arg('date', date.today().toordinal())
+    return jsonify(judge=judge, date=date.fromordinal(day).isoformat(),
+                   events=cause_list_index.judge_day(judge, day))
+
+@app.route('/ready')
+def ready():
+    """Readiness probe: 503 until the boot-time cache warm-up has finished or timed out"""
+    return jsonify(ready=warmer.ready, warmup=warmer.status()), 200 if warmer.ready else 503
+
+@app.route('/stats')
+def stats():
+    """Query log aggregates, served from the read replica"""
+    days = min(max(request.args.get('days', 30, type=int), 1), 365)
+    return jsonify(storage.stats(days))
 
 @app.route('/result', methods=['POST'])
+@rate_limited(limiter, 'result')
 def result():
-    # Verify CAPTCHA
-    user_captcha = request.form.get('captcha', '').upper()
-    session_captcha = session.get('captcha', '')
+    # Verify CAPTCHA (tokens are single-use, even on a wrong answer)
+    user_captcha = request.form.get('captcha', '')
+    token = request.form.get('captcha_token', '')
     
-    if not user_captcha or user_captcha != session_captcha:
-        # Generate new CAPTCHA for retry
-        captcha_text = generate_captcha_text()
-        session['captcha'] = captcha_text
-        return render_template('index.html', error="Invalid CAPTCHA. Please try again.")
+    if not user_captcha or not captcha_tokens.verify(token, user_captcha):
+        g.captcha_failed = True
+        return render_template('index.html', error="Invalid CAPTCHA. Please try again.",
+                               captcha_token=captcha_tokens.issue())
     
     case_type = request.form.get("case_type")
     case_number = request.form['case_number']
     filing_year = request.form['filing_year']
-    result_data = fetch_case_data(case_type, case_number, filing_year)
+    # Validate the raw input: a CaseId would turn a missing type into "NONE"
+    errors = validate_case_input(case_type, case_number, filing_year)
+    if errors:
+        return render_template('index.html', error='; '.join(errors), captcha_token=captcha_tokens.issue())
+    case_id = CaseId.of(case_type, case_number, filing_year)
+    result_data = shards.get(case_id, CACHE_MAX_AGE)
+    if result_data is None:
+        try:
+            result_data = fetch_fresh(case_id)
+        except UpstreamUnavailable:
+            # Portal down or its breaker open: serve the last known record, marked stale
+            last_known = shards.get(case_id, float('inf')) or shards.history(case_id).latest_record(case_id)
+            if last_known is None:
+                return render_template('index.html', error="The court portal is not responding. Please try again shortly.",
+                                       captcha_token=captcha_tokens.issue()), 503
+            result_data = dict(last_known, stale=True)
+    if 'error' in result_data:
+        return render_template('index.html', error=result_data['error'], captcha_token=captcha_tokens.issue()), 502
 
-    # Save query to SQLite with backward compatibility
-    conn = sqlite3.connect('queries.db')
-    c = conn.cursor()
-    
-    # Check if table exists and get its schema
-    c.execute("PRAGMA table_info(queries)")
-    columns = [column[1] for column in c.fetchall()]
-    
-    # Create table with basic schema if it doesn't exist
-    if not columns:
-        c.execute("""CREATE TABLE IF NOT EXISTS queries (
-            id INTEGER PRIMARY KEY AUTOINCREMENT, 
-            case_type TEXT, 
-            case_number TEXT, 
-            year TEXT, 
-            timestamp TEXT
-        )""")
-        columns = ['id', 'case_type', 'case_number', 'year', 'timestamp']
-    
-    # Prepare data for insertion
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # Insert basic data (backward compatible)
-    c.execute("INSERT INTO queries (case_type, case_number, year, timestamp) VALUES (?, ?, ?, ?)",
-              (case_type, case_number, filing_year, timestamp))
-    conn.commit()
-    conn.close()
-
-    # Generate new CAPTCHA for next use
-    captcha_text = generate_captcha_text()
-    session['captcha'] = captcha_text
-    
-    return render_template('result.html', result=result_data)
+    # Keep the typeahead index up to date with cases that were found, using the
+    # same party names as at startup rather than the summary's placeholders
+    if result_data.get('result'):
+        detail = full_record(case_id, result_data)
+        suggest_index.add_case(case_id, party_names(detail) if detail is not None else ())
+
+    # Log the canonical form, so ' cr ' and 'CR' count as the same case
+    storage.log_query(*case_id.parts)
+
+    if result_data.get('result') is False:
+        return render_result(case_id, result_data), 404
+    return render_result(case_id, result_data)
 
 if __name__ == '__main__':
     app.run(debug=True, port=8080)
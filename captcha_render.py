@@ -0,0 +1,113 @@
+"""
+CAPTCHA image renderer
+Each glyph of the CAPTCHA alphabet is rasterized once into a mask atlas; an
+image is then just jittered mask copies into a small index array plus a few
+noise lines, written as a 2-bit palette PNG (white, gray, black).
+"""
+
+import io
+import random
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from captcha_tokens import CAPTCHA_ALPHABET
+
+WIDTH, HEIGHT = 200, 80
+FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+FONT_SIZE = 36
+# Text starts this far from the top before jitter, as in the original renderer
+TEXT_TOP = (HEIGHT - FONT_SIZE) // 2
+GLYPH_SPACING = 35
+JITTER = 5
+
+# Palette indices
+WHITE, GRAY, BLACK = 0, 1, 2
+PALETTE = [255, 255, 255, 128, 128, 128, 0, 0, 0, 0, 0, 0]
+
+
+def _load_font():
+    try:
+        return ImageFont.truetype(FONT_PATH, FONT_SIZE)
+    except OSError:
+        return ImageFont.load_default()
+
+
+class GlyphAtlas:
+    """Boolean masks and advance widths for every CAPTCHA glyph"""
+
+    def __init__(self, alphabet: str = CAPTCHA_ALPHABET):
+        font = _load_font()
+        self.cell = (FONT_SIZE + 12, FONT_SIZE + 4)
+        self.masks: Dict[str, np.ndarray] = {}
+        self.advances: Dict[str, float] = {}
+        for char in alphabet:
+            glyph = Image.new('L', self.cell, 0)
+            draw = ImageDraw.Draw(glyph)
+            draw.text((0, 0), char, fill=255, font=font)
+            self.masks[char] = np.asarray(glyph) >= 128
+            self.advances[char] = draw.textlength(char, font=font)
+
+
+_atlas: Optional[GlyphAtlas] = None
+_atlas_lock = threading.Lock()
+
+
+def get_atlas() -> GlyphAtlas:
+    """The shared atlas, rasterized on first use"""
+    global _atlas
+    if _atlas is None:
+        with _atlas_lock:
+            if _atlas is None:
+                _atlas = GlyphAtlas()
+    return _atlas
+
+
+def _blit(canvas: np.ndarray, mask: np.ndarray, x: int, y: int):
+    """Paint a glyph mask black at (x, y), clipped to the canvas"""
+    height, width = mask.shape
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + width, WIDTH), min(y + height, HEIGHT)
+    if x0 >= x1 or y0 >= y1:
+        return
+    region = canvas[y0:y1, x0:x1]
+    region[mask[y0 - y:y1 - y, x0 - x:x1 - x]] = BLACK
+
+
+def _line(canvas: np.ndarray, start: Tuple[int, int], end: Tuple[int, int]):
+    """Draw a one pixel gray line"""
+    steps = max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 1
+    xs = np.linspace(start[0], end[0], steps).round().astype(np.intp)
+    ys = np.linspace(start[1], end[1], steps).round().astype(np.intp)
+    inside = (xs < WIDTH) & (ys < HEIGHT)
+    canvas[ys[inside], xs[inside]] = GRAY
+
+
+def render_captcha(text: str, rng: random.Random = random) -> np.ndarray:
+    """Palette index array (HEIGHT x WIDTH) for a CAPTCHA"""
+    atlas = get_atlas()
+    canvas = np.zeros((HEIGHT, WIDTH), dtype=np.uint8)
+    text_width = sum(atlas.advances[char] for char in text)
+    x = int((WIDTH - text_width) // 2)
+    for i, char in enumerate(text):
+        _blit(canvas, atlas.masks[char],
+              x + i * GLYPH_SPACING + rng.randint(-JITTER, JITTER),
+              TEXT_TOP + rng.randint(-JITTER, JITTER))
+
+    # A few noise lines across the text
+    for _ in range(3):
+        _line(canvas, (rng.randint(0, WIDTH), rng.randint(0, HEIGHT)),
+              (rng.randint(0, WIDTH), rng.randint(0, HEIGHT)))
+    return canvas
+
+
+def captcha_png(text: str) -> bytes:
+    """Encode a CAPTCHA as a 2-bit palette PNG"""
+    # putpalette turns the grayscale index image into a palette image
+    image = Image.fromarray(render_captcha(text))
+    image.putpalette(PALETTE)
+    out = io.BytesIO()
+    image.save(out, 'PNG', bits=2)
+    return out.getvalue()
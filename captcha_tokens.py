@@ -0,0 +1,98 @@
+"""
+Stateless signed CAPTCHA tokens
+The CAPTCHA text is derived from the token itself, so any worker holding the
+secret key can render and verify it without a shared session store
+"""
+
+import base64
+import hashlib
+import hmac
+import heapq
+import secrets
+import string
+import threading
+import time
+from typing import Optional
+
+CAPTCHA_ALPHABET = string.ascii_uppercase + string.digits
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+class ExpiringSet:
+    """Set of used token nonces that forgets entries once they expire"""
+
+    def __init__(self):
+        self._expiry = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def _purge(self, now: float):
+        while self._heap and self._heap[0][0] <= now:
+            expires, nonce = heapq.heappop(self._heap)
+            if self._expiry.get(nonce) == expires:
+                del self._expiry[nonce]
+
+    def add(self, nonce: str, expires: float) -> bool:
+        """Add a nonce; returns False if it was already present"""
+        with self._lock:
+            self._purge(time.time())
+            if nonce in self._expiry:
+                return False
+            self._expiry[nonce] = expires
+            heapq.heappush(self._heap, (expires, nonce))
+            return True
+
+
+class CaptchaTokens:
+    """Issue and verify HMAC-signed, expiring, single-use CAPTCHA tokens"""
+
+    def __init__(self, secret_key: str, ttl: int = 300, length: int = 5):
+        self._key = hashlib.sha256(secret_key.encode('utf-8')).digest()
+        self.ttl = ttl
+        self.length = length
+        self._used = ExpiringSet()
+
+    def _mac(self, purpose: bytes, payload: str) -> bytes:
+        return hmac.new(self._key, purpose + payload.encode('ascii'), hashlib.sha256).digest()
+
+    def issue(self) -> str:
+        """Create a new token of the form nonce.expires.signature"""
+        payload = f"{secrets.token_urlsafe(9)}.{int(time.time()) + self.ttl}"
+        return f"{payload}.{_b64(self._mac(b'sig:', payload)[:16])}"
+
+    def _open(self, token: str):
+        """Return (nonce, expires) for a valid, unexpired token, else None"""
+        if not isinstance(token, str) or not token.isascii():
+            return None
+        try:
+            nonce, expires, signature = token.split('.')
+            expires = int(expires)
+        except (AttributeError, ValueError):
+            return None
+        expected = _b64(self._mac(b'sig:', f"{nonce}.{expires}")[:16])
+        if not hmac.compare_digest(signature, expected) or expires < time.time():
+            return None
+        return nonce, expires
+
+    def text_for(self, token: str) -> Optional[str]:
+        """Derive the CAPTCHA text for a token, or None if the token is invalid"""
+        opened = self._open(token)
+        if not opened:
+            return None
+        digest = self._mac(b'text:', opened[0])
+        return ''.join(CAPTCHA_ALPHABET[b % len(CAPTCHA_ALPHABET)] for b in digest[:self.length])
+
+    def verify(self, token: str, answer: str) -> bool:
+        """Check an answer against a token, consuming the token either way"""
+        opened = self._open(token)
+        if not opened or not self._used.add(*opened):
+            return False
+        text = self.text_for(token)
+        # compare_digest only takes ASCII str, and answers are user input
+        return hmac.compare_digest((answer or '').strip().upper().encode('utf-8'), text.encode('ascii'))
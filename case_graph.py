@@ -0,0 +1,207 @@
+"""
+Related-case graph over shared citations, parties and advocates
+Cases and the things they mention (citations, party names, advocates) form a
+bipartite graph stored as two CSR arrays: case -> links and link -> cases.
+Updates land in a small delta overlay that is folded back into the arrays once
+it grows, so lookups never run a join and stay at a few array slices per hop.
+"""
+
+import heapq
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, Any, List, Set, Tuple, Union
+
+import numpy as np
+
+from case_id import CaseId
+from suggest import party_names
+
+# How much one shared link of each kind says about two cases being related
+LINK_WEIGHTS = {'citation': 3.0, 'advocate': 1.0, 'party': 2.0}
+
+
+def _normalize(text: str) -> str:
+    return ' '.join(str(text).upper().split())
+
+
+def _advocate(name: str) -> str:
+    return re.sub(r'^(ADV\.?|ADVOCATE)\s+', '', _normalize(name))
+
+
+def case_links(record: Dict[str, Any]) -> Set[str]:
+    """'kind:value' links of a record: its citations, party names and advocates"""
+    links = {f"citation:{_normalize(c)}" for c in record.get('citations') or [] if c}
+    links.update(f"party:{_normalize(name)}" for name in party_names(record))
+
+    advocates = [record.get('advocate')]
+    for party in (record.get('parties') or {}).values():
+        for member in party if isinstance(party, list) else [party]:
+            if isinstance(member, dict):
+                advocates.append(member.get('represented_by'))
+    links.update(f"advocate:{_advocate(a)}" for a in advocates if isinstance(a, str) and a.strip())
+    return links
+
+
+class CaseGraph:
+    """CSR adjacency between cases and links with an incremental delta overlay"""
+
+    def __init__(self, max_fanout: int = 500, compact_threshold: int = 1024):
+        # Links shared by more cases than this (e.g. "State of Haryana") say nothing
+        self.max_fanout = max_fanout
+        self.compact_threshold = compact_threshold
+        self._case_ids: List[str] = []
+        self._case_index: Dict[str, int] = {}
+        self._link_names: List[str] = []
+        self._link_index: Dict[str, int] = {}
+        self._link_weights: List[float] = []
+        # Compacted CSR arrays
+        self._case_ptr = np.zeros(1, dtype=np.int64)
+        self._case_links = np.zeros(0, dtype=np.int32)
+        self._link_ptr = np.zeros(1, dtype=np.int64)
+        self._link_cases = np.zeros(0, dtype=np.int32)
+        # Cases changed since the last compaction, and the link memberships they added
+        self._delta_links: Dict[int, frozenset] = {}
+        self._delta_members: Dict[int, Set[int]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._case_ids)
+
+    def _id(self, table: Dict[str, int], names: List[str], name: str) -> int:
+        index = table.get(name)
+        if index is None:
+            index = table[name] = len(names)
+            names.append(name)
+        return index
+
+    def add_case(self, case_id: Union[CaseId, str], record: Dict[str, Any]):
+        """Add a case or replace its links"""
+        case_id = str(CaseId.parse(case_id))
+        links = case_links(record)
+        with self._lock:
+            case = self._id(self._case_index, self._case_ids, case_id)
+            link_ids = []
+            for link in links:
+                index = self._id(self._link_index, self._link_names, link)
+                if index == len(self._link_weights):
+                    self._link_weights.append(LINK_WEIGHTS[link.split(':', 1)[0]])
+                link_ids.append(index)
+                self._delta_members[index].add(case)
+            self._delta_links[case] = frozenset(link_ids)
+            # Grow the threshold with the graph so compaction cost stays amortized O(1)
+            if len(self._delta_links) >= max(self.compact_threshold, len(self._case_ids) // 8):
+                self.compact()
+
+    def _links_of(self, case: int) -> List[int]:
+        links = self._delta_links.get(case)
+        if links is not None:
+            return list(links)
+        if case + 1 < len(self._case_ptr):
+            return self._case_links[self._case_ptr[case]:self._case_ptr[case + 1]].tolist()
+        return []
+
+    def _fanout(self, link: int) -> int:
+        """Upper bound on the number of cases with a link, without building the set"""
+        base = int(self._link_ptr[link + 1] - self._link_ptr[link]) if link + 1 < len(self._link_ptr) else 0
+        return base + len(self._delta_members.get(link, ()))
+
+    def _members(self, link: int) -> Set[int]:
+        members = set()
+        if link + 1 < len(self._link_ptr):
+            for case in self._link_cases[self._link_ptr[link]:self._link_ptr[link + 1]].tolist():
+                # A re-indexed case may have dropped this link since compaction
+                if case not in self._delta_links:
+                    members.add(case)
+        members.update(case for case in self._delta_members.get(link, ())
+                       if link in self._delta_links[case])
+        return members
+
+    def compact(self):
+        """Fold the delta overlay into fresh CSR arrays"""
+        with self._lock:
+            # Edge list: compacted edges of unchanged cases plus every delta edge
+            base_cases = np.repeat(np.arange(len(self._case_ptr) - 1, dtype=np.int32), np.diff(self._case_ptr))
+            changed = np.fromiter(self._delta_links, dtype=np.int32, count=len(self._delta_links))
+            keep = ~np.isin(base_cases, changed)
+            delta_cases = np.fromiter((case for case, links in self._delta_links.items() for _ in links), dtype=np.int32)
+            delta_links = np.fromiter((link for links in self._delta_links.values() for link in links), dtype=np.int32)
+            edge_cases = np.concatenate([base_cases[keep], delta_cases])
+            edge_links = np.concatenate([self._case_links[keep], delta_links])
+
+            case_count, link_count = len(self._case_ids), len(self._link_names)
+            by_case = np.lexsort((edge_links, edge_cases))
+            case_ptr = np.zeros(case_count + 1, dtype=np.int64)
+            np.cumsum(np.bincount(edge_cases, minlength=case_count), out=case_ptr[1:])
+            # Transpose: the same edges sorted by link give link -> cases
+            by_link = np.lexsort((edge_cases, edge_links))
+            link_ptr = np.zeros(link_count + 1, dtype=np.int64)
+            np.cumsum(np.bincount(edge_links, minlength=link_count), out=link_ptr[1:])
+
+            self._case_ptr, self._case_links = case_ptr, edge_links[by_case]
+            self._link_ptr, self._link_cases = link_ptr, edge_cases[by_link]
+            self._delta_links = {}
+            self._delta_members = defaultdict(set)
+
+    def _neighbours(self, case: int) -> Dict[int, Tuple[float, List[int]]]:
+        """Directly related cases -> (score, shared links)"""
+        related: Dict[int, Tuple[float, List[int]]] = {}
+        for link in self._links_of(case):
+            if self._fanout(link) > self.max_fanout:
+                continue
+            members = self._members(link)
+            weight = self._link_weights[link]
+            for other in members:
+                if other != case:
+                    score, shared = related.get(other, (0.0, []))
+                    related[other] = (score + weight, shared + [link])
+        return related
+
+    def related(self, case_id: Union[CaseId, str], limit: int = 20) -> List[Dict[str, Any]]:
+        """Cases sharing links with this one, strongest first"""
+        with self._lock:
+            case = self._case_index.get(str(case_id))
+            if case is None:
+                return []
+            related = self._neighbours(case)
+            best = heapq.nlargest(limit, related.items(), key=lambda item: (item[1][0], -item[0]))
+            return [{'case_id': self._case_ids[other], 'score': score,
+                     'via': [self._link_names[link] for link in shared]}
+                    for other, (score, shared) in best]
+
+    def k_hop(self, case_id: Union[CaseId, str], k: int = 2, limit: int = 100) -> List[Dict[str, Any]]:
+        """Cases reachable within k related-case hops, nearest first"""
+        with self._lock:
+            start = self._case_index.get(str(case_id))
+            if start is None:
+                return []
+            seen = {start: 0}
+            frontier = [start]
+            for hop in range(1, k + 1):
+                next_frontier = []
+                for case in frontier:
+                    for other in self._neighbours(case):
+                        if other not in seen:
+                            seen[other] = hop
+                            next_frontier.append(other)
+                            if len(seen) > limit:
+                                break
+                frontier = next_frontier
+                if not frontier or len(seen) > limit:
+                    break
+            del seen[start]
+            return [{'case_id': self._case_ids[case], 'hops': hops}
+                    for case, hops in sorted(seen.items(), key=lambda item: item[1])[:limit]]
+
+
+def build_default_graph() -> CaseGraph:
+    """Build a graph seeded with the known mock cases"""
+    from case_provider import EnhancedMockCaseData
+
+    graph = CaseGraph()
+    for test_data in EnhancedMockCaseData.TEST_CASES.values():
+        record = EnhancedMockCaseData.get_mock_data(
+            test_data['case_type'], test_data['case_number'], test_data['filing_year'])
+        graph.add_case(record['case_id'], record)
+    graph.compact()
+    return graph
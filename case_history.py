@@ -0,0 +1,135 @@
+"""
+Versioned case history
+Each fetched record is fingerprinted; a new version is stored only when the
+record actually changed, and only as a structural diff against the previous one
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Union
+
+
+def canonical_json(value: Any) -> str:
+    """Stable JSON encoding used for fingerprints and list item identity"""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def fingerprint(record: Dict[str, Any]) -> str:
+    return hashlib.sha256(canonical_json(record).encode('utf-8')).hexdigest()
+
+
+def diff_records(old: Any, new: Any, path: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Structural diff: changed fields, and items added/removed from lists"""
+    path = path or []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in sorted(set(old) | set(new), key=str):
+            if key not in new:
+                changes.append({'op': 'remove', 'path': path + [key], 'old': old[key]})
+            elif key not in old:
+                changes.append({'op': 'set', 'path': path + [key], 'new': new[key]})
+            elif old[key] != new[key]:
+                changes.extend(diff_records(old[key], new[key], path + [key]))
+        return changes
+
+    if isinstance(old, list) and isinstance(new, list):
+        # Proceedings, documents etc. are compared as collections of items
+        old_items = {canonical_json(item): item for item in old}
+        new_items = {canonical_json(item): item for item in new}
+        changes = [{'op': 'add', 'path': path, 'item': new_items[key]}
+                   for key in new_items if key not in old_items]
+        changes += [{'op': 'remove', 'path': path, 'old': old_items[key]}
+                    for key in old_items if key not in new_items]
+        return changes
+
+    return [{'op': 'set', 'path': path, 'old': old, 'new': new}]
+
+
+class CaseHistory:
+    """Stores case versions as diffs and answers "what changed since" queries"""
+
+    def __init__(self, db_path: str = 'queries.db', router=None):
+        # With a StorageRouter, writes go to its primary and reads to its replica
+        self.db_path = router.primary_path if router else db_path
+        self.router = router
+        self._lock = threading.Lock()
+        # case_id -> (version, fingerprint) of the latest stored version
+        self._heads: Dict[str, tuple] = {}
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""CREATE TABLE IF NOT EXISTS case_heads (
+            case_id TEXT PRIMARY KEY,
+            version INTEGER,
+            fingerprint TEXT,
+            record TEXT
+        )""")
+        conn.execute("""CREATE TABLE IF NOT EXISTS case_versions (
+            case_id TEXT,
+            version INTEGER,
+            fingerprint TEXT,
+            recorded_at TEXT,
+            diff TEXT,
+            PRIMARY KEY (case_id, version)
+        )""")
+        conn.commit()
+        conn.close()
+
+    def record(self, case_id: str, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Store a fetched record; returns the new version, or None if nothing changed"""
+        new_fingerprint = fingerprint(record)
+        head = self._heads.get(case_id)
+        if head and head[1] == new_fingerprint:
+            return None
+
+        with self._lock:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                row = conn.execute("SELECT version, fingerprint, record FROM case_heads WHERE case_id = ?",
+                                   (case_id,)).fetchone()
+                if row and row[1] == new_fingerprint:
+                    self._heads[case_id] = (row[0], row[1])
+                    return None
+
+                version = row[0] + 1 if row else 1
+                changes = diff_records(json.loads(row[2]) if row else {}, record)
+                recorded_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                conn.execute("INSERT INTO case_versions (case_id, version, fingerprint, recorded_at, diff) VALUES (?, ?, ?, ?, ?)",
+                             (case_id, version, new_fingerprint, recorded_at, canonical_json(changes)))
+                conn.execute("INSERT OR REPLACE INTO case_heads (case_id, version, fingerprint, record) VALUES (?, ?, ?, ?)",
+                             (case_id, version, new_fingerprint, canonical_json(record)))
+                conn.commit()
+            finally:
+                conn.close()
+            self._heads[case_id] = (version, new_fingerprint)
+            return {'version': version, 'recorded_at': recorded_at, 'changes': changes}
+
+    def _read(self) -> sqlite3.Connection:
+        return self.router.read() if self.router else sqlite3.connect(self.db_path)
+
+    def latest_version(self, case_id: str) -> int:
+        conn = self._read()
+        row = conn.execute("SELECT version FROM case_heads WHERE case_id = ?", (case_id,)).fetchone()
+        conn.close()
+        return row[0] if row else 0
+
+    def latest_record(self, case_id: str) -> Optional[Dict[str, Any]]:
+        """The most recently stored record for a case, if any"""
+        conn = self._read()
+        row = conn.execute("SELECT record FROM case_heads WHERE case_id = ?", (case_id,)).fetchone()
+        conn.close()
+        return json.loads(row[0]) if row else None
+
+    def changes_since(self, case_id: str, since: Union[int, str] = 0) -> List[Dict[str, Any]]:
+        """Versions after a version number or a 'YYYY-MM-DD HH:MM:SS' timestamp"""
+        conn = self._read()
+        if isinstance(since, int):
+            query = "SELECT version, recorded_at, diff FROM case_versions WHERE case_id = ? AND version > ? ORDER BY version"
+        else:
+            query = "SELECT version, recorded_at, diff FROM case_versions WHERE case_id = ? AND recorded_at > ? ORDER BY version"
+        rows = conn.execute(query, (case_id, since)).fetchall()
+        conn.close()
+        return [{'version': version, 'recorded_at': recorded_at, 'changes': json.loads(diff)}
+                for version, recorded_at, diff in rows]
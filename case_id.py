@@ -0,0 +1,136 @@
+"""
+Canonical case identifiers
+CaseId normalizes a (case type, case number, filing year) triple once and
+interns the result, so every cache, index and log shares the same key object.
+A CaseId hashes and compares equal to its "TYPE/NUMBER/YEAR" string, so it can
+be used to look up entries keyed by the plain string form too.
+"""
+
+import sqlite3
+import threading
+import weakref
+from typing import Tuple, Union
+
+# Packed layout, high to low bits: case type (48) | filing year (16) | case number (64).
+# Big-endian packed bytes sort the same way as the packed integers.
+TYPE_ALPHABET = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+MAX_TYPE_LENGTH = 9
+PACKED_SIZE = 16
+
+
+class CaseId:
+    """Interned, hashable, normalized case identifier"""
+
+    __slots__ = ('case_type', 'case_number', 'filing_year', '_key', '_hash', '__weakref__')
+
+    _interned = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        raise TypeError("Use CaseId.of() or CaseId.parse()")
+
+    @classmethod
+    def of(cls, case_type, case_number, filing_year) -> 'CaseId':
+        """Normalize and intern a case id from its parts"""
+        case_type = str(case_type).strip().upper()
+        case_number = str(case_number).strip()
+        if case_number.isdigit():
+            case_number = str(int(case_number))
+        filing_year = str(filing_year).strip()
+        if filing_year.isdigit():
+            filing_year = str(int(filing_year))
+
+        key = f"{case_type}/{case_number}/{filing_year}"
+        case_id = cls._interned.get(key)
+        if case_id is not None:
+            return case_id
+        with cls._lock:
+            case_id = cls._interned.get(key)
+            if case_id is None:
+                case_id = object.__new__(cls)
+                case_id.case_type = case_type
+                case_id.case_number = case_number
+                case_id.filing_year = filing_year
+                case_id._key = key
+                case_id._hash = hash(key)
+                cls._interned[key] = case_id
+        return case_id
+
+    @classmethod
+    def parse(cls, value: Union[str, 'CaseId']) -> 'CaseId':
+        """Parse "TYPE/NUMBER/YEAR"; raises ValueError if malformed"""
+        if isinstance(value, CaseId):
+            return value
+        parts = str(value).split('/')
+        if len(parts) != 3 or not all(part.strip() for part in parts):
+            raise ValueError(f"Malformed case id: {value!r}")
+        return cls.of(*parts)
+
+    @property
+    def parts(self) -> Tuple[str, str, str]:
+        return self.case_type, self.case_number, self.filing_year
+
+    @property
+    def packed(self) -> int:
+        """128-bit integer encoding; raises ValueError for ids that do not fit"""
+        if len(self.case_type) > MAX_TYPE_LENGTH or not all(c in TYPE_ALPHABET for c in self.case_type):
+            raise ValueError(f"Case type cannot be packed: {self.case_type!r}")
+        if not (self.case_number.isdigit() and self.filing_year.isdigit()):
+            raise ValueError(f"Case id cannot be packed: {self._key!r}")
+        number, year = int(self.case_number), int(self.filing_year)
+        if number >= 1 << 64 or year >= 1 << 16:
+            raise ValueError(f"Case id cannot be packed: {self._key!r}")
+
+        type_value = 0
+        for char in self.case_type.ljust(MAX_TYPE_LENGTH, '\0'):
+            type_value = type_value * (len(TYPE_ALPHABET) + 1) + TYPE_ALPHABET.find(char) + 1
+        return (type_value << 80) | (year << 64) | number
+
+    @property
+    def packed_bytes(self) -> bytes:
+        return self.packed.to_bytes(PACKED_SIZE, 'big')
+
+    @classmethod
+    def unpack(cls, packed: Union[int, bytes]) -> 'CaseId':
+        """Inverse of packed / packed_bytes"""
+        if isinstance(packed, (bytes, bytearray, memoryview)):
+            packed = int.from_bytes(packed, 'big')
+        number = packed & ((1 << 64) - 1)
+        year = (packed >> 64) & 0xFFFF
+        type_value = packed >> 80
+        chars = []
+        for _ in range(MAX_TYPE_LENGTH):
+            type_value, digit = divmod(type_value, len(TYPE_ALPHABET) + 1)
+            if digit:
+                chars.append(TYPE_ALPHABET[digit - 1])
+        return cls.of(''.join(reversed(chars)), number, year)
+
+    def __str__(self):
+        return self._key
+
+    def __repr__(self):
+        return f"CaseId({self._key!r})"
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, CaseId):
+            return self is other
+        if isinstance(other, str):
+            return self._key == other
+        return NotImplemented
+
+    def __reduce__(self):
+        return CaseId.parse, (self._key,)
+
+
+def as_case_id(case_type, case_number=None, filing_year=None) -> CaseId:
+    """Accept either a CaseId / "TYPE/NUMBER/YEAR" string or the three parts"""
+    if case_number is None and filing_year is None:
+        return CaseId.parse(case_type)
+    return CaseId.of(case_type, case_number, filing_year)
+
+
+# Let CaseId values be passed straight into SQLite queries
+sqlite3.register_adapter(CaseId, str)
@@ -0,0 +1,248 @@
+"""
+Case data provider shared by every caller
+Fixture records live in data/cases.json and are loaded once per process, on
+first access, instead of being rebuilt by each of the old mock modules.
+When CASE_SNAPSHOT points at a snapshot built by case_snapshot.py, records
+are looked up there first. Records handed out are shared; treat them as read-only.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Any, Iterable, List, Optional
+
+from case_id import CaseId, as_case_id
+from case_snapshot import CaseSnapshot
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cases.json')
+
+
+class CaseFixtures:
+    """Lazily loaded fixture records keyed by test case name"""
+
+    def __init__(self, path: str = FIXTURES_PATH):
+        self.path = path
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    with open(self.path, encoding='utf-8') as f:
+                        self._records = json.load(f)
+        return self._records
+
+    def get(self, name: str) -> Dict[str, Any]:
+        return self._load()[name]
+
+
+fixtures = CaseFixtures()
+
+
+def project(record: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Copy only the requested (dotted, e.g. 'judgment.outcome') fields of a record"""
+    result: Dict[str, Any] = {}
+    # Parents first, so 'judgment.outcome' is skipped when all of 'judgment' is included
+    paths = sorted({tuple(field.split('.')) for field in fields}, key=len)
+    included = set()
+    for path in paths:
+        if any(path[:i] in included for i in range(1, len(path))):
+            continue
+        value = record
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = result
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+            included.add(path)
+    return result
+
+
+# Sections only a complete case record has; lookup results rendered for
+# result.html (scraper_enhanced.mock_case_data) carry none of them
+DETAIL_SECTIONS = ('parties', 'proceedings', 'citations', 'judgment', 'documents', 'court_code')
+
+
+def is_full_record(record: Optional[Dict[str, Any]]) -> bool:
+    """Whether a record is a complete case record rather than a summary view"""
+    return bool(record) and 'error' not in record and any(section in record for section in DETAIL_SECTIONS)
+
+
+def full_record(case_id: CaseId, fetched: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """The complete record to index a case by: a fetched one if it is complete, else the stored one"""
+    if is_full_record(fetched):
+        return fetched
+    return EnhancedMockCaseData.get_record(case_id)
+
+
+_snapshot = None
+_data_version = None
+_snapshot_lock = threading.Lock()
+
+
+def data_version() -> str:
+    """Identifies the record sources in use; a record never changes within one version"""
+    global _data_version
+    if _data_version is None:
+        # Sources are loaded once per process, so this is fixed once computed
+        snapshot = get_snapshot()
+        source = snapshot.path if snapshot is not None else FIXTURES_PATH
+        _data_version = f"{source}@{os.stat(source).st_mtime_ns}"
+    return _data_version
+
+
+def get_snapshot() -> Optional[CaseSnapshot]:
+    """The memory-mapped snapshot named by CASE_SNAPSHOT, opened on first use"""
+    global _snapshot
+    path = os.environ.get('CASE_SNAPSHOT')
+    if path and _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = CaseSnapshot(path)
+    return _snapshot
+
+
+class EnhancedMockCaseData:
+    """Mock data provider for specific test cases"""
+
+    # Test case identifiers
+    TEST_CASES = {
+        "second_appeal_1205_2016": {
+            "case_type": "CR",
+            "case_number": "1205",
+            "filing_year": "2016",
+            "description": "Second Appeal No. 1205 of 2016 – Municipal Corporation Faridabad vs Krishan Kumar"
+        },
+        "nikita_tomar": {
+            "case_type": "CRM",
+            "case_number": "1234",
+            "filing_year": "2020",
+            "description": "Nikita Tomar murder case"
+        },
+        "mact_lok_adalat": {
+            "case_type": "MACP",
+            "case_number": "5678",
+            "filing_year": "2025",
+            "description": "MACT case resolved by Lok Adalat in Faridabad"
+        }
+    }
+
+    # Canonical ids of the test cases, for constant-time lookup
+    TEST_CASE_IDS = {
+        CaseId.of(data["case_type"], data["case_number"], data["filing_year"]): name
+        for name, data in TEST_CASES.items()
+    }
+
+    @classmethod
+    def detect_test_case(cls, case_type, case_number: str = None, filing_year: str = None) -> Optional[str]:
+        """Detect which test case this input (a CaseId or its parts) matches"""
+        try:
+            case_id = as_case_id(case_type, case_number, filing_year)
+        except ValueError:
+            return None
+        return cls.TEST_CASE_IDS.get(case_id)
+
+    @staticmethod
+    def get_second_appeal_1205_2016() -> Dict[str, Any]:
+        """Detailed mock data for Second Appeal No. 1205 of 2016"""
+        return fixtures.get("second_appeal_1205_2016")
+
+    @staticmethod
+    def get_nikita_tomar_case() -> Dict[str, Any]:
+        """Detailed mock data for Nikita Tomar murder case"""
+        return fixtures.get("nikita_tomar")
+
+    @staticmethod
+    def get_mact_lok_adalat_case() -> Dict[str, Any]:
+        """Detailed mock data for MACT case resolved by Lok Adalat"""
+        return fixtures.get("mact_lok_adalat")
+
+    @classmethod
+    def default_record(cls, case_id: CaseId) -> Dict[str, Any]:
+        """Generic mock data for cases without a fixture"""
+        return {
+            "case_id": str(case_id),
+            "case_type": case_id.case_type,
+            "case_number": case_id.case_number,
+            "filing_year": case_id.filing_year,
+            "court": "District Court, Faridabad",
+            "parties": {
+                "petitioner": f"Petitioner for Case {case_id.case_number}",
+                "respondent": f"Respondent for Case {case_id.case_number}"
+            },
+            "case_status": "Pending",
+            "next_hearing_date": "To be scheduled",
+            "description": f"Case {case_id} details",
+            "mock_note": "This is a generic mock case for testing purposes"
+        }
+
+    @classmethod
+    def get_record(cls, case_id: CaseId) -> Optional[Dict[str, Any]]:
+        """The stored record for a case from the snapshot or fixtures, if any"""
+        snapshot = get_snapshot()
+        if snapshot is not None:
+            record = snapshot.get(case_id)
+            if record is not None:
+                return record
+        test_case = cls.detect_test_case(case_id)
+        return fixtures.get(test_case) if test_case else None
+
+    @classmethod
+    def has_record(cls, case_id: CaseId) -> bool:
+        """Whether there is a stored record for a case, without decoding it"""
+        snapshot = get_snapshot()
+        if snapshot is not None and case_id in snapshot:
+            return True
+        return cls.detect_test_case(case_id) is not None
+
+    @classmethod
+    def get_fields(cls, case_id: CaseId, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Only the requested fields of a stored record; None if there is no record"""
+        snapshot = get_snapshot()
+        if snapshot is not None:
+            # Decodes just the top-level sections the fields live in
+            partial = snapshot.get_fields(case_id, {field.split('.')[0] for field in fields})
+            if partial is not None:
+                return project(partial, fields)
+        record = cls.get_record(case_id)
+        return project(record, fields) if record is not None else None
+
+    @classmethod
+    def get_mock_data(cls, case_type, case_number: str = None, filing_year: str = None) -> Dict[str, Any]:
+        """Main function to get mock data for a CaseId or its parts"""
+        case_id = as_case_id(case_type, case_number, filing_year)
+        record = cls.get_record(case_id)
+        return record if record is not None else cls.default_record(case_id)
+
+
+def enhanced_fetch_case_data(case_type: str, case_number: str, filing_year: str, **kwargs) -> Dict[str, Any]:
+    """
+    Enhanced version of fetch_case_data that provides detailed mock data
+    for specific test cases without real scraping
+    """
+    return EnhancedMockCaseData.get_mock_data(case_type, case_number, filing_year)
+
+
+# Test cases for easy reference
+TEST_CASES_REFERENCE = {
+    "Second Appeal 1205/2016": {
+        "case_type": "CR",
+        "case_number": "1205",
+        "filing_year": "2016"
+    },
+    "Nikita Tomar Case": {
+        "case_type": "CRM",
+        "case_number": "1234",
+        "filing_year": "2020"
+    },
+    "MACT Lok Adalat": {
+        "case_type": "MACP",
+        "case_number": "5678",
+        "filing_year": "2025"
+    }
+}
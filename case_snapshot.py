@@ -0,0 +1,177 @@
+"""
+Read-only, memory-mapped case snapshots
+A snapshot is one file with a sorted index of packed CaseIds, an offset table
+and the records themselves. Workers mmap it and decode only the records (and
+top-level fields) they touch, so startup is near free and the OS shares the
+pages between all worker processes.
+
+Layout (little-endian):
+    header   magic b'CSNAP001', record count (u32), field name count (u32),
+             offsets of the field names, key index, offset table and data (u64 each)
+    names    JSON array of top-level field names
+    keys     count x 16-byte CaseId.packed_bytes, sorted
+    offsets  (count + 1) x u64 record start offsets into the data section
+    data     per record: field count (u16), then (field id u16, value end u32) per
+             field, then the JSON-encoded field values back to back
+
+Usage:
+    python case_snapshot.py build OUT.snap [SOURCE.json]
+    python case_snapshot.py get SNAPSHOT.snap CASE_ID
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
+
+from case_id import CaseId, PACKED_SIZE
+
+MAGIC = b'CSNAP001'
+HEADER = struct.Struct('<8sIIQQQQ')
+FIELD_ENTRY = struct.Struct('<HI')
+OFFSET = struct.Struct('<Q')
+
+
+def build_snapshot(records: Iterable[Dict[str, Any]], out_path: str) -> int:
+    """Write records (each with a case_id) to a snapshot file; returns the record count"""
+    by_key = {}
+    for record in records:
+        by_key[CaseId.parse(record['case_id']).packed_bytes] = record
+    keys = sorted(by_key)
+
+    names: List[str] = []
+    name_ids: Dict[str, int] = {}
+    blobs = []
+    for key in keys:
+        record = by_key[key]
+        directory = bytearray(struct.pack('<H', len(record)))
+        values = bytearray()
+        for name, value in record.items():
+            if name not in name_ids:
+                name_ids[name] = len(names)
+                names.append(name)
+            values += json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            directory += FIELD_ENTRY.pack(name_ids[name], len(values))
+        blobs.append(bytes(directory + values))
+
+    names_blob = json.dumps(names).encode('utf-8')
+    names_offset = HEADER.size
+    keys_offset = names_offset + len(names_blob)
+    offsets_offset = keys_offset + len(keys) * PACKED_SIZE
+    data_offset = offsets_offset + (len(keys) + 1) * OFFSET.size
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(keys), len(names), names_offset,
+                            keys_offset, offsets_offset, data_offset))
+        f.write(names_blob)
+        f.write(b''.join(keys))
+        position = 0
+        for blob in blobs:
+            f.write(OFFSET.pack(position))
+            position += len(blob)
+        f.write(OFFSET.pack(position))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, out_path)
+    return len(keys)
+
+
+class CaseSnapshot:
+    """Lazily decoded view over a memory-mapped snapshot file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self._count, _, names_offset, self._keys_offset,
+         self._offsets_offset, self._data_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a case snapshot: {path}")
+        self._names = json.loads(self._map[names_offset:self._keys_offset])
+        self._name_ids = {name: i for i, name in enumerate(self._names)}
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, case_id):
+        return self._find(case_id) >= 0
+
+    def _key(self, index: int) -> bytes:
+        start = self._keys_offset + index * PACKED_SIZE
+        return self._map[start:start + PACKED_SIZE]
+
+    def _find(self, case_id: Union[CaseId, str]) -> int:
+        """Binary search of the sorted key index; -1 if absent"""
+        try:
+            key = CaseId.parse(case_id).packed_bytes
+        except ValueError:
+            return -1
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self._count and self._key(low) == key else -1
+
+    def _fields(self, index: int) -> Iterator[tuple]:
+        """Yield (field name, start, end) for one record's values"""
+        start, = OFFSET.unpack_from(self._map, self._offsets_offset + index * OFFSET.size)
+        position = self._data_offset + start
+        count, = struct.unpack_from('<H', self._map, position)
+        values_start = position + 2 + count * FIELD_ENTRY.size
+        value_start = values_start
+        for i in range(count):
+            field_id, value_end = FIELD_ENTRY.unpack_from(self._map, position + 2 + i * FIELD_ENTRY.size)
+            yield self._names[field_id], value_start, values_start + value_end
+            value_start = values_start + value_end
+
+    def get(self, case_id: Union[CaseId, str]) -> Optional[Dict[str, Any]]:
+        """Decode a whole record, or None if the case is not in the snapshot"""
+        index = self._find(case_id)
+        if index < 0:
+            return None
+        return {name: json.loads(self._map[start:end]) for name, start, end in self._fields(index)}
+
+    def get_fields(self, case_id: Union[CaseId, str], fields: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """Decode only the named top-level fields of a record"""
+        index = self._find(case_id)
+        if index < 0:
+            return None
+        wanted = set(fields)
+        return {name: json.loads(self._map[start:end])
+                for name, start, end in self._fields(index) if name in wanted}
+
+    def keys(self) -> Iterator[CaseId]:
+        for index in range(self._count):
+            yield CaseId.unpack(self._key(index))
+
+    def close(self):
+        self._map.close()
+
+
+def _load_source(path: str) -> List[Dict[str, Any]]:
+    """Records from a JSON list, a JSON object of records, or JSON lines"""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    return list(data.values()) if isinstance(data, dict) else data
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == 'build':
+        from case_provider import FIXTURES_PATH
+        source = sys.argv[3] if len(sys.argv) > 3 else FIXTURES_PATH
+        count = build_snapshot(_load_source(source), sys.argv[2])
+        print(f"Wrote {count} records to {sys.argv[2]}")
+    elif len(sys.argv) == 4 and sys.argv[1] == 'get':
+        record = CaseSnapshot(sys.argv[2]).get(sys.argv[3])
+        print(json.dumps(record, indent=2, ensure_ascii=False) if record else "Case not found")
+    else:
+        print(__doc__.strip().split('Usage:')[1])
+        sys.exit(1)
@@ -0,0 +1,89 @@
+"""
+Keyset-paginated proceedings and documents of a case
+A case's proceedings or documents are sorted once, newest first, by (date,
+position in the record), and pages are read with an opaque cursor holding the
+(date, position) key of the last item seen. A page is a bisect plus a slice, so
+it costs the same on page 40 as on page 1, and unlike offsets a cursor does not
+skip or repeat items when a refreshed record gains new entries.
+"""
+
+import base64
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Hashable, List, Optional, Tuple
+
+from cause_list import date_ordinal
+
+TIMELINE_KINDS = ('proceedings', 'documents')
+
+# (negated day ordinal, negated position): ascending order is newest first
+Key = Tuple[int, int]
+
+
+def encode_cursor(key: Key) -> str:
+    return base64.urlsafe_b64encode(f"{-key[0]}|{-key[1]}".encode('ascii')).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Key:
+    """Key of a cursor from encode_cursor; raises ValueError if it is malformed"""
+    try:
+        text = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+        ordinal, position = text.split('|')
+        return -int(ordinal), -int(position)
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class CaseTimeline:
+    """One case's entries of one kind, sorted newest first"""
+
+    __slots__ = ('_keys', '_items')
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        # Undated entries (ordinal 0) sort after every dated one
+        keyed = sorted(((-(date_ordinal(item.get('date')) or 0), -position), item)
+                       for position, item in enumerate(items) if isinstance(item, dict))
+        self._keys = [key for key, _ in keyed]
+        self._items = [item for _, item in keyed]
+
+    def __len__(self):
+        return len(self._items)
+
+    def page(self, cursor: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        """Up to limit entries after the cursor, and the cursor for the next page (None at the end)"""
+        start = bisect.bisect_right(self._keys, decode_cursor(cursor)) if cursor else 0
+        end = start + limit
+        return {'items': self._items[start:end], 'total': len(self._items),
+                'next_cursor': encode_cursor(self._keys[end - 1]) if end < len(self._items) else None}
+
+
+class TimelineCache:
+    """LRU of built timelines by (case id, version, kind) style keys"""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, load: Callable[[], Optional[List[Dict[str, Any]]]],
+            source: Any = None) -> Optional[CaseTimeline]:
+        """Cached timeline for key, built from load() on a miss; None if load() returns None
+
+        An entry built from a source record is valid while the source is the same object.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is source:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        items = load()
+        if items is None:
+            return None
+        timeline = CaseTimeline(items)
+        with self._lock:
+            self._entries[key] = (source, timeline)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return timeline
@@ -0,0 +1,148 @@
+"""
+Cause lists: hearings by court and by judge over a date range
+Dates from a record (next hearing, judgment, proceedings, Lok Adalat sitting)
+are parsed once into day ordinals and kept in sorted arrays per court and per
+judge, so a range query is two bisects plus the matching slice. Entries are
+inserted and removed in place with bisect, so re-indexing a case never re-sorts
+an array.
+"""
+
+import bisect
+import threading
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from case_id import CaseId
+
+# Index entry: (day ordinal, case id, kind, description)
+Entry = Tuple[int, str, str, str]
+
+
+@lru_cache(maxsize=1 << 16)
+def _parse_ordinal(value: str) -> Optional[int]:
+    # Hand-rolled instead of strptime, which dominates bulk indexing
+    parts = value.strip().split('-')
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        return None
+    year, month, day = parts if len(parts[0]) == 4 else reversed(parts)
+    try:
+        return date(int(year), int(month), int(day)).toordinal()
+    except ValueError:
+        return None
+
+
+def date_ordinal(value: Any) -> Optional[int]:
+    """Day ordinal for DD-MM-YYYY / ISO dates; None for free text like 'To be scheduled'"""
+    return _parse_ordinal(value) if isinstance(value, str) else None
+
+
+def _normalize(name: str) -> str:
+    return ' '.join(str(name).upper().split())
+
+
+def hearing_events(record: Dict[str, Any]) -> List[Tuple[int, str, str, List[str]]]:
+    """(ordinal, kind, description, judges) for every dated event in a record"""
+    judge = record.get('judge')
+    judges = [judge] if isinstance(judge, str) and judge else []
+    events = []
+
+    ordinal = date_ordinal(record.get('next_hearing_date') or record.get('next_date'))
+    if ordinal:
+        events.append((ordinal, 'hearing', 'Next hearing', judges))
+
+    judgment = record.get('judgment') or {}
+    ordinal = date_ordinal(judgment.get('date'))
+    if ordinal:
+        events.append((ordinal, 'judgment', judgment.get('outcome') or 'Judgment',
+                       judgment.get('judges') or judges))
+
+    for proceeding in record.get('proceedings') or []:
+        ordinal = date_ordinal(proceeding.get('date'))
+        if ordinal:
+            events.append((ordinal, 'proceeding', proceeding.get('event') or '', judges))
+
+    lok_adalat = record.get('lok_adalat') or {}
+    ordinal = date_ordinal(lok_adalat.get('date'))
+    if ordinal:
+        events.append((ordinal, 'lok_adalat', lok_adalat.get('venue') or 'Lok Adalat',
+                       lok_adalat.get('mediators') or []))
+    return events
+
+
+class CauseListIndex:
+    """Sorted per-court and per-judge event arrays with range lookups"""
+
+    def __init__(self):
+        self._by_court: Dict[str, List[Entry]] = {}
+        self._by_judge: Dict[str, List[Entry]] = {}
+        # case id -> where its entries live, so a re-fetched case replaces them
+        self._case_entries: Dict[str, List[Tuple[Dict[str, List[Entry]], str, Entry]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._by_court.values())
+
+    def _insert(self, table: Dict[str, List[Entry]], key: str, entry: Entry, placed: list):
+        bisect.insort(table.setdefault(key, []), entry)
+        placed.append((table, key, entry))
+
+    def add_case(self, case_id: Union[CaseId, str], record: Dict[str, Any]):
+        """Index (or re-index) all dated events of a case"""
+        case_id = str(CaseId.parse(case_id))
+        court = record.get('court_code') or record.get('court') or record.get('court_name')
+        events = hearing_events(record)
+        if not court and not events:
+            # Nothing to index it by; keep what the case already has
+            return
+        with self._lock:
+            self._remove(case_id)
+            placed = []
+            for ordinal, kind, description, judges in events:
+                entry = (ordinal, case_id, kind, description)
+                if court:
+                    self._insert(self._by_court, _normalize(court), entry, placed)
+                for judge in judges:
+                    self._insert(self._by_judge, _normalize(judge), entry, placed)
+            if placed:
+                self._case_entries[case_id] = placed
+
+    def _remove(self, case_id: str):
+        for table, key, entry in self._case_entries.pop(case_id, []):
+            entries = table.get(key, [])
+            pos = bisect.bisect_left(entries, entry)
+            if pos < len(entries) and entries[pos] == entry:
+                del entries[pos]
+
+    def _range(self, table: Dict[str, List[Entry]], key: str, start: int, end: int) -> List[Dict[str, str]]:
+        with self._lock:
+            entries = table.get(_normalize(key), [])
+            # (n,) sorts before every (n, ...) entry
+            found = entries[bisect.bisect_left(entries, (start,)):bisect.bisect_left(entries, (end + 1,))]
+        return [{'date': date.fromordinal(ordinal).isoformat(), 'case_id': case_id,
+                 'kind': kind, 'description': description}
+                for ordinal, case_id, kind, description in found]
+
+    def court_range(self, court: str, start: int, end: int) -> List[Dict[str, str]]:
+        """Events in a court between two day ordinals, inclusive"""
+        return self._range(self._by_court, court, start, end)
+
+    def judge_day(self, judge: str, day: int) -> List[Dict[str, str]]:
+        """A judge's cause list for one day"""
+        return self._range(self._by_judge, judge, day, day)
+
+    def courts(self) -> List[str]:
+        with self._lock:
+            return sorted(key for key, entries in self._by_court.items() if entries)
+
+
+def build_default_index() -> CauseListIndex:
+    """Build an index seeded with the known mock cases"""
+    from case_provider import EnhancedMockCaseData
+
+    index = CauseListIndex()
+    for test_data in EnhancedMockCaseData.TEST_CASES.values():
+        record = EnhancedMockCaseData.get_mock_data(
+            test_data['case_type'], test_data['case_number'], test_data['filing_year'])
+        index.add_case(record['case_id'], record)
+    return index
@@ -0,0 +1,118 @@
+"""
+Per-court shards of case storage and fetch capacity
+Every court gets its own record cache, its own history database (with a read
+replica) under shards/, and its own bounded fetch pool. A court whose portal
+is slow only fills its own pool and starts refusing its own lookups; other
+courts keep their workers. Adding a court is a new shard, not a bigger one.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+
+from case_history import CaseHistory
+from case_id import CaseId
+from refresh_scheduler import CaseCache
+from resilience import UpstreamUnavailable
+from storage_router import StorageRouter
+
+# Which court hears each case type; anything else goes to the district court
+COURT_OF_CASE_TYPE = {
+    'CR': 'PHHC', 'CRR': 'PHHC', 'CA': 'PHHC', 'WP': 'PHHC',
+    'CRM': 'FTCF',
+    'MACP': 'MACT',
+}
+DEFAULT_COURT = 'DCF'
+
+# (concurrent upstream fetches, extra lookups allowed to queue) per court
+DEFAULT_LIMITS = (4, 16)
+
+
+def limits_from_env(value: Optional[str] = None) -> Dict[str, Tuple[int, int]]:
+    """Parse COURT_LIMITS, e.g. PHHC=8:32,MACT=2:8 (workers:queue per court)"""
+    limits = {}
+    for item in (value if value is not None else os.environ.get('COURT_LIMITS', '')).split(','):
+        if '=' in item:
+            court, _, numbers = item.partition('=')
+            workers, _, queue = numbers.partition(':')
+            limits[court.strip().upper()] = (int(workers), int(queue or DEFAULT_LIMITS[1]))
+    return limits
+
+
+def court_for(case_id: Union[CaseId, str]) -> str:
+    """Court code that owns a case"""
+    return COURT_OF_CASE_TYPE.get(CaseId.parse(case_id).case_type, DEFAULT_COURT)
+
+
+class CourtShard:
+    """Storage, cache and fetch capacity of one court"""
+
+    def __init__(self, court: str, fetch: Callable[..., Dict[str, Any]], data_dir: str = 'shards',
+                 workers: int = DEFAULT_LIMITS[0], queue: int = DEFAULT_LIMITS[1], timeout: float = 15.0):
+        self.court = court
+        self.fetch_upstream = fetch
+        self.timeout = timeout
+        self.cache = CaseCache()
+        os.makedirs(data_dir, exist_ok=True)
+        self.storage = StorageRouter(os.path.join(data_dir, f"{court}.db"),
+                                     os.path.join(data_dir, f"{court}.replica.db"), query_log=False)
+        self.history = CaseHistory(router=self.storage)
+        self.storage.start()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"fetch-{court}")
+        # Running plus queued lookups; beyond this the court is refused outright
+        self._slots = threading.BoundedSemaphore(workers + queue)
+
+    def fetch(self, case_type: str, case_number: str, filing_year: str) -> Dict[str, Any]:
+        """Fetch through this court's pool; raises UpstreamUnavailable when it is saturated"""
+        if not self._slots.acquire(blocking=False):
+            raise UpstreamUnavailable(f"{self.court}: too many pending lookups")
+        future = self._pool.submit(self.fetch_upstream, case_type, case_number, filing_year)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise UpstreamUnavailable(f"{self.court}: lookup timed out")
+
+
+class CourtShards:
+    """Routes cache, history and fetches to the shard of a case's court"""
+
+    def __init__(self, fetch: Callable[..., Dict[str, Any]], data_dir: str = 'shards',
+                 limits: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.fetch_upstream = fetch
+        self.data_dir = data_dir
+        self.limits = limits if limits is not None else limits_from_env()
+        self._shards: Dict[str, CourtShard] = {}
+        self._lock = threading.Lock()
+
+    def shard(self, court: str) -> CourtShard:
+        shard = self._shards.get(court)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.get(court)
+                if shard is None:
+                    workers, queue = self.limits.get(court, DEFAULT_LIMITS)
+                    shard = self._shards[court] = CourtShard(court, self.fetch_upstream, self.data_dir,
+                                                             workers, queue)
+        return shard
+
+    def shard_for(self, case_id: Union[CaseId, str]) -> CourtShard:
+        return self.shard(court_for(case_id))
+
+    def courts(self) -> List[str]:
+        return sorted(self._shards)
+
+    def fetch(self, case_type: str, case_number: str, filing_year: str) -> Dict[str, Any]:
+        return self.shard_for(CaseId.of(case_type, case_number, filing_year)).fetch(
+            case_type, case_number, filing_year)
+
+    # CaseCache interface, so the refresh scheduler can use the shards as its cache
+    def get(self, case_id: CaseId, max_age: float) -> Optional[Dict[str, Any]]:
+        return self.shard_for(case_id).cache.get(case_id, max_age)
+
+    def put(self, case_id: CaseId, record: Dict[str, Any]):
+        self.shard_for(case_id).cache.put(case_id, record)
+
+    def history(self, case_id: Union[CaseId, str]) -> CaseHistory:
+        return self.shard_for(case_id).history
@@ -0,0 +1,195 @@
+"""
+Local cache for order and judgment PDFs
+Each document is fetched from the upstream portal once, stored on disk under
+its SHA-256 and evicted least-recently-used when the cache grows too large.
+Several workers share the blob directory, each with its own index, so a blob
+another worker evicted is treated as a cache miss and fetched again.
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import requests
+
+# Only these kinds of links from case records are served
+ALLOWED_PREFIXES = ('/orders/', '/mock/')
+
+
+class DocumentNotFound(Exception):
+    pass
+
+
+class DocumentUnavailable(DocumentNotFound):
+    """The upstream failed while the document was being fetched"""
+    pass
+
+
+class DocumentStore:
+    """Content-addressed on-disk document cache with LRU eviction by size"""
+
+    def __init__(self, cache_dir: str = 'doc_cache', max_bytes: int = 2 * 1024 ** 3,
+                 upstream: Optional[str] = None, allow: Optional[Callable[[str], bool]] = None):
+        # allow(url) decides which uncached links may be fetched, e.g. only linked ones
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.allow = allow
+        self.max_bytes = max_bytes
+        self.upstream = (upstream or os.environ.get('DOCUMENT_UPSTREAM', '')).rstrip('/')
+        self._lock = threading.Lock()
+        # Downloads in flight, so concurrent requests for one document share it
+        self._downloads: Dict[str, threading.Event] = {}
+        # url -> sha256, and sha256 -> size in least-recently-used order
+        self._urls: Dict[str, str] = {}
+        self._blobs: OrderedDict = OrderedDict()
+        self._total = 0
+
+        os.makedirs(os.path.join(self.cache_dir, 'blobs'), exist_ok=True)
+        conn = self._connect()
+        conn.execute("""CREATE TABLE IF NOT EXISTS documents (
+            url TEXT PRIMARY KEY,
+            sha256 TEXT,
+            size INTEGER,
+            last_access REAL
+        )""")
+        conn.commit()
+        for url, sha256, size in conn.execute("SELECT url, sha256, size FROM documents ORDER BY last_access"):
+            if os.path.exists(self.blob_path(sha256)):
+                self._urls[url] = sha256
+                if sha256 not in self._blobs:
+                    self._total += size
+                self._blobs[sha256] = size
+                self._blobs.move_to_end(sha256)
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(os.path.join(self.cache_dir, 'index.db'), timeout=5)
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, 'blobs', sha256[:2], sha256)
+
+    def get(self, url: str) -> str:
+        """Return the local path of a document, downloading it on first use"""
+        if not url.startswith(ALLOWED_PREFIXES) or '..' in url or not url.lower().endswith('.pdf'):
+            raise DocumentNotFound(url)
+
+        while True:
+            with self._lock:
+                sha256 = self._urls.get(url)
+                if sha256:
+                    path = self.blob_path(sha256)
+                    if os.path.exists(path):
+                        self._blobs.move_to_end(sha256)
+                        break
+                    # Evicted by another worker
+                    self._drop(sha256)
+                pending = self._downloads.get(url)
+                if pending is None:
+                    pending = self._downloads[url] = threading.Event()
+                    owner = True
+                else:
+                    owner = False
+            if not owner:
+                # Someone else is fetching it; wait and look again
+                pending.wait()
+                with self._lock:
+                    if url not in self._urls:
+                        raise DocumentNotFound(url)
+                continue
+            try:
+                path = self._download(url)
+            finally:
+                with self._lock:
+                    self._downloads.pop(url, None)
+                pending.set()
+            break
+
+        conn = self._connect()
+        conn.execute("UPDATE documents SET last_access = ? WHERE url = ?", (time.time(), url))
+        conn.commit()
+        conn.close()
+        return path
+
+    def _drop(self, sha256: str):
+        """Forget a blob in this worker's index; the caller holds the lock"""
+        self._total -= self._blobs.pop(sha256, 0)
+        for url in [u for u, s in self._urls.items() if s == sha256]:
+            del self._urls[url]
+
+    def _download(self, url: str) -> str:
+        if not self.upstream or (self.allow is not None and not self.allow(url)):
+            raise DocumentNotFound(url)
+        try:
+            response = requests.get(self.upstream + url, stream=True, timeout=30)
+        except requests.RequestException:
+            raise DocumentUnavailable(url)
+        if response.status_code != 200:
+            response.close()
+            raise DocumentUnavailable(url) if response.status_code >= 500 else DocumentNotFound(url)
+
+        # Stream to a temp file while hashing, never holding the PDF in memory
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as tmp, response:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    tmp.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            path = self.blob_path(sha256)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if isinstance(e, requests.RequestException):
+                # The connection failed mid-stream
+                raise DocumentUnavailable(url) from e
+            raise
+
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO documents (url, sha256, size, last_access) VALUES (?, ?, ?, ?)",
+                     (url, sha256, size, time.time()))
+        conn.commit()
+        conn.close()
+
+        with self._lock:
+            self._urls[url] = sha256
+            if sha256 not in self._blobs:
+                self._total += size
+            self._blobs[sha256] = size
+            self._blobs.move_to_end(sha256)
+            evicted = self._evict(keep=sha256)
+        self._forget(evicted)
+        return path
+
+    def _evict(self, keep: str):
+        """Drop least-recently-used blobs until under the size limit"""
+        evicted = []
+        while self._total > self.max_bytes and len(self._blobs) > 1:
+            sha256 = next(iter(self._blobs))
+            if sha256 == keep:
+                break
+            self._drop(sha256)
+            evicted.append(sha256)
+        return evicted
+
+    def _forget(self, evicted):
+        if not evicted:
+            return
+        conn = self._connect()
+        for sha256 in evicted:
+            conn.execute("DELETE FROM documents WHERE sha256 = ?", (sha256,))
+            try:
+                # Open readers keep the file; later lookups treat it as a miss
+                os.remove(self.blob_path(sha256))
+            except OSError:
+                pass
+        conn.commit()
+        conn.close()
@@ -0,0 +1,183 @@
+"""
+Columnar export of the query log and case corpus for analytics
+Streams the `queries` table and the latest case records out of queries.db in
+small chunks to Parquet files, so analysts never scan the live database.
+case_type and court are dictionary-encoded. With --incremental only rows
+added since the last export's watermark are written. Case history kept in
+per-court shard databases (shards/*.db) is exported one file set per court.
+
+Requires pyarrow (pip install pyarrow), which the web app itself does not need.
+
+Usage: python export.py OUT_DIR [--incremental] [--db queries.db] [--shards shards] [--chunk-size N]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+from typing import Dict, Any, Iterator, List, Tuple
+
+from case_id import CaseId
+
+WATERMARK_FILE = '_watermark.json'
+
+
+def _read_chunks(db_path: str, query: str, after: int, chunk_size: int) -> Iterator[List[Tuple]]:
+    """Keyset-paged reads: each chunk is its own short read, never blocking writers for long"""
+    while True:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(query, (after, chunk_size)).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return
+        yield rows
+        after = rows[-1][0]
+
+
+def _load_watermark(out_dir: str) -> Dict[str, int]:
+    try:
+        with open(os.path.join(out_dir, WATERMARK_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_watermark(out_dir: str, watermark: Dict[str, int]):
+    tmp_path = os.path.join(out_dir, WATERMARK_FILE + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(watermark, f)
+    os.replace(tmp_path, os.path.join(out_dir, WATERMARK_FILE))
+
+
+def _write_table(out_path: str, schema, chunks: Iterator[Dict[str, list]]) -> int:
+    """Write column chunks as row groups of one Parquet file; returns rows written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for columns in chunks:
+            batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+            if writer is None:
+                writer = pq.ParquetWriter(out_path + '.tmp', schema, compression='zstd')
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        os.replace(out_path + '.tmp', out_path)
+    return rows
+
+
+def export_queries(db_path: str, out_dir: str, after: int, chunk_size: int) -> Tuple[int, int]:
+    """Export query log rows with id > after; returns (rows, new watermark)"""
+    import pyarrow as pa
+
+    schema = pa.schema([
+        ('id', pa.int64()),
+        ('case_type', pa.dictionary(pa.int32(), pa.string())),
+        ('case_number', pa.string()),
+        ('year', pa.string()),
+        ('timestamp', pa.string())
+    ])
+    last_id = [after]
+
+    def chunks():
+        query = "SELECT id, case_type, case_number, year, timestamp FROM queries WHERE id > ? ORDER BY id LIMIT ?"
+        for rows in _read_chunks(db_path, query, after, chunk_size):
+            last_id[0] = rows[-1][0]
+            ids, case_types, case_numbers, years, timestamps = zip(*rows)
+            yield {'id': ids, 'case_type': case_types, 'case_number': case_numbers,
+                   'year': years, 'timestamp': timestamps}
+
+    out_path = os.path.join(out_dir, f"queries-{after + 1:012d}.parquet")
+    rows = _write_table(out_path, schema, chunks())
+    return rows, last_id[0]
+
+
+def export_cases(db_path: str, out_dir: str, after: int, chunk_size: int,
+                 name: str = 'cases') -> Tuple[int, int]:
+    """Export the latest record of every case with a version newer than `after`"""
+    import pyarrow as pa
+
+    schema = pa.schema([
+        ('case_id', pa.string()),
+        ('case_type', pa.dictionary(pa.int32(), pa.string())),
+        ('case_number', pa.string()),
+        ('filing_year', pa.string()),
+        ('court', pa.dictionary(pa.int32(), pa.string())),
+        ('case_status', pa.string()),
+        ('version', pa.int64()),
+        ('record', pa.string())
+    ])
+    last_rowid = [after]
+
+    def chunks():
+        # case_versions is append-only, so its rowid is a safe watermark
+        query = """SELECT MAX(v.rowid), h.case_id, h.version, h.record
+                   FROM case_versions v JOIN case_heads h ON h.case_id = v.case_id
+                   WHERE v.rowid > ? GROUP BY h.case_id ORDER BY MAX(v.rowid) LIMIT ?"""
+        for rows in _read_chunks(db_path, query, after, chunk_size):
+            last_rowid[0] = rows[-1][0]
+            columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+            for _, case_id, version, record_json in rows:
+                record = json.loads(record_json)
+                case_type, case_number, filing_year = CaseId.parse(case_id).parts
+                columns['case_id'].append(case_id)
+                columns['case_type'].append(case_type)
+                columns['case_number'].append(case_number)
+                columns['filing_year'].append(filing_year)
+                columns['court'].append(record.get('court') or record.get('court_name'))
+                columns['case_status'].append(record.get('case_status') or record.get('status'))
+                columns['version'].append(version)
+                columns['record'].append(record_json)
+            yield columns
+
+    out_path = os.path.join(out_dir, f"{name}-{after + 1:012d}.parquet")
+    rows = _write_table(out_path, schema, chunks())
+    return rows, last_rowid[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the query log and case corpus to Parquet")
+    parser.add_argument('out_dir')
+    parser.add_argument('--db', default='queries.db')
+    parser.add_argument('--shards', default='shards', help="directory of per-court case databases")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only export rows added since the last export")
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    args = parser.parse_args()
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        parser.error("pyarrow is required for exports: pip install pyarrow")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    watermark = _load_watermark(args.out_dir) if args.incremental else {}
+
+    rows, watermark['queries'] = export_queries(args.db, args.out_dir, watermark.get('queries', 0), args.chunk_size)
+    print(f"Exported {rows} query log rows")
+    sources = [('cases', args.db)]
+    for path in sorted(glob.glob(os.path.join(args.shards, '*.db'))):
+        court = os.path.basename(path)[:-len('.db')]
+        if '.' not in court:
+            sources.append((f"cases-{court}", path))
+    for name, db_path in sources:
+        try:
+            rows, watermark[name] = export_cases(db_path, args.out_dir, watermark.get(name, 0),
+                                                 args.chunk_size, name)
+            print(f"Exported {rows} case records from {db_path}")
+        except sqlite3.OperationalError:
+            # No case history recorded there yet
+            pass
+    _save_watermark(args.out_dir, watermark)
+
+
+if __name__ == "__main__":
+    main()
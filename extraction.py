@@ -0,0 +1,227 @@
+"""
+Offline text extraction for cached order and judgment PDFs
+Runs outside the web workers: `python extraction.py` pulls text out of every
+cached PDF in a process pool and indexes it for /search. Each document's
+chunks are committed together with its job row in the document cache's SQLite
+index, so an interrupted run resumes with the unfinished documents and
+re-running it is harmless. The app only links the cases it fetches to their
+document URLs; the CLI downloads linked documents that are not cached yet
+before extracting, so later lookups are searchable after its next run.
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Tuple
+
+from document_store import DocumentNotFound, DocumentStore
+
+STREAM_RE = re.compile(rb'<<(.*?)>>\s*stream\r?\n(.*?)\r?\nendstream', re.S)
+TEXT_OP_RE = re.compile(rb'\((?:\\.|[^\\)])*\)\s*Tj|\[(?:\\.|[^\]])*\]\s*TJ|T\*|Td|TD|ET')
+STRING_RE = re.compile(rb'\(((?:\\.|[^\\)])*)\)')
+ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+           b'(': b'(', b')': b')', b'\\': b'\\'}
+
+
+def _unescape(raw: bytes) -> bytes:
+    def replace(match):
+        escaped = match.group(1)
+        if escaped[:1].isdigit():
+            return bytes([int(escaped, 8) & 0xFF])
+        return ESCAPES.get(escaped, escaped)
+    return re.sub(rb'\\([0-7]{1,3}|.)', replace, raw, flags=re.S)
+
+
+def _stream_text(content: bytes) -> str:
+    """Text shown by Tj/TJ operators in one page content stream"""
+    parts = []
+    for match in TEXT_OP_RE.finditer(content):
+        op = match.group(0)
+        if op.endswith((b'Tj', b'TJ')):
+            parts.append(b''.join(_unescape(s) for s in STRING_RE.findall(op)))
+        elif parts and not parts[-1].endswith(b'\n'):
+            # Line moves and text object ends separate lines
+            parts.append(b'\n')
+    return b''.join(parts).decode('latin-1').strip()
+
+
+def extract_chunks(path: str) -> List[Tuple[int, str]]:
+    """Extract (chunk number, text) for each text content stream of a PDF"""
+    with open(path, 'rb') as pdf:
+        data = pdf.read()
+
+    chunks = []
+    chunk_no = 0
+    for header, body in STREAM_RE.findall(data):
+        if b'/FlateDecode' in header:
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                continue
+        elif b'/Filter' in header:
+            # Images and other encodings carry no extractable text
+            continue
+        if b'BT' not in body:
+            continue
+        text = _stream_text(body)
+        if text:
+            chunks.append((chunk_no, text))
+        chunk_no += 1
+    return chunks
+
+
+class DocumentSearch:
+    """Extraction job tracking and full-text search over extracted chunks"""
+
+    def __init__(self, store: DocumentStore):
+        self.store = store
+        conn = self._connect()
+        conn.execute("""CREATE TABLE IF NOT EXISTS extraction_jobs (
+            sha256 TEXT PRIMARY KEY,
+            status TEXT,
+            chunks INTEGER,
+            error TEXT
+        )""")
+        conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS document_text
+                        USING fts5(sha256 UNINDEXED, chunk_no UNINDEXED, text)""")
+        conn.execute("""CREATE TABLE IF NOT EXISTS case_documents (
+            case_id TEXT,
+            url TEXT,
+            PRIMARY KEY (case_id, url)
+        )""")
+        conn.commit()
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return self.store._connect()
+
+    def link_case(self, case_id: str, urls: List[str]):
+        """Remember which case a document link belongs to"""
+        conn = self._connect()
+        conn.executemany("INSERT OR IGNORE INTO case_documents (case_id, url) VALUES (?, ?)",
+                         [(case_id, url) for url in urls if url])
+        conn.commit()
+        conn.close()
+
+    def is_linked(self, url: str) -> bool:
+        """Whether some case links to a document URL"""
+        conn = self._connect()
+        row = conn.execute("SELECT 1 FROM case_documents WHERE url = ? LIMIT 1", (url,)).fetchone()
+        conn.close()
+        return row is not None
+
+    def unfetched_links(self) -> List[str]:
+        """Linked document URLs that are not in the cache yet"""
+        conn = self._connect()
+        rows = conn.execute("""SELECT DISTINCT c.url
+                               FROM case_documents c
+                               LEFT JOIN documents d ON d.url = c.url
+                               WHERE d.url IS NULL""").fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+
+    def pending_jobs(self) -> List[str]:
+        """Cached blobs whose extraction has not finished yet"""
+        conn = self._connect()
+        rows = conn.execute("""SELECT DISTINCT d.sha256
+                               FROM documents d
+                               LEFT JOIN extraction_jobs j ON j.sha256 = d.sha256
+                               WHERE j.status IS NULL""").fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+
+    def save_chunks(self, sha256: str, chunks: List[Tuple[int, str]]):
+        conn = self._connect()
+        # Replace rather than append, so a retried job never duplicates chunks
+        conn.execute("DELETE FROM document_text WHERE sha256 = ?", (sha256,))
+        conn.executemany("INSERT INTO document_text (sha256, chunk_no, text) VALUES (?, ?, ?)",
+                         [(sha256, chunk_no, text) for chunk_no, text in chunks])
+        conn.execute("INSERT OR REPLACE INTO extraction_jobs (sha256, status, chunks, error) VALUES (?, 'done', ?, NULL)",
+                     (sha256, len(chunks)))
+        conn.commit()
+        conn.close()
+
+    def mark_failed(self, sha256: str, error: str):
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO extraction_jobs (sha256, status, chunks, error) VALUES (?, 'failed', 0, ?)",
+                     (sha256, error))
+        conn.commit()
+        conn.close()
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Cases whose documents mention the query, with a text snippet"""
+        terms = ' '.join('"%s"' % word.replace('"', '') for word in query.split())
+        if not terms:
+            return []
+        conn = self._connect()
+        try:
+            rows = conn.execute("""SELECT c.case_id, d.url, snippet(document_text, 2, '[', ']', '...', 12)
+                                   FROM document_text
+                                   JOIN documents d ON d.sha256 = document_text.sha256
+                                   JOIN case_documents c ON c.url = d.url
+                                   WHERE document_text MATCH ?
+                                   ORDER BY rank LIMIT ?""", (terms, limit)).fetchall()
+        finally:
+            conn.close()
+        return [{'case_id': case_id, 'url': url, 'snippet': snippet} for case_id, url, snippet in rows]
+
+
+def document_urls(record: Dict[str, Any]) -> List[str]:
+    """Document links of a case record"""
+    urls = [doc.get('url') for doc in record.get('documents') or [] if isinstance(doc, dict)]
+    urls.append(record.get('pdf_order_link'))
+    return [url for url in urls if url]
+
+
+def fetch_linked(search: DocumentSearch) -> int:
+    """Download linked documents missing from the cache; returns how many were fetched"""
+    fetched = 0
+    for url in search.unfetched_links():
+        try:
+            search.store.get(url)
+            fetched += 1
+        except DocumentNotFound:
+            continue
+    return fetched
+
+
+def run(store: DocumentStore, workers: int = None) -> int:
+    """Extract text from all pending cached documents; returns jobs completed"""
+    search = DocumentSearch(store)
+    jobs = search.pending_jobs()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(extract_chunks, store.blob_path(sha256)): sha256
+                   for sha256 in jobs}
+        for future in as_completed(futures):
+            sha256 = futures[future]
+            try:
+                search.save_chunks(sha256, future.result())
+                done += 1
+            except Exception as e:
+                search.mark_failed(sha256, str(e))
+            print(f"Extracted {done}/{len(jobs)} documents", end='\r')
+    print()
+    return done
+
+
+def link_known_cases(search: DocumentSearch):
+    """Record the document links of the known case records"""
+    from case_provider import EnhancedMockCaseData
+
+    for test_data in EnhancedMockCaseData.TEST_CASES.values():
+        record = EnhancedMockCaseData.get_mock_data(
+            test_data['case_type'], test_data['case_number'], test_data['filing_year'])
+        search.link_case(record['case_id'], document_urls(record))
+
+
+if __name__ == "__main__":
+    store = DocumentStore()
+    search = DocumentSearch(store)
+    link_known_cases(search)
+    print(f"Fetched {fetch_linked(search)} linked documents")
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    print(f"Completed {run(store, workers)} extraction jobs")
@@ -0,0 +1,343 @@
+"""
+Push notifications for case changes
+Clients subscribe to case ids over Server-Sent Events or register webhooks;
+changes go through one fan-out queue that batches webhook deliveries and
+retries failed ones with backoff. Webhook POSTs run on their own worker pool,
+so a slow or dead endpoint never holds up SSE clients. Webhooks may only point
+at public addresses, or at the hosts listed in WEBHOOK_ALLOWED_HOSTS; the
+address is checked again on the connected socket, so a host re-pointed after
+the check cannot reach internal services. Subscriptions live in SQLite and are
+re-read every few seconds, so every worker delivers every subscriber's events.
+"""
+
+import heapq
+import ipaddress
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Only changes to these fields are pushed to subscribers
+NOTIFY_FIELDS = ('status', 'case_status', 'next_date', 'next_hearing_date', 'documents')
+
+
+def relevant_changes(changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [change for change in changes if change['path'] and change['path'][0] in NOTIFY_FIELDS]
+
+
+def allowed_hosts_from_env() -> Optional[frozenset]:
+    value = os.environ.get('WEBHOOK_ALLOWED_HOSTS', '')
+    hosts = frozenset(host.strip().lower() for host in value.split(',') if host.strip())
+    return hosts or None
+
+
+def webhook_url_allowed(url: str, allowed_hosts: Optional[frozenset] = None) -> bool:
+    """Whether the server may POST to a URL: http(s) to an allowed host, or to a
+    host whose every address is public (no loopback, private or link-local)"""
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return False
+    host = (parts.hostname or '').lower()
+    if parts.scheme not in ('http', 'https') or not host:
+        return False
+    if allowed_hosts is not None:
+        return host in allowed_hosts
+    try:
+        addresses = socket.getaddrinfo(host, port or 80, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        return False
+    return all(is_public_address(address[4][0]) for address in addresses)
+
+
+def is_public_address(address: str) -> bool:
+    return ipaddress.ip_address(address.split('%')[0]).is_global
+
+
+class _PublicOnlyConnection:
+    """Refuses a connection once the socket turns out to reach a non-public address"""
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        address = sock.getpeername()[0]
+        if not is_public_address(address):
+            sock.close()
+            raise NewConnectionError(self, f"Refusing to connect to non-public address {address}")
+        return sock
+
+
+class _PublicHTTPConnection(_PublicOnlyConnection, HTTPConnection):
+    pass
+
+
+class _PublicHTTPSConnection(_PublicOnlyConnection, HTTPSConnection):
+    pass
+
+
+class _PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+
+class _PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+
+class PublicAddressAdapter(HTTPAdapter):
+    """Transport adapter that only connects to public addresses, whatever DNS says later"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _PublicHTTPConnectionPool,
+                                                   'https': _PublicHTTPSConnectionPool}
+
+
+def webhook_session(public_only: bool = True) -> requests.Session:
+    session = requests.Session()
+    if public_only:
+        # A proxy would be the checked peer instead of the webhook host
+        session.trust_env = False
+        adapter = PublicAddressAdapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
+
+
+class _PoolShutDown(Exception):
+    pass
+
+
+class NotificationHub:
+    """Fan-out of case change events to SSE streams and webhooks"""
+
+    def __init__(self, db_path: str = 'queries.db', batch_window: float = 1.0,
+                 max_batch: int = 100, max_retries: int = 5, stream_buffer: int = 100,
+                 webhook_workers: int = 8, allowed_hosts: Optional[frozenset] = None,
+                 subscription_ttl: float = 5.0):
+        self.db_path = db_path
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self.stream_buffer = stream_buffer
+        self.subscription_ttl = subscription_ttl
+        self._events = queue.Queue()
+        self._lock = threading.Lock()
+        # case_id -> set of SSE client queues
+        self._streams: Dict[str, set] = {}
+        # case_id -> {subscription id: url}, as of _webhooks_loaded_at
+        self._webhooks: Dict[str, Dict[str, str]] = {}
+        self._webhooks_loaded_at = 0.0
+        self.allowed_hosts = allowed_hosts if allowed_hosts is not None else allowed_hosts_from_env()
+        # Heap of (retry at, attempt, url, events), filled by the webhook workers
+        self._retries = []
+        self._retries_lock = threading.Lock()
+        self._webhook_pool = ThreadPoolExecutor(max_workers=webhook_workers, thread_name_prefix='webhook')
+        self._local = threading.local()
+        self._thread = None
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""CREATE TABLE IF NOT EXISTS webhook_subscriptions (
+            id TEXT,
+            url TEXT,
+            case_id TEXT
+        )""")
+        conn.commit()
+        conn.close()
+        self._load_webhooks()
+
+    # Subscriptions
+
+    def open_stream(self, case_ids: Iterable[str]) -> queue.Queue:
+        """Register an SSE client for some case ids"""
+        stream = queue.Queue(maxsize=self.stream_buffer)
+        stream.case_ids = list(case_ids)
+        with self._lock:
+            for case_id in stream.case_ids:
+                self._streams.setdefault(case_id, set()).add(stream)
+        return stream
+
+    def close_stream(self, stream: queue.Queue):
+        with self._lock:
+            for case_id in stream.case_ids:
+                streams = self._streams.get(case_id, set())
+                streams.discard(stream)
+                if not streams:
+                    self._streams.pop(case_id, None)
+
+    def _load_webhooks(self):
+        """Re-read subscriptions, including those added by other workers"""
+        webhooks: Dict[str, Dict[str, str]] = {}
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for sub_id, url, case_id in conn.execute("SELECT id, url, case_id FROM webhook_subscriptions"):
+                webhooks.setdefault(case_id, {})[sub_id] = url
+        finally:
+            conn.close()
+        with self._lock:
+            self._webhooks = webhooks
+            self._webhooks_loaded_at = time.monotonic()
+
+    def _refresh_webhooks(self):
+        if time.monotonic() - self._webhooks_loaded_at > self.subscription_ttl:
+            self._load_webhooks()
+
+    def url_allowed(self, url: str) -> bool:
+        return webhook_url_allowed(url, self.allowed_hosts)
+
+    def add_webhook(self, url: str, case_ids: Iterable[str]) -> str:
+        """Subscribe a URL to some case ids; raises ValueError for URLs webhooks may not use"""
+        if not self.url_allowed(url):
+            raise ValueError(f"Webhook URL not allowed: {url}")
+        sub_id = uuid.uuid4().hex
+        case_ids = list(case_ids)
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany("INSERT INTO webhook_subscriptions (id, url, case_id) VALUES (?, ?, ?)",
+                         [(sub_id, url, case_id) for case_id in case_ids])
+        conn.commit()
+        conn.close()
+        with self._lock:
+            for case_id in case_ids:
+                self._webhooks.setdefault(case_id, {})[sub_id] = url
+        return sub_id
+
+    def remove_webhook(self, sub_id: str) -> bool:
+        conn = sqlite3.connect(self.db_path)
+        removed = conn.execute("DELETE FROM webhook_subscriptions WHERE id = ?", (sub_id,)).rowcount
+        conn.commit()
+        conn.close()
+        with self._lock:
+            for hooks in self._webhooks.values():
+                hooks.pop(sub_id, None)
+        return removed > 0
+
+    # Publishing and delivery
+
+    def publish(self, case_id: str, version: Dict[str, Any]):
+        """Queue a change event for a new case version, if it matters to clients"""
+        changes = relevant_changes(version['changes'])
+        self._refresh_webhooks()
+        if changes and (case_id in self._streams or case_id in self._webhooks):
+            self._events.put({'case_id': str(case_id), 'version': version['version'],
+                              'recorded_at': version['recorded_at'], 'changes': changes})
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        timeout = self.batch_window
+        with self._retries_lock:
+            if self._retries:
+                timeout = min(timeout, max(0.0, self._retries[0][0] - time.time()))
+        try:
+            batch = [self._events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.time() + self.batch_window
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._events.get(timeout=max(0.0, deadline - time.time())))
+            except queue.Empty:
+                break
+        return batch
+
+    def _fan_out(self, batch: List[Dict[str, Any]]):
+        outgoing: Dict[str, List[Dict[str, Any]]] = {}
+        self._refresh_webhooks()
+        with self._lock:
+            for event in batch:
+                for stream in self._streams.get(event['case_id'], ()):
+                    try:
+                        stream.put_nowait(event)
+                    except queue.Full:
+                        # Slow client; it can catch up through /history
+                        pass
+                for url in set(self._webhooks.get(event['case_id'], {}).values()):
+                    outgoing.setdefault(url, []).append(event)
+        for url, events in outgoing.items():
+            self._submit(url, events, 0)
+
+    def _submit(self, url: str, events: List[Dict[str, Any]], attempt: int):
+        try:
+            self._webhook_pool.submit(self._deliver, url, events, attempt)
+        except RuntimeError as e:
+            # The pool refuses work once it is shut down, at process exit
+            raise _PoolShutDown() from e
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            # Allowlisted hosts may be internal on purpose
+            session = self._local.session = webhook_session(public_only=self.allowed_hosts is None)
+        return session
+
+    def _deliver(self, url: str, events: List[Dict[str, Any]], attempt: int):
+        # Checked again on every attempt, as the host may have been re-pointed since;
+        # the session also checks the address it actually connects to
+        if not self.url_allowed(url):
+            return
+        try:
+            # No redirects: they could lead to an address the check above rejects
+            response = self._session().post(url, json={'events': events}, timeout=5, allow_redirects=False)
+            if response.status_code < 500:
+                return
+        except requests.RequestException:
+            pass
+        if attempt + 1 < self.max_retries:
+            with self._retries_lock:
+                heapq.heappush(self._retries, (time.time() + 2 ** attempt, attempt + 1, url, events))
+
+    def _due_retries(self) -> List[tuple]:
+        due = []
+        with self._retries_lock:
+            while self._retries and self._retries[0][0] <= time.time():
+                due.append(heapq.heappop(self._retries))
+        return due
+
+    def _run(self):
+        while True:
+            try:
+                batch = self._next_batch()
+                if batch:
+                    self._fan_out(batch)
+                for _, attempt, url, events in self._due_retries():
+                    self._submit(url, events, attempt)
+            except _PoolShutDown:
+                return
+            except Exception:
+                # Losing one batch beats stopping every stream and webhook
+                logger.exception("Notification dispatch failed")
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+        self._thread.start()
+
+
+def sse_stream(hub: NotificationHub, case_ids: List[str], keepalive: float = 15.0):
+    """Generator of Server-Sent Events for a client's case ids"""
+    stream = hub.open_stream(case_ids)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = stream.get(timeout=keepalive)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield f"id: {event['case_id']}:{event['version']}\nevent: case-change\ndata: {json.dumps(event)}\n\n"
+    finally:
+        hub.close_stream(stream)
@@ -0,0 +1,99 @@
+"""
+HTTP client for the upstream court portal
+Used by fetch_case_data when COURT_PORTAL_URL is set. Every request goes
+through a ResilientCaller, so a slow or failing portal raises
+UpstreamUnavailable quickly instead of tying up /result. When the portal gates
+searches behind CAPTCHA sessions (PORTAL_SESSIONS > 0), requests lease a
+pre-solved session from a SessionPool.
+"""
+
+import os
+import threading
+from typing import Dict, Any, Optional
+
+import requests
+
+from case_id import CaseId
+from portal_sessions import SessionPool
+from resilience import ResilientCaller, UpstreamUnavailable
+
+
+def is_upstream_failure(error: Exception) -> bool:
+    """Whether an error means the portal is unhealthy; a 4xx answer is about the request"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500
+    return True
+
+
+class PortalClient:
+    """Fetches case records from the portal's /case/<type>/<number>/<year> endpoint"""
+
+    def __init__(self, base_url: str, caller: Optional[ResilientCaller] = None, timeout: float = 5.0,
+                 sessions: Optional[SessionPool] = None):
+        self.base_url = base_url.rstrip('/')
+        self.caller = caller or ResilientCaller(timeout=timeout, is_failure=is_upstream_failure)
+        self.timeout = timeout
+        self.sessions = sessions
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # One keep-alive session per thread; Session is not guaranteed thread-safe
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _get_case(self, case_id: CaseId) -> Dict[str, Any]:
+        case_type, case_number, filing_year = case_id.parts
+        url = f"{self.base_url}/case/{case_type}/{case_number}/{filing_year}"
+        if self.sessions is None:
+            response = self._session().get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+        # A session can expire early on the portal's side; retry once on a fresh one
+        for _ in range(2):
+            with self.sessions.lease() as session:
+                response = session.get(url, timeout=self.timeout)
+                if response.status_code in (401, 403):
+                    session.invalidate()
+                    continue
+                response.raise_for_status()
+                return response.json()
+        raise UpstreamUnavailable("portal rejected its sessions")
+
+    def fetch_case(self, case_id: CaseId) -> Dict[str, Any]:
+        """Fetch one case; raises resilience.UpstreamUnavailable, or requests.HTTPError for a 4xx"""
+        return self.caller.call('case', self._get_case, case_id)
+
+
+_clients: Dict[str, PortalClient] = {}
+_clients_lock = threading.Lock()
+
+
+def client_for(court: Optional[str] = None) -> Optional[PortalClient]:
+    """The shared client for a court's portal, or None when no portal is configured
+
+    COURT_PORTAL_URL_<COURT> overrides COURT_PORTAL_URL for one court. Each court
+    gets its own client, so its breaker, latency history and sessions are its own.
+    """
+    base_url = (court and os.environ.get(f'COURT_PORTAL_URL_{court}')) or os.environ.get('COURT_PORTAL_URL')
+    if not base_url:
+        return None
+    key = court or ''
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                pool_size = int(os.environ.get('PORTAL_SESSIONS', 0))
+                sessions = None
+                if pool_size > 0:
+                    sessions = SessionPool(base_url, size=pool_size, max_size=pool_size * 4)
+                    sessions.start()
+                client = _clients[key] = PortalClient(base_url, sessions=sessions)
+    return client
+
+
+def default_client() -> Optional[PortalClient]:
+    """The shared client for COURT_PORTAL_URL"""
+    return client_for(None)
@@ -0,0 +1,184 @@
+"""
+Pool of established court portal sessions
+The portal gates every search behind a session cookie unlocked by solving a
+CAPTCHA, which costs far more than the search itself. The pool keeps solved
+sessions ready, leases each to one fetch at a time, tracks their expiry and
+search budget, and replaces them in the background before they run out.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+import requests
+
+from resilience import UpstreamUnavailable
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRejected(Exception):
+    """The portal refused to establish or keep a session"""
+    pass
+
+
+def text_captcha_solver(http: requests.Session, base_url: str, challenge: Dict[str, Any]) -> str:
+    """Solver for portals that serve the CAPTCHA answer as text, like upstream_stub"""
+    response = http.get(base_url + challenge['captcha_url'], timeout=5)
+    response.raise_for_status()
+    return response.text.strip()
+
+
+class PortalSession:
+    """One solved portal session with its cookie jar, expiry and remaining searches"""
+
+    def __init__(self, http: requests.Session, expires_at: float, remaining: int):
+        self.http = http
+        self.expires_at = expires_at
+        self.remaining = remaining
+        self.rejected = False
+
+    def usable(self, margin: float = 0.0) -> bool:
+        return not self.rejected and self.remaining > 0 and self.expires_at - time.time() > margin
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.remaining -= 1
+        return self.http.get(url, **kwargs)
+
+    def invalidate(self):
+        """Mark the session dead, e.g. after the portal answered 401"""
+        self.rejected = True
+
+
+class SessionPool:
+    """Keeps `size` solved sessions ready and leases them to concurrent fetches"""
+
+    def __init__(self, base_url: str, solver: Callable[..., str] = text_captcha_solver,
+                 size: int = 4, max_size: int = 16, ttl: float = 300.0, budget: int = 100,
+                 refresh_margin: float = 30.0, refresh_interval: float = 1.0, timeout: float = 5.0):
+        self.base_url = base_url.rstrip('/')
+        self.solver = solver
+        self.size = size
+        self.max_size = max_size
+        # Used when the portal does not say how long a session lasts
+        self.ttl = ttl
+        self.budget = budget
+        self.refresh_margin = refresh_margin
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self._idle: List[PortalSession] = []
+        self._total = 0
+        self._established = 0
+        self._available = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _establish(self) -> PortalSession:
+        """Open a session and solve its CAPTCHA"""
+        http = requests.Session()
+        response = http.get(f"{self.base_url}/session", timeout=self.timeout)
+        response.raise_for_status()
+        answer = self.solver(http, self.base_url, response.json())
+        response = http.post(f"{self.base_url}/session/verify", json={'answer': answer}, timeout=self.timeout)
+        if response.status_code != 200:
+            raise SessionRejected(f"CAPTCHA rejected ({response.status_code})")
+        info = response.json()
+        self._established += 1
+        return PortalSession(http, time.time() + info.get('ttl', self.ttl), info.get('budget', self.budget))
+
+    def _acquire(self, timeout: float) -> PortalSession:
+        deadline = time.monotonic() + timeout
+        with self._available:
+            while True:
+                while self._idle:
+                    session = self._idle.pop()
+                    if session.usable(margin=1.0):
+                        return session
+                    self._total -= 1
+                if self._total < self.max_size:
+                    # Reserve a slot, then establish outside the lock
+                    self._total += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise UpstreamUnavailable("no portal session available")
+                self._available.wait(remaining)
+
+        session = None
+        try:
+            session = self._establish()
+        except (requests.RequestException, SessionRejected, ValueError) as e:
+            raise UpstreamUnavailable(f"could not establish a portal session: {e}")
+        finally:
+            if session is None:
+                # Whatever went wrong, give the reservation back
+                with self._available:
+                    self._total -= 1
+                    self._available.notify()
+        return session
+
+    def _release(self, session: PortalSession):
+        with self._available:
+            if session.usable():
+                self._idle.append(session)
+            else:
+                self._total -= 1
+            self._available.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[PortalSession]:
+        """Exclusive use of a session for one fetch"""
+        session = self._acquire(self.timeout if timeout is None else timeout)
+        try:
+            yield session
+        finally:
+            self._release(session)
+
+    def _refresh(self):
+        """Retire sessions close to expiry and top the idle set back up to `size`"""
+        with self._available:
+            keep = [session for session in self._idle if session.usable(self.refresh_margin)]
+            self._total -= len(self._idle) - len(keep)
+            self._idle = keep
+            missing = max(min(self.size - len(self._idle), self.max_size - self._total), 0)
+            self._total += missing
+
+        established = 0
+        try:
+            for _ in range(missing):
+                session = self._establish()
+                with self._available:
+                    self._idle.append(session)
+                    self._available.notify()
+                established += 1
+        except (requests.RequestException, SessionRejected, ValueError):
+            # Try again next round
+            logger.warning("Portal session refresh failed", exc_info=True)
+        finally:
+            if established < missing:
+                # Give back the unused reservations, whatever stopped the refresh
+                with self._available:
+                    self._total -= missing - established
+                    self._available.notify()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._refresh()
+            except Exception:
+                logger.exception("Portal session refresh crashed")
+            self._stop.wait(self.refresh_interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> Dict[str, int]:
+        with self._available:
+            return {'idle': len(self._idle), 'total': self._total, 'established': self._established}
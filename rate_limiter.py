@@ -0,0 +1,163 @@
+"""
+Token-bucket rate limiting for the expensive routes
+Buckets live in process memory by default; point RATE_LIMIT_DB at a shared
+SQLite file to share them between workers on the same host
+"""
+
+import itertools
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+from flask import request, make_response
+
+
+class MemoryBackend:
+    """In-process token buckets, least recently used evicted beyond MAX_BUCKETS"""
+
+    MAX_BUCKETS = 100000
+    # Oldest buckets looked at for one that has refilled before evicting the oldest
+    EVICTION_SCAN = 8
+
+    def __init__(self, max_buckets: Optional[int] = None):
+        self.max_buckets = max_buckets or self.MAX_BUCKETS
+        # key -> (tokens, updated, rate, capacity), least recently used first
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> float:
+        """Take one token; returns 0 if allowed, else seconds until one is available"""
+        with self._lock:
+            tokens, updated, _, _ = self._buckets.get(key, (capacity, now, rate, capacity))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, rate, capacity)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_buckets:
+                self._evict(now)
+        return 0.0 if allowed else (1 - tokens) / rate
+
+    def _evict(self, now: float):
+        # A bucket that has refilled (judged by its own rule) carries no information;
+        # failing that the least recently used one goes
+        for key, (tokens, updated, rate, capacity) in itertools.islice(self._buckets.items(), self.EVICTION_SCAN):
+            if tokens + (now - updated) * rate >= capacity:
+                del self._buckets[key]
+                return
+        self._buckets.popitem(last=False)
+
+
+class SQLiteBackend:
+    """Token buckets in a SQLite file shared by several worker processes"""
+
+    # Buckets idle this long have refilled under any configured rule and are deleted
+    IDLE_TTL = 60 * 60
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._takes = itertools.count(1)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("""CREATE TABLE IF NOT EXISTS rate_buckets (
+            key TEXT PRIMARY KEY,
+            tokens REAL,
+            updated REAL
+        )""")
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> float:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE key = ?",
+                               (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute("INSERT OR REPLACE INTO rate_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                         (key, tokens, now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if next(self._takes) % self.PRUNE_EVERY == 0:
+            self.prune(now)
+        return 0.0 if allowed else (1 - tokens) / rate
+
+    def prune(self, now: float):
+        """Delete buckets idle for longer than IDLE_TTL"""
+        self._connect().execute("DELETE FROM rate_buckets WHERE updated < ?", (now - self.IDLE_TTL,))
+
+
+class RateLimiter:
+    """Named token-bucket rules checked against one or more client keys"""
+
+    def __init__(self, rules: Dict[str, Tuple[int, int]], backend=None, exempt: Optional[List[str]] = None):
+        # rules: name -> (requests per minute, burst size)
+        self.rules = rules
+        self.backend = backend or MemoryBackend()
+        # Client addresses never limited, e.g. a replay or load test host (RATE_LIMIT_EXEMPT)
+        if exempt is None:
+            exempt = [addr.strip() for addr in os.environ.get('RATE_LIMIT_EXEMPT', '').split(',') if addr.strip()]
+        self.exempt = frozenset(exempt)
+
+    def check(self, rule: str, keys: List[str]) -> float:
+        """Return 0 if the request may proceed, else the Retry-After delay"""
+        per_minute, burst = self.rules[rule]
+        now = time.time()
+        retry_after = 0.0
+        for key in keys:
+            retry_after = max(retry_after,
+                              self.backend.take(f"{rule}:{key}", per_minute / 60.0, burst, now))
+        return retry_after
+
+
+def client_keys() -> List[str]:
+    """Rate limit keys for the current request"""
+    # Only the address: a client-chosen value (such as a cookie the app never
+    # set) would let a client mint fresh buckets at will
+    return [f"ip:{request.remote_addr}"]
+
+
+def rate_limited(limiter: RateLimiter, rule: str):
+    """Decorator that sheds load with 429 before the view does any work"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if request.remote_addr in limiter.exempt:
+                return view(*args, **kwargs)
+            retry_after = limiter.check(rule, client_keys())
+            if retry_after:
+                response = make_response("Too many requests. Please slow down.", 429)
+                response.headers['Retry-After'] = str(math.ceil(retry_after))
+                return response
+            return view(*args, **kwargs)
+        return wrapped
+    return decorator
+
+
+def build_backend(path: Optional[str] = None):
+    """Use the shared SQLite backend when RATE_LIMIT_DB is configured"""
+    path = path or os.environ.get('RATE_LIMIT_DB')
+    return SQLiteBackend(path) if path else MemoryBackend()
@@ -0,0 +1,229 @@
+"""
+Background refresh of watched cases
+Frequently searched and pending cases are re-fetched ahead of time, so user
+lookups are served from a warm cache instead of waiting on the upstream portal
+"""
+
+import heapq
+import itertools
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional, Tuple, Union
+
+from case_id import CaseId
+
+# Cases in these states rarely change any more
+FINAL_STATUSES = ('DISPOSED', 'CONVICTED', 'SETTLED', 'NOT FOUND', 'ACQUITTED')
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+# Due times are pushed back by this much per day until the next hearing (up to
+# a week), so when refreshes queue up, cases heard soonest go first
+PRIORITY_DELAY_PER_DAY = MINUTE
+MAX_PRIORITY_DAYS = 7
+
+
+def parse_hearing_date(value: str) -> Optional[datetime]:
+    """Parse DD-MM-YYYY or ISO hearing dates; returns None for free text"""
+    for fmt in ('%d-%m-%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value.strip(), fmt)
+        except (AttributeError, ValueError):
+            continue
+    return None
+
+
+def refresh_interval(record: Dict[str, Any], now: Optional[datetime] = None) -> Tuple[float, float]:
+    """Return (seconds until next refresh, priority) for a fetched record"""
+    now = now or datetime.now()
+    status = str(record.get('case_status') or record.get('status') or '').upper()
+    hearing = parse_hearing_date(record.get('next_hearing_date') or record.get('next_date') or '')
+
+    if any(status.startswith(final) for final in FINAL_STATUSES):
+        return 24 * HOUR, float('inf')
+    if hearing is None:
+        # Pending with no date yet: a date may be listed at any time
+        return 30 * MINUTE, float('inf')
+
+    days_away = (hearing - now).total_seconds() / (24 * HOUR)
+    if days_away < 0:
+        # Hearing has passed, the outcome should appear soon
+        return 30 * MINUTE, days_away
+    if days_away <= 2:
+        return 15 * MINUTE, days_away
+    if days_away <= 7:
+        return HOUR, days_away
+    return 6 * HOUR, days_away
+
+
+class CaseCache:
+    """Thread-safe LRU cache of fetched case records with their fetch time"""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 48 * HOUR):
+        # Entries older than ttl are dropped; watched cases are refreshed well within it
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._records: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, case_id: CaseId, max_age: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._records.get(case_id)
+            if entry is None:
+                return None
+            if now - entry[1] > self.ttl:
+                del self._records[case_id]
+                return None
+            self._records.move_to_end(case_id)
+        return entry[0] if now - entry[1] <= max_age else None
+
+    def put(self, case_id: CaseId, record: Dict[str, Any]):
+        with self._lock:
+            self._records[case_id] = (record, time.time())
+            self._records.move_to_end(case_id)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+
+class CaseRefreshScheduler:
+    """Re-fetches watched cases in the background, most urgent first"""
+
+    def __init__(self, fetch: Callable[..., Dict[str, Any]], cache: CaseCache,
+                 db_path: str = 'queries.db', max_concurrency: int = 4,
+                 jitter: float = 0.1, max_watched: int = 1000,
+                 on_record: Optional[Callable[[CaseId, Dict[str, Any]], None]] = None):
+        self.fetch = fetch
+        self.cache = cache
+        self.on_record = on_record
+        self.db_path = db_path
+        self.jitter = jitter
+        self.max_watched = max_watched
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency,
+                                        thread_name_prefix='case-refresh')
+        # Heap of (priority-adjusted due time, seq, case_id); _due holds the live entry per case
+        self._heap = []
+        self._seq = itertools.count()
+        self._due: Dict[CaseId, float] = {}
+        self._wakeup = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._due)
+
+    def _schedule(self, case_id: CaseId, due: float, priority: float = 0.0):
+        due += PRIORITY_DELAY_PER_DAY * min(max(priority, 0.0), MAX_PRIORITY_DAYS)
+        with self._wakeup:
+            if case_id in self._due and self._due[case_id] <= due:
+                return
+            self._due[case_id] = due
+            heapq.heappush(self._heap, (due, next(self._seq), case_id))
+            self._wakeup.notify()
+
+    def watch(self, case_id: Union[CaseId, str], record: Optional[Dict[str, Any]] = None):
+        """Start tracking a case; a fetched record sets when it is next due"""
+        case_id = CaseId.parse(case_id)
+        if case_id not in self._due and len(self._due) >= self.max_watched:
+            return
+        if record is None:
+            if case_id in self._due:
+                # Already scheduled or being refreshed; watching again (e.g. an
+                # SSE reconnect) must not pull the next upstream fetch forward
+                return
+            # Spread first fetches out instead of firing them all at once
+            self._schedule(case_id, time.time() + random.uniform(0, MINUTE))
+            return
+        interval, priority = refresh_interval(record)
+        self._schedule(case_id, time.time() + interval * (1 + random.uniform(0, self.jitter)),
+                       priority)
+
+    def load_watched(self, limit: int = 100):
+        """Watch the most frequently searched cases from the queries log"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            rows = conn.execute("""SELECT case_type, case_number, year, COUNT(*) AS hits
+                                   FROM queries
+                                   GROUP BY case_type, case_number, year
+                                   ORDER BY hits DESC LIMIT ?""", (limit,)).fetchall()
+            conn.close()
+        except sqlite3.Error:
+            return
+        for case_type, case_number, year, _ in rows:
+            if case_type and case_number and year:
+                self.watch(CaseId.of(case_type, case_number, year))
+
+    def _refresh(self, case_id: CaseId):
+        try:
+            record = self.fetch(*case_id.parts)
+        except Exception:
+            # Upstream trouble: back off and try again later
+            self._schedule(case_id, time.time() + 5 * MINUTE * (1 + random.uniform(0, self.jitter)))
+            self._slots.release()
+            return
+
+        try:
+            if 'error' in record:
+                # Invalid input will never become valid, stop watching it
+                with self._wakeup:
+                    self._due.pop(case_id, None)
+                return
+            if record.get('result') is False:
+                # The portal has no such case (yet): keep checking, but there is
+                # nothing to cache or record
+                self.watch(case_id, record)
+                return
+            self.cache.put(case_id, record)
+            self.watch(case_id, record)
+            if self.on_record:
+                self.on_record(case_id, record)
+        finally:
+            self._slots.release()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            with self._wakeup:
+                while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+                    # Entry superseded by a later reschedule
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._wakeup.wait(timeout=MINUTE)
+                    continue
+                due, _, case_id = self._heap[0]
+                delay = due - time.time()
+                if delay > 0:
+                    self._wakeup.wait(timeout=delay)
+                    continue
+                heapq.heappop(self._heap)
+                self._due[case_id] = float('inf')
+
+            # Global concurrency cap across all refreshes
+            self._slots.acquire()
+            if self._stopped.is_set():
+                self._slots.release()
+                break
+            self._pool.submit(self._refresh, case_id)
+
+    def start(self):
+        """Load watched cases and start the scheduler thread"""
+        if self._thread:
+            return
+        self.load_watched()
+        self._thread = threading.Thread(target=self._run, name='case-refresh-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._wakeup:
+            self._wakeup.notify()
+        self._pool.shutdown(wait=False)
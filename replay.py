@@ -0,0 +1,194 @@
+"""
+Replay captured traffic against a local instance and compare builds
+Re-drives the requests in a traffic/ capture (see traffic_capture.py) in their
+recorded order and spacing, at 1x or sped up, and writes per-route latency
+samples to a JSON file. Running it against two builds and comparing the files
+shows what a change does to p50/p90/p99 under real access patterns.
+
+Captured case numbers are digests, so each maps to a fixed stand-in number: the
+same case is requested as often, and as close together, as it was in production.
+CAPTCHAs are solved locally from the app's SECRET_KEY (tokens are derived from
+it), so the target needs no bypass; run it with RATE_LIMIT_EXEMPT=127.0.0.1 so
+the replay host is not throttled.
+
+Usage: python replay.py run TRAFFIC [--target http://127.0.0.1:8080] [--speed 1]
+                        [--concurrency 32] [--out replay.json]
+       python replay.py compare BASELINE.json CANDIDATE.json
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+
+import requests
+
+from captcha_tokens import CaptchaTokens
+from traffic_capture import log_files
+
+
+def load_events(paths: List[str]) -> List[Dict[str, Any]]:
+    """Captured events from files or capture directories, in time order"""
+    files = []
+    for path in paths:
+        files.extend(log_files(path) if os.path.isdir(path) else [path])
+    events = []
+    for path in files:
+        with open(path, encoding='ascii') as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    events.sort(key=lambda event: event['t'])
+    return events
+
+
+def stand_in_number(digest: str) -> str:
+    """Fixed case number for a captured case number digest"""
+    return str(int(digest[:8], 16) % 99999 + 1)
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Count, mean and percentiles of latencies in milliseconds"""
+    samples = sorted(latencies)
+    if not samples:
+        return {'count': 0}
+    pick = lambda fraction: samples[min(int(len(samples) * fraction), len(samples) - 1)]
+    return {'count': len(samples), 'mean': round(sum(samples) / len(samples), 2),
+            'p50': pick(0.50), 'p90': pick(0.90), 'p99': pick(0.99), 'max': samples[-1]}
+
+
+class Replayer:
+    """Sends captured events to a target, keeping their relative timing"""
+
+    def __init__(self, target: str, secret_key: str, speed: float = 1.0, concurrency: int = 32):
+        self.target = target.rstrip('/')
+        self.tokens = CaptchaTokens(secret_key)
+        self.speed = speed
+        self.concurrency = concurrency
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors = 0
+        self.late = 0
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _token(self) -> str:
+        # Not timed: in production the token came with the page
+        return self._session().get(f"{self.target}/captcha/token", timeout=30).json()['token']
+
+    def _send(self, event: Dict[str, Any]):
+        session = self._session()
+        path = event['path']
+        try:
+            if path == '/captcha':
+                url, kwargs = f"{self.target}/captcha", {'params': {'token': self._token()}}
+            elif path == '/result':
+                params = event['params']
+                token = self._token()
+                url, kwargs = f"{self.target}/result", {'data': {
+                    'case_type': params['case_type'],
+                    'case_number': stand_in_number(params['case_number']),
+                    'filing_year': params['filing_year'],
+                    'captcha_token': token,
+                    # Failed CAPTCHAs are replayed as failures
+                    'captcha': self.tokens.text_for(token) if params.get('captcha_ok') else '',
+                }}
+            else:
+                url, kwargs = f"{self.target}{path}", {}
+            start = time.perf_counter()
+            response = session.request(event['method'], url, timeout=60, **kwargs)
+            elapsed = (time.perf_counter() - start) * 1000
+        except (requests.RequestException, KeyError, ValueError):
+            with self._lock:
+                self.errors += 1
+            return
+        with self._lock:
+            self.latencies[path].append(round(elapsed, 2))
+            self.statuses[path][response.status_code] += 1
+
+    def run(self, events: List[Dict[str, Any]]):
+        """Replay events; speed 0 sends them as fast as the workers allow"""
+        if not events:
+            return
+        first = events[0]['t']
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for event in events:
+                if self.speed > 0:
+                    delay = started + (event['t'] - first) / self.speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    elif delay < -1:
+                        # Dispatch fell more than a second behind the recorded schedule
+                        self.late += 1
+                pool.submit(self._send, event)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'target': self.target,
+            'speed': self.speed,
+            'errors': self.errors,
+            'late': self.late,
+            'routes': {path: {'summary': summarize(samples), 'status': dict(self.statuses[path]),
+                              'latencies_ms': samples}
+                       for path, samples in sorted(self.latencies.items())},
+        }
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> List[str]:
+    """Per-route percentile table of two replay reports"""
+    lines = [f"{'route':<10} {'stat':<5} {'baseline':>10} {'candidate':>10} {'change':>8}"]
+    for path in sorted(set(baseline['routes']) | set(candidate['routes'])):
+        before = baseline['routes'].get(path, {}).get('summary', {})
+        after = candidate['routes'].get(path, {}).get('summary', {})
+        for stat in ('p50', 'p90', 'p99', 'mean'):
+            if stat in before and stat in after:
+                change = f"{(after[stat] - before[stat]) / before[stat] * 100:+.1f}%" if before[stat] else ''
+                lines.append(f"{path:<10} {stat:<5} {before[stat]:>10.2f} {after[stat]:>10.2f} {change:>8}")
+        lines.append(f"{path:<10} {'n':<5} {before.get('count', 0):>10} {after.get('count', 0):>10}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured traffic and compare latency between builds")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run')
+    run_parser.add_argument('traffic', nargs='+', help="capture files or directories")
+    run_parser.add_argument('--target', default='http://127.0.0.1:8080')
+    run_parser.add_argument('--speed', type=float, default=1.0, help="1 = recorded pace, 10 = ten times faster, 0 = no waits")
+    run_parser.add_argument('--concurrency', type=int, default=32)
+    run_parser.add_argument('--secret-key', default=os.environ.get('SECRET_KEY', 'your-secret-key-change-this-in-production'))
+    run_parser.add_argument('--out', default='replay.json')
+    compare_parser = commands.add_parser('compare')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        events = load_events(args.traffic)
+        replayer = Replayer(args.target, args.secret_key, args.speed, args.concurrency)
+        replayer.run(events)
+        report = replayer.report()
+        with open(args.out, 'w') as f:
+            json.dump(report, f)
+        for path, route in report['routes'].items():
+            print(path, route['summary'], route['status'])
+        print(f"Replayed {len(events)} events ({report['errors']} errors, {report['late']} late); wrote {args.out}")
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.candidate) as f:
+            candidate = json.load(f)
+        print('\n'.join(compare(baseline, candidate)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Resilience layer for calls to the upstream court portal
+Each endpoint gets a circuit breaker, so a failing upstream is skipped instead
+of making every lookup wait for the timeout, and a latency tracker whose p75
+(capped at a fixed ceiling) decides when a slow call gets a hedged duplicate.
+Whichever attempt answers first wins. Errors the caller's is_failure predicate
+rejects (client errors such as an unknown case) are raised at once, without
+hedging and without counting against the breaker.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Optional
+
+
+class UpstreamUnavailable(Exception):
+    """The upstream failed, timed out or its circuit breaker is open"""
+    pass
+
+
+class LatencyTracker:
+    """Latencies of the most recent successful calls"""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; after reset_timeout lets one probe through"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Only the caller that flips the state gets to probe
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_response(self):
+        """The upstream answered, if only with a client error: a probe succeeded, failures stand"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.CLOSED
+                self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ResilientCaller:
+    """Runs upstream calls behind per-endpoint breakers, with hedging and a deadline"""
+
+    def __init__(self, timeout: float = 10.0, hedge_percentile: float = 0.75,
+                 initial_hedge_delay: float = 0.5, min_hedge_delay: float = 0.05,
+                 max_hedge_delay: float = 0.5, max_hedges: int = 2, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, max_workers: int = 16,
+                 is_failure: Optional[Callable[[Exception], bool]] = None):
+        self.timeout = timeout
+        # Exceptions for which this returns False are the caller's fault, not the upstream's
+        self.is_failure = is_failure or (lambda error: True)
+        # A low percentile with a fixed ceiling: once the slow tail is wider than
+        # 1 - percentile, the percentile itself is a tail latency and hedging
+        # after it would never help
+        self.hedge_percentile = hedge_percentile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.max_hedges = max_hedges
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upstream')
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._latencies[endpoint] = LatencyTracker()
+            return self._breakers[endpoint]
+
+    def hedge_delay(self, endpoint: str) -> float:
+        """How long to wait for an attempt before sending a duplicate"""
+        tracker = self._latencies[endpoint]
+        if len(tracker) < 20:
+            return self.initial_hedge_delay
+        delay = tracker.percentile(self.hedge_percentile)
+        return min(max(delay, self.min_hedge_delay), self.max_hedge_delay, self.timeout)
+
+    def _timed(self, fn: Callable, args: tuple):
+        started = time.monotonic()
+        return fn(*args), time.monotonic() - started
+
+    def call(self, endpoint: str, fn: Callable[..., Any], *args) -> Any:
+        """Return the first successful result of fn(*args); raises UpstreamUnavailable"""
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            raise UpstreamUnavailable(f"{endpoint}: circuit open")
+
+        deadline = time.monotonic() + self.timeout
+        pending = {self._pool.submit(self._timed, fn, args)}
+        hedges = 0
+        error = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            can_hedge = hedges < self.max_hedges
+            done, pending = wait(pending, return_when=FIRST_COMPLETED,
+                                 timeout=min(self.hedge_delay(endpoint), remaining) if can_hedge else remaining)
+            for future in done:
+                try:
+                    result, elapsed = future.result()
+                except Exception as e:
+                    if not self.is_failure(e):
+                        # Asking again would get the same answer
+                        breaker.record_response()
+                        raise
+                    error = e
+                    continue
+                self._latencies[endpoint].add(elapsed)
+                breaker.record_success()
+                return result
+            # Still slow, or an attempt failed outright: send a duplicate
+            if can_hedge and (not done or not pending):
+                hedges += 1
+                pending.add(self._pool.submit(self._timed, fn, args))
+
+        breaker.record_failure()
+        # Attempts still running are abandoned; their own request timeouts end them
+        reason = f"{type(error).__name__}: {error}" if error else "timed out"
+        raise UpstreamUnavailable(f"{endpoint}: {reason}")
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state and p95 latency per endpoint"""
+        with self._lock:
+            endpoints = list(self._breakers)
+        return {endpoint: {'state': self._breakers[endpoint].state,
+                           'p95': self._latencies[endpoint].percentile(0.95)}
+                for endpoint in endpoints}
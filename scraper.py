@@ -6,6 +6,8 @@ from datetime import datetime
 import random
 import string
 
+from case_id import CaseId
+
 def fetch_case_data(case_type, case_number, filing_year, captcha_value=None, session_data=None):
     """Fetch case data with realistic mock data for specific test cases"""
     
@@ -34,7 +36,7 @@ def fetch_case_data(case_type, case_number, filing_year, captcha_value=None, ses
         return {'error': '; '.join(errors)}
     
     # Create unique case identifier
-    case_id = f"{case_type}/{case_number}/{filing_year}"
+    case_id = CaseId.of(case_type, case_number, filing_year)
     
     # Mock data for specific test cases
     mock_cases = {
@@ -89,17 +91,15 @@ def fetch_case_data(case_type, case_number, filing_year, captcha_value=None, ses
     }
     
     # Check for specific test cases
-    key = f"{case_type}/{case_number}/{filing_year}"
-    
-    if key in mock_cases:
-        return mock_cases[key]
+    if case_id in mock_cases:
+        return mock_cases[str(case_id)]
     
     # Default mock data for other cases
     return {
-        'case_id': case_id,
-        'case_type': case_type,
-        'case_number': str(case_number),
-        'filing_year': str(filing_year),
+        'case_id': str(case_id),
+        'case_type': case_id.case_type,
+        'case_number': case_id.case_number,
+        'filing_year': case_id.filing_year,
         'petitioner': f"Petitioner for Case {case_number}",
         'respondent': f"Respondent for Case {case_number}",
         'advocate': "Adv. [Name]",
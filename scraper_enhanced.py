@@ -12,12 +12,13 @@ import random
 import string
 
 # Import the enhanced mock system
-from mock_case_system import EnhancedMockCaseData
+from case_provider import EnhancedMockCaseData
+from case_id import CaseId, as_case_id
+import portal_client
+from court_shards import court_for
 
-def fetch_case_data(case_type, case_number, filing_year, captcha_value=None, session_data=None):
-    """Enhanced fetch_case_data with mock data for specific test cases"""
-    
-    # Validate inputs
+def validate_case_input(case_type, case_number, filing_year):
+    """Problems with raw case lookup input, as messages; empty if it is valid"""
     errors = []
     
     if not case_type or not isinstance(case_type, str):
@@ -37,15 +38,51 @@ def fetch_case_data(case_type, case_number, filing_year, captcha_value=None, ses
             errors.append(f"Filing year must be between 1900 and {current_year}")
     except ValueError:
         errors.append("Filing year must be a 4-digit year")
+    return errors
+
+def fetch_case_data(case_type, case_number, filing_year, captcha_value=None, session_data=None):
+    """Enhanced fetch_case_data with mock data for specific test cases"""
     
+    # Validate inputs
+    errors = validate_case_input(case_type, case_number, filing_year)
     if errors:
         return {'error': '; '.join(errors)}
     
+    case_id = CaseId.of(case_type, case_number, filing_year)
+
+    # Talk to the court's portal when one is configured (raises UpstreamUnavailable)
+    portal = portal_client.client_for(court_for(case_id))
+    if portal is not None:
+        try:
+            return portal.fetch_case(case_id)
+        except requests.HTTPError as e:
+            # A 4xx is the portal's answer about this case, not an outage
+            if e.response is not None and e.response.status_code == 404:
+                return not_found_result(case_id)
+            return {'error': 'The court portal rejected this lookup'}
+    return mock_case_data(case_id)
+
+def not_found_result(case_id):
+    """Lookup result for a case the court has no record of"""
+    return {
+        'case_id': str(case_id),
+        'petitioner': '',
+        'respondent': '',
+        'advocate': '',
+        'status': 'Not Found',
+        'next_date': '',
+        'result': False  # Flag to indicate no data found
+    }
+
+def mock_case_data(case_type, case_number=None, filing_year=None):
+    """Mock lookup result for a CaseId or its parts"""
+    case_id = as_case_id(case_type, case_number, filing_year)
+
     # Use enhanced mock data system
-    mock_data = EnhancedMockCaseData.get_mock_data(case_type, case_number, filing_year)
+    mock_data = EnhancedMockCaseData.get_mock_data(case_id)
     
     # Check if this is one of our specific test cases
-    test_case = EnhancedMockCaseData.detect_test_case(case_type, case_number, filing_year)
+    test_case = EnhancedMockCaseData.detect_test_case(case_id)
     
     if test_case:
         # Transform mock data to match template expectations
@@ -61,15 +98,7 @@ def fetch_case_data(case_type, case_number, filing_year, captcha_value=None, ses
         return transformed_data
     else:
         # Return enhanced mock data with "Case Not Found" message
-        return {
-            'case_id': f"{case_type}/{case_number}/{filing_year}",
-            'petitioner': '',
-            'respondent': '',
-            'advocate': '',
-            'status': 'Not Found',
-            'next_date': '',
-            'result': False  # Flag to indicate no data found
-        }
+        return not_found_result(case_id)
 
 # For backward compatibility
 def get_case_details(case_type, case_number, filing_year):
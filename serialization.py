@@ -0,0 +1,82 @@
+"""
+Encoded JSON response cache
+Case records are immutable per version, so each (case id, version, fieldset)
+is encoded once, with orjson when it is installed, and the UTF-8 bytes (plus a
+gzip copy, made on first request for it) are reused for every later response.
+Records without a version number (fetched ones) are passed as the entry's
+source instead: the entry is then valid while the source is the same object.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class EncodedBody:
+    """Encoded bytes of one response, with an ETag and a lazily built gzip copy"""
+
+    __slots__ = ('body', 'etag', '_gzip', '_lock')
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self._gzip: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    def gzipped(self) -> bytes:
+        if self._gzip is None:
+            with self._lock:
+                if self._gzip is None:
+                    self._gzip = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self._gzip
+
+
+class EncodedCache:
+    """LRU cache of EncodedBody by (case id, version, fieldset) style keys"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, build: Callable[[], Any], source: Any = None) -> Optional[EncodedBody]:
+        """Cached encoding for key, calling build() for the value on a miss; None if it returns None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            # A refreshed source record is a new object, which invalidates the entry
+            if entry is not None and entry[0] is source:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = build()
+        if value is None:
+            return None
+        encoded = EncodedBody(dumps(value))
+        with self._lock:
+            self._entries[key] = (source, encoded)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return encoded
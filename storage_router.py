@@ -0,0 +1,135 @@
+"""
+Storage routing between the primary query log and a read-only replica
+Writes (query log inserts, case history) go to the primary queries.db.
+Analytics and history reads go to a replica copied from the primary with the
+SQLite backup API every few seconds, so a slow report never holds a lock the
+write path is waiting on.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StorageRouter:
+    """Routes writes to the primary database and reads to a periodically refreshed replica"""
+
+    def __init__(self, primary_path: str = 'queries.db', replica_path: Optional[str] = None,
+                 refresh_interval: Optional[float] = None, query_log: bool = True):
+        self.primary_path = primary_path
+        self.replica_path = replica_path or os.environ.get('REPLICA_DB', 'queries.replica.db')
+        self.refresh_interval = refresh_interval or float(os.environ.get('REPLICA_REFRESH_SECONDS', 30))
+        self.refreshed_at: Optional[float] = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        if not query_log:
+            return
+        conn = self.write()
+        conn.execute("""CREATE TABLE IF NOT EXISTS queries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            case_type TEXT,
+            case_number TEXT,
+            year TEXT,
+            timestamp TEXT
+        )""")
+        conn.commit()
+        conn.close()
+
+    def write(self) -> sqlite3.Connection:
+        """Connection to the primary database"""
+        return sqlite3.connect(self.primary_path)
+
+    def read(self) -> sqlite3.Connection:
+        """Read-only connection to the latest replica"""
+        if self.refreshed_at is None:
+            self.refresh()
+        # Replicas are replaced, never modified in place, so no locking is needed
+        return sqlite3.connect(f"file:{self.replica_path}?mode=ro&immutable=1", uri=True)
+
+    def refresh(self):
+        """Copy the primary into a fresh replica file and swap it in"""
+        with self._refresh_lock:
+            tmp_path = self.replica_path + '.tmp'
+            source = sqlite3.connect(self.primary_path)
+            target = sqlite3.connect(tmp_path)
+            try:
+                # Copy in steps so writers can get in between pages
+                source.backup(target, pages=256)
+            finally:
+                target.close()
+                source.close()
+            # Open readers keep the old file until they close
+            os.replace(tmp_path, self.replica_path)
+            self.refreshed_at = time.time()
+
+    def log_query(self, case_type: str, case_number: str, year: str):
+        """Append a lookup to the query log"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        conn = self.write()
+        try:
+            conn.execute("INSERT INTO queries (case_type, case_number, year, timestamp) VALUES (?, ?, ?, ?)",
+                         (case_type, case_number, year, timestamp))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def stats(self, days: int = 30, top: int = 10) -> Dict[str, Any]:
+        """Query log aggregates, read from the replica"""
+        conn = self.read()
+        try:
+            total, = conn.execute("SELECT COUNT(*) FROM queries").fetchone()
+            by_type = conn.execute("""SELECT case_type, COUNT(*) FROM queries
+                                      GROUP BY case_type ORDER BY COUNT(*) DESC LIMIT ?""", (top,)).fetchall()
+            by_day = conn.execute("""SELECT substr(timestamp, 1, 10) AS day, COUNT(*) FROM queries
+                                     WHERE timestamp >= date('now', 'localtime', ?)
+                                     GROUP BY day ORDER BY day""", (f'-{days} days',)).fetchall()
+            top_cases = conn.execute("""SELECT case_type, case_number, year, COUNT(*) FROM queries
+                                        GROUP BY case_type, case_number, year
+                                        ORDER BY COUNT(*) DESC LIMIT ?""", (top,)).fetchall()
+        finally:
+            conn.close()
+        return {
+            'total_queries': total,
+            'by_case_type': [{'case_type': t, 'count': n} for t, n in by_type],
+            'by_day': [{'day': d, 'count': n} for d, n in by_day],
+            'top_cases': [{'case_id': f"{t}/{c}/{y}", 'count': n} for t, c, y, n in top_cases],
+            'as_of': datetime.fromtimestamp(self.refreshed_at).strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def top_cases(self, days: int = 7, limit: int = 100) -> List[Tuple[str, str, str]]:
+        """(case type, number, year) of the most searched cases in the last few days, read from the replica"""
+        conn = self.read()
+        try:
+            return conn.execute("""SELECT case_type, case_number, year FROM queries
+                                   WHERE timestamp >= datetime('now', 'localtime', ?)
+                                     AND case_type != '' AND case_number != '' AND year != ''
+                                   GROUP BY case_type, case_number, year
+                                   ORDER BY COUNT(*) DESC LIMIT ?""", (f'-{days} days', limit)).fetchall()
+        finally:
+            conn.close()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep the last good replica and try again next round
+                logger.exception("Replica refresh of %s failed", self.replica_path)
+
+    def start(self):
+        """Take an initial replica and keep refreshing it in the background"""
+        if self._thread is None:
+            self.refresh()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
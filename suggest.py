@@ -0,0 +1,108 @@
+"""
+Typeahead suggestion index for case ids and party names
+Keeps a sorted in-memory array so /suggest never has to touch the database
+"""
+
+import bisect
+import threading
+from typing import Dict, Any, List, Iterable, Tuple, Union
+
+from case_id import CaseId
+
+
+def _normalize(text: str) -> str:
+    """Normalize text for prefix matching"""
+    return ' '.join(str(text).upper().split())
+
+
+def party_names(record: Dict[str, Any]) -> List[str]:
+    """Collect party names from the different record layouts"""
+    names = []
+    for key in ('petitioner', 'respondent'):
+        if isinstance(record.get(key), str) and record[key]:
+            names.append(record[key])
+
+    parties = record.get('parties') or {}
+    for party in parties.values():
+        members = party if isinstance(party, list) else [party]
+        for member in members:
+            if isinstance(member, dict) and member.get('name'):
+                names.append(member['name'])
+            elif isinstance(member, str) and member:
+                names.append(member)
+    return names
+
+
+class SuggestIndex:
+    """Prefix index over case ids and party names backed by a sorted array"""
+
+    def __init__(self):
+        # Parallel sorted arrays: normalized key -> (label, kind, case_id)
+        self._keys: List[str] = []
+        self._entries: List[Tuple[str, str, CaseId]] = []
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _insert(self, key: str, entry: Tuple[str, str, CaseId]):
+        if not key or (key, entry) in self._seen:
+            return
+        self._seen.add((key, entry))
+        pos = bisect.bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self._entries.insert(pos, entry)
+
+    def add_case(self, case_id: Union[CaseId, str], names: Iterable[str] = ()):
+        """Index a case id, its case number and every word of its party names"""
+        case_id = CaseId.parse(case_id)
+        label = str(case_id)
+        with self._lock:
+            self._insert(label, (label, 'case', case_id))
+            self._insert(case_id.case_number, (label, 'case', case_id))
+            for name in names:
+                words = _normalize(name).split(' ')
+                # Index every word position so "kumar" finds "Krishan Kumar"
+                for i in range(len(words)):
+                    self._insert(' '.join(words[i:]), (name, 'party', case_id))
+
+    def search(self, query: str, limit: int = 8) -> List[Dict[str, str]]:
+        """Return up to `limit` entries whose key starts with the query"""
+        prefix = _normalize(query)
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        with self._lock:
+            pos = bisect.bisect_left(self._keys, prefix)
+            while pos < len(self._keys) and len(results) < limit:
+                if not self._keys[pos].startswith(prefix):
+                    break
+                label, kind, case_id = self._entries[pos]
+                pos += 1
+                if (label, case_id) in seen:
+                    continue
+                seen.add((label, case_id))
+                results.append({
+                    'label': label,
+                    'kind': kind,
+                    'case_id': str(case_id),
+                    'case_type': case_id.case_type,
+                    'case_number': case_id.case_number,
+                    'filing_year': case_id.filing_year
+                })
+        return results
+
+
+def build_default_index() -> SuggestIndex:
+    """Build an index seeded with the known mock cases"""
+    from case_provider import EnhancedMockCaseData
+
+    index = SuggestIndex()
+    for test_data in EnhancedMockCaseData.TEST_CASES.values():
+        record = EnhancedMockCaseData.get_mock_data(
+            test_data['case_type'], test_data['case_number'], test_data['filing_year'])
+        index.add_case(record['case_id'], party_names(record))
+    return index
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """The Flask app, imported with its databases in a scratch directory and no background work"""
+    os.environ.update(CASE_REFRESH_ENABLED='0', WARMUP_TOP='0', RATE_LIMIT_EXEMPT='127.0.0.1')
+    os.chdir(tmp_path_factory.mktemp('app'))
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def lookup(app_module, client):
+    """POST /result for a case with a solved CAPTCHA"""
+    def lookup(case_type, case_number, filing_year):
+        token = app_module.captcha_tokens.issue()
+        return client.post('/result', data={
+            'case_type': case_type, 'case_number': case_number, 'filing_year': filing_year,
+            'captcha_token': token, 'captcha': app_module.captcha_tokens.text_for(token)})
+    return lookup
@@ -0,0 +1,47 @@
+from batch_validation import (CASE_NUMBER_NOT_NUMERIC, CASE_NUMBER_NOT_POSITIVE, CASE_TYPE_MISSING,
+                              CASE_TYPE_UNKNOWN, YEAR_NOT_NUMERIC, YEAR_OUT_OF_RANGE,
+                              error_messages, validate_batch, validate_csv)
+from scraper_enhanced import validate_case_input
+
+ROWS = [
+    ('CR', '1205', '2016', 0),
+    (' crm ', '+0042', '2020', 0),
+    ('', '1', '2016', CASE_TYPE_MISSING),
+    ('XX', '1', '2016', CASE_TYPE_UNKNOWN),
+    ('CR', '12a', '2016', CASE_NUMBER_NOT_NUMERIC),
+    ('CR', '', '2016', CASE_NUMBER_NOT_NUMERIC),
+    ('CR', '１２', '2016', CASE_NUMBER_NOT_NUMERIC),
+    ('CR', '1' * 19, '2016', CASE_NUMBER_NOT_NUMERIC),
+    ('CR', '-5', '2016', CASE_NUMBER_NOT_POSITIVE),
+    ('CR', '0', '2016', CASE_NUMBER_NOT_POSITIVE),
+    ('CR', '1', '20x6', YEAR_NOT_NUMERIC),
+    ('CR', '1', '1899', YEAR_OUT_OF_RANGE),
+    ('CR', '1', '2031', YEAR_OUT_OF_RANGE),
+    ('', 'x', '', CASE_TYPE_MISSING | CASE_NUMBER_NOT_NUMERIC | YEAR_NOT_NUMERIC),
+]
+
+
+def test_masks_per_row():
+    case_types, numbers, years, expected = zip(*ROWS)
+    assert validate_batch(case_types, numbers, years, current_year=2030).tolist() == list(expected)
+
+
+def test_empty_batch():
+    assert validate_batch([], [], []).tolist() == []
+
+
+def test_messages_match_single_lookup_validation():
+    # Unknown types, non-ASCII digits and over-long numbers are rejected by the batch check only
+    batch_only = ('XX', '１２', '1' * 19)
+    rows = [row[:3] for row in ROWS if not set(row[:2]) & set(batch_only)]
+    masks = validate_batch(*zip(*rows))
+    for row, mask in zip(rows, masks):
+        assert error_messages(int(mask)) == validate_case_input(*row)
+
+
+def test_validate_csv_accepts_year_column(tmp_path):
+    path = tmp_path / 'dockets.csv'
+    path.write_text('case_type,case_number,year\nCR,1,2016\nCR,0,2016\n')
+    columns, mask = validate_csv(str(path))
+    assert columns['filing_year'] == ['2016', '2016']
+    assert mask.tolist() == [0, CASE_NUMBER_NOT_POSITIVE]
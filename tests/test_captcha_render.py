@@ -0,0 +1,44 @@
+import io
+import random
+
+import numpy as np
+from PIL import Image
+
+from captcha_render import BLACK, GRAY, HEIGHT, WHITE, WIDTH, captcha_png, get_atlas, render_captcha
+from captcha_tokens import CAPTCHA_ALPHABET
+
+
+def test_atlas_covers_alphabet():
+    atlas = get_atlas()
+    assert get_atlas() is atlas
+    assert set(atlas.masks) == set(CAPTCHA_ALPHABET)
+    assert all(mask.any() for mask in atlas.masks.values())
+
+
+def test_render_is_seeded_and_uses_three_colors():
+    first = render_captcha('AB12CD', random.Random(7))
+    assert first.shape == (HEIGHT, WIDTH)
+    assert np.array_equal(first, render_captcha('AB12CD', random.Random(7)))
+    assert set(np.unique(first)) <= {WHITE, GRAY, BLACK} and (first == BLACK).any()
+
+
+def test_glyphs_near_edges_are_clipped():
+    # Long text pushes glyphs past both edges; nothing may raise
+    canvas = render_captcha(CAPTCHA_ALPHABET[:12], random.Random(1))
+    assert canvas.shape == (HEIGHT, WIDTH)
+
+
+def test_png_is_small_palette_image():
+    data = captcha_png('AB12CD')
+    image = Image.open(io.BytesIO(data))
+    assert image.size == (WIDTH, HEIGHT) and image.mode == 'P'
+    # IHDR bit depth 2, color type 3 (indexed)
+    assert data[24:26] == b'\x02\x03'
+    assert len(data) < 4096
+
+
+def test_route(app_module, client):
+    token = app_module.captcha_tokens.issue()
+    response = client.get(f'/captcha?token={token}')
+    assert response.status_code == 200 and response.mimetype == 'image/png'
+    assert client.get('/captcha?token=forged').status_code == 400
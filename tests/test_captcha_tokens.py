@@ -0,0 +1,55 @@
+import time
+
+from captcha_tokens import CAPTCHA_ALPHABET, CaptchaTokens, ExpiringSet
+
+
+def test_text_is_derived_from_token():
+    tokens = CaptchaTokens('secret')
+    token = tokens.issue()
+    text = tokens.text_for(token)
+    assert len(text) == 5 and set(text) <= set(CAPTCHA_ALPHABET)
+    assert CaptchaTokens('secret').text_for(token) == text
+    assert CaptchaTokens('other').text_for(token) is None
+
+
+def test_verify_is_single_use_and_case_insensitive():
+    tokens = CaptchaTokens('secret')
+    token = tokens.issue()
+    answer = tokens.text_for(token)
+    assert tokens.verify(token, f" {answer.lower()} ")
+    assert not tokens.verify(token, answer)
+
+
+def test_wrong_answer_consumes_token():
+    tokens = CaptchaTokens('secret')
+    token = tokens.issue()
+    assert not tokens.verify(token, 'WRONG')
+    assert not tokens.verify(token, tokens.text_for(token))
+
+
+def test_expired_and_malformed_tokens():
+    tokens = CaptchaTokens('secret', ttl=-1)
+    assert tokens.text_for(tokens.issue()) is None
+    for token in ('', 'a.b', 'a.b.c', None, 'é.1.x'):
+        assert tokens.text_for(token) is None
+
+
+def test_non_ascii_answer_is_rejected():
+    tokens = CaptchaTokens('secret')
+    assert not tokens.verify(tokens.issue(), 'é')
+
+
+def test_expiring_set_forgets_expired_nonces():
+    used = ExpiringSet()
+    assert used.add('a', time.time() + 60)
+    assert not used.add('a', time.time() + 60)
+    used.add('b', time.time() - 1)
+    used.add('c', time.time() + 60)
+    assert len(used) == 2
+
+
+def test_non_ascii_requests_are_rejected(client):
+    assert client.get('/captcha?token=%C3%A9.1.x').status_code == 400
+    response = client.post('/result', data={'captcha': 'é', 'captcha_token': 'x.1.y',
+                                            'case_type': 'CR', 'case_number': '1', 'filing_year': '2016'})
+    assert response.status_code == 200 and b'Invalid CAPTCHA' in response.data
@@ -0,0 +1,57 @@
+from case_graph import CaseGraph, case_links
+
+
+def record(citations=(), parties=(), advocate=None):
+    return {'citations': list(citations),
+            'parties': {'petitioner': [{'name': name} for name in parties]},
+            'advocate': advocate}
+
+
+def test_case_links_normalizes():
+    links = case_links(record(['2015 SCC 1'], ['Krishan  Kumar'], 'Adv. Deepak Verma'))
+    assert links == {'citation:2015 SCC 1', 'party:KRISHAN KUMAR', 'advocate:DEEPAK VERMA'}
+
+
+def test_related_scores_shared_links():
+    graph = CaseGraph(compact_threshold=2)
+    graph.add_case('CR/1/2016', record(['2015 SCC 1'], ['A']))
+    graph.add_case('CR/2/2016', record(['2015 SCC 1'], ['A']))
+    graph.add_case('CR/3/2016', record([], ['A']))
+    graph.add_case('CR/4/2016', record(['1999 SCC 9']))
+    related = graph.related('CR/1/2016')
+    assert [item['case_id'] for item in related] == ['CR/2/2016', 'CR/3/2016']
+    assert related[0]['score'] == 5.0
+    assert graph.related('CR/4/2016') == []
+
+
+def test_reindex_drops_old_links_across_compaction():
+    graph = CaseGraph(compact_threshold=1)
+    graph.add_case('CR/1/2016', record(['X']))
+    graph.add_case('CR/2/2016', record(['X']))
+    graph.compact()
+    graph.add_case('CR/2/2016', record(['Y']))
+    assert graph.related('CR/1/2016') == []
+
+
+def test_hub_links_are_ignored():
+    graph = CaseGraph(max_fanout=2)
+    for number in range(3):
+        graph.add_case(f'CR/{number}/2016', record(parties=['State of Haryana']))
+    assert graph.related('CR/0/2016') == []
+
+
+def test_k_hop():
+    graph = CaseGraph()
+    graph.add_case('CR/1/2016', record(['X']))
+    graph.add_case('CR/2/2016', record(['X', 'Y']))
+    graph.add_case('CR/3/2016', record(['Y']))
+    assert graph.k_hop('CR/1/2016', k=2) == [{'case_id': 'CR/2/2016', 'hops': 1},
+                                             {'case_id': 'CR/3/2016', 'hops': 2}]
+
+
+def test_lookup_does_not_link_placeholder_parties(client, lookup):
+    url = '/related/CR/1205/2016'
+    before = client.get(url).get_json()['related']
+    assert lookup('CR', '1205', '2016').status_code == 200
+    assert lookup('MACP', '5678', '2025').status_code == 200
+    assert client.get(url).get_json()['related'] == before
@@ -0,0 +1,35 @@
+from case_history import CaseHistory, diff_records
+
+
+def test_diff_fields_and_list_items():
+    old = {'status': 'Pending', 'proceedings': [{'event': 'Filed'}], 'judge': 'A'}
+    new = {'status': 'Disposed', 'proceedings': [{'event': 'Filed'}, {'event': 'Heard'}]}
+    assert diff_records(old, new) == [
+        {'op': 'remove', 'path': ['judge'], 'old': 'A'},
+        {'op': 'add', 'path': ['proceedings'], 'item': {'event': 'Heard'}},
+        {'op': 'set', 'path': ['status'], 'old': 'Pending', 'new': 'Disposed'},
+    ]
+
+
+def test_versions_only_on_change(tmp_path):
+    history = CaseHistory(str(tmp_path / 'history.db'))
+    assert history.record('CR/1/2016', {'status': 'Pending'})['version'] == 1
+    assert history.record('CR/1/2016', {'status': 'Pending'}) is None
+    assert history.record('CR/1/2016', {'status': 'Disposed'})['version'] == 2
+
+    # A new instance reads the head from the database rather than re-storing it
+    reopened = CaseHistory(str(tmp_path / 'history.db'))
+    assert reopened.record('CR/1/2016', {'status': 'Disposed'}) is None
+    assert reopened.latest_version('CR/1/2016') == 2
+    assert reopened.latest_record('CR/1/2016') == {'status': 'Disposed'}
+    assert [v['version'] for v in reopened.changes_since('CR/1/2016', 1)] == [2]
+    assert reopened.changes_since('CR/1/2016', '9999-01-01 00:00:00') == []
+
+
+def test_history_route(app_module, client, lookup):
+    assert lookup('MACP', '5678', '2025').status_code == 200
+    # Reads come from the court's replica, which is refreshed in the background
+    app_module.shards.shard_for('MACP/5678/2025').storage.refresh()
+    data = client.get('/history/MACP/5678/2025').get_json()
+    assert data['case_id'] == 'MACP/5678/2025' and data['version'] >= 1
+    assert client.get('/history/not-a-case').status_code == 404
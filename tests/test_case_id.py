@@ -0,0 +1,58 @@
+import pickle
+import sqlite3
+
+import pytest
+
+from case_id import CaseId, as_case_id
+
+
+def test_normalized_and_interned():
+    case_id = CaseId.of(' cr ', '0012', 2016)
+    assert str(case_id) == 'CR/12/2016'
+    assert CaseId.parse('CR/12/2016') is case_id
+    assert as_case_id('cr', 12, '2016') is case_id
+    assert case_id == 'CR/12/2016' and hash(case_id) == hash('CR/12/2016')
+    assert {'CR/12/2016': 1}[case_id] == 1
+    assert pickle.loads(pickle.dumps(case_id)) is case_id
+    assert CaseId.of('CR', '12', '02016') is case_id
+
+
+def test_zero_padded_year_round_trips():
+    case_id = CaseId.parse('CR/12/02016')
+    assert str(case_id) == 'CR/12/2016'
+    assert CaseId.unpack(case_id.packed) is case_id
+
+
+def test_parse_rejects_malformed():
+    for value in ('CR/12', 'CR//2016', 'CR/12/2016/1', ''):
+        with pytest.raises(ValueError):
+            CaseId.parse(value)
+    with pytest.raises(TypeError):
+        CaseId('CR', 12, 2016)
+
+
+def test_packed_round_trip():
+    for key in ('CR/1205/2016', 'CRM-M/1/2020', 'MACP/5678/2025', 'A/0/0'):
+        case_id = CaseId.parse(key)
+        assert CaseId.unpack(case_id.packed_bytes) is case_id
+        assert CaseId.unpack(case_id.packed) is case_id
+
+
+def test_unpackable_ids():
+    for key in ('CR/12A/2016', 'CR.X/1/2016', 'ABCDEFGHIJ/1/2016', 'CR/1/99999'):
+        with pytest.raises(ValueError):
+            CaseId.parse(key).packed
+
+
+def test_sqlite_adapter():
+    conn = sqlite3.connect(':memory:')
+    assert conn.execute("SELECT ?", (CaseId.of('CR', 1, 2016),)).fetchone() == ('CR/1/2016',)
+    conn.close()
+
+
+def test_lookups_log_the_canonical_id(app_module, lookup):
+    assert lookup('crm', '01234', '2020').status_code == 200
+    conn = app_module.storage.write()
+    row = conn.execute("SELECT case_type, case_number, year FROM queries ORDER BY id DESC LIMIT 1").fetchone()
+    conn.close()
+    assert row == ('CRM', '1234', '2020')
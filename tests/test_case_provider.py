@@ -0,0 +1,45 @@
+import case_provider
+from case_id import CaseId
+from case_provider import EnhancedMockCaseData, full_record, is_full_record, project
+from case_snapshot import build_snapshot
+
+
+def test_project_dotted_fields():
+    record = {'case_id': 'CR/1/2016', 'judgment': {'outcome': 'Allowed', 'date': '2017-01-01'}}
+    assert project(record, ['judgment.outcome', 'missing.field']) == {'judgment': {'outcome': 'Allowed'}}
+    # A whole section wins over a field inside it
+    assert project(record, ['judgment', 'judgment.outcome']) == {'judgment': record['judgment']}
+
+
+def test_fixture_and_default_records():
+    record = EnhancedMockCaseData.get_mock_data('crm', '01234', '2020')
+    assert record['case_id'] == 'CRM/1234/2020' and is_full_record(record)
+    assert EnhancedMockCaseData.has_record(CaseId.of('CRM', 1234, 2020))
+    assert not EnhancedMockCaseData.has_record(CaseId.of('CRM', 1235, 2020))
+    default = EnhancedMockCaseData.get_mock_data('CRM/1235/2020')
+    assert default['case_id'] == 'CRM/1235/2020' and default['case_status'] == 'Pending'
+
+
+def test_full_record_prefers_complete_fetch():
+    case_id = CaseId.of('CR', 1205, 2016)
+    summary = {'case_id': str(case_id), 'status': 'Pending'}
+    assert not is_full_record(summary) and not is_full_record({'parties': {}, 'error': 'x'})
+    assert full_record(case_id, summary) is EnhancedMockCaseData.get_record(case_id)
+    fetched = {'case_id': str(case_id), 'parties': {}}
+    assert full_record(case_id, fetched) is fetched
+    assert full_record(CaseId.of('CR', 1, 1999), summary) is None
+
+
+def test_snapshot_records_come_first(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cases.snap')
+    build_snapshot([{'case_id': 'CRM/1234/2020', 'case_status': 'From snapshot'},
+                    {'case_id': 'WP/9/2010', 'case_status': 'Snapshot only'}], path)
+    monkeypatch.setenv('CASE_SNAPSHOT', path)
+    monkeypatch.setattr(case_provider, '_snapshot', None)
+    monkeypatch.setattr(case_provider, '_data_version', None)
+    assert EnhancedMockCaseData.get_record(CaseId.of('CRM', 1234, 2020))['case_status'] == 'From snapshot'
+    assert EnhancedMockCaseData.get_fields(CaseId.of('WP', 9, 2010), ['case_status']) == {
+        'case_status': 'Snapshot only'}
+    assert EnhancedMockCaseData.has_record(CaseId.of('WP', 9, 2010))
+    assert case_provider.data_version().startswith(path + '@')
+    case_provider._snapshot.close()
@@ -0,0 +1,51 @@
+import pytest
+
+from case_id import CaseId
+from case_provider import FIXTURES_PATH
+from case_snapshot import CaseSnapshot, _load_source, build_snapshot
+
+
+@pytest.fixture
+def records():
+    return _load_source(FIXTURES_PATH) + [
+        {'case_id': 'WP/7/2001', 'parties': {'petitioner': 'Ārya Devī'}, 'empty': None},
+        {'case_id': 'CR/00012/2016', 'status': 'Pending'},
+    ]
+
+
+def test_round_trip(tmp_path, records):
+    path = str(tmp_path / 'cases.snap')
+    assert build_snapshot(records, path) == len(records)
+    snapshot = CaseSnapshot(path)
+    try:
+        assert len(snapshot) == len(records)
+        for record in records:
+            assert snapshot.get(record['case_id']) == record
+            assert record['case_id'] in snapshot
+        keys = list(snapshot.keys())
+        assert [key.packed_bytes for key in keys] == sorted(key.packed_bytes for key in keys)
+        # Case ids are matched in canonical form
+        assert snapshot.get('CR/12/2016') == {'case_id': 'CR/00012/2016', 'status': 'Pending'}
+    finally:
+        snapshot.close()
+
+
+def test_get_fields_and_misses(tmp_path, records):
+    path = str(tmp_path / 'cases.snap')
+    build_snapshot(records, path)
+    snapshot = CaseSnapshot(path)
+    try:
+        assert snapshot.get_fields('WP/7/2001', ['parties', 'missing']) == {
+            'parties': {'petitioner': 'Ārya Devī'}}
+        assert snapshot.get(CaseId.of('WP', 8, 2001)) is None
+        assert snapshot.get_fields('WP/8/2001', ['parties']) is None
+        assert 'not a case' not in snapshot
+    finally:
+        snapshot.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.snap'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        CaseSnapshot(str(path))
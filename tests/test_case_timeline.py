@@ -0,0 +1,63 @@
+import pytest
+
+from case_id import CaseId
+from case_timeline import CaseTimeline, TimelineCache, decode_cursor, encode_cursor
+
+ITEMS = [{'date': f'2020-01-{day:02d}', 'event': f'Hearing {day}'} for day in range(1, 11)]
+
+
+def walk(timeline, limit):
+    cursor, seen = None, []
+    while True:
+        page = timeline.page(cursor, limit)
+        seen.extend(item['event'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return seen
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor((-737425, -3))) == (-737425, -3)
+    with pytest.raises(ValueError):
+        decode_cursor('not a cursor')
+
+
+def test_pages_newest_first_without_gaps():
+    timeline = CaseTimeline(ITEMS + [{'date': 'To be scheduled', 'event': 'Arguments'}])
+    events = walk(timeline, 3)
+    assert events == [f'Hearing {day}' for day in range(10, 0, -1)] + ['Arguments']
+
+
+def test_cursor_survives_new_entries():
+    page = CaseTimeline(ITEMS).page(limit=4)
+    # The refreshed record gained a newer hearing; the next page still starts after Hearing 7
+    refreshed = CaseTimeline(ITEMS + [{'date': '2020-02-01', 'event': 'Hearing 32'}])
+    assert refreshed.page(page['next_cursor'], 2)['items'][0]['event'] == 'Hearing 6'
+
+
+def test_cache_rebuilds_for_new_source():
+    cache = TimelineCache()
+    record = {'proceedings': ITEMS[:2]}
+    first = cache.get('key', lambda: record['proceedings'], source=record)
+    assert cache.get('key', lambda: [], source=record) is first
+    refreshed = {'proceedings': ITEMS}
+    assert len(cache.get('key', lambda: refreshed['proceedings'], source=refreshed)) == 10
+    assert cache.get('missing', lambda: None) is None
+
+
+def test_timeline_route(app_module, client):
+    first = client.get('/api/cases/CRM/1234/2020/documents?limit=1').get_json()
+    assert first['total'] == 2 and len(first['documents']) == 1 and first['next_cursor']
+    assert client.get('/api/cases/CRM/1234/2020/proceedings?cursor=bogus').status_code == 400
+    assert client.get('/api/cases/CR/999/1999/documents').status_code == 404
+
+
+def test_timeline_follows_fetched_record(app_module, client):
+    case_id = CaseId.of('CR', '1205', '2016')
+    stored = client.get('/api/cases/CR/1205/2016').get_json()
+    app_module.shards.put(case_id, dict(stored, proceedings=ITEMS))
+    try:
+        page = client.get('/api/cases/CR/1205/2016/proceedings?limit=2').get_json()
+        assert page['total'] == 10 and page['proceedings'][0]['event'] == 'Hearing 10'
+    finally:
+        app_module.shards.put(case_id, stored)
@@ -0,0 +1,71 @@
+from datetime import date
+
+from cause_list import CauseListIndex, date_ordinal, hearing_events
+
+RECORD = {
+    'court_code': 'PHHC',
+    'judge': 'Justice A. Sharma',
+    'next_hearing_date': '15-03-2016',
+    'proceedings': [
+        {'date': '2016-01-15', 'event': 'Appeal filed'},
+        {'date': 'To be scheduled', 'event': 'Arguments'},
+    ],
+}
+
+
+def test_date_ordinal_formats():
+    assert date_ordinal('15-03-2016') == date(2016, 3, 15).toordinal()
+    assert date_ordinal('2016-03-15') == date(2016, 3, 15).toordinal()
+    assert date_ordinal('To be scheduled') is None
+    assert date_ordinal('31-02-2016') is None
+    assert date_ordinal(None) is None
+
+
+def test_hearing_events_skip_undated():
+    kinds = sorted(kind for _, kind, _, _ in hearing_events(RECORD))
+    assert kinds == ['hearing', 'proceeding']
+
+
+def test_court_range_and_judge_day():
+    index = CauseListIndex()
+    index.add_case('CR/1/2016', RECORD)
+    events = index.court_range('phhc', date(2016, 1, 1).toordinal(), date(2016, 12, 31).toordinal())
+    assert [event['date'] for event in events] == ['2016-01-15', '2016-03-15']
+    assert index.judge_day('justice a. sharma', date(2016, 3, 15).toordinal())[0]['case_id'] == 'CR/1/2016'
+    assert index.court_range('PHHC', date(2017, 1, 1).toordinal(), date(2017, 12, 31).toordinal()) == []
+
+
+def test_reindex_replaces_entries():
+    index = CauseListIndex()
+    index.add_case('CR/1/2016', RECORD)
+    index.add_case('CR/1/2016', dict(RECORD, proceedings=[]))
+    assert len(index) == 1
+
+
+def test_reindexing_keeps_arrays_sorted():
+    index = CauseListIndex()
+    for n in range(1, 6):
+        index.add_case(f'CR/{n}/2016', dict(RECORD, next_hearing_date=f'{10 + n}-03-2016'))
+    # Move one case's hearing past the others and another's before them
+    index.add_case('CR/2/2016', dict(RECORD, next_hearing_date='30-03-2016'))
+    index.add_case('CR/4/2016', dict(RECORD, next_hearing_date='01-03-2016'))
+    entries = index._by_court['PHHC']
+    assert entries == sorted(entries) and len(entries) == 10
+    hearings = [event['case_id'] for event in index.court_range('PHHC', date(2016, 2, 1).toordinal(),
+                                                                 date(2016, 12, 31).toordinal())]
+    assert hearings == ['CR/4/2016', 'CR/1/2016', 'CR/3/2016', 'CR/5/2016', 'CR/2/2016']
+
+
+def test_record_without_court_or_dates_keeps_entries():
+    index = CauseListIndex()
+    index.add_case('CR/1/2016', RECORD)
+    index.add_case('CR/1/2016', {'case_id': 'CR/1/2016', 'status': 'Pending', 'result': True})
+    assert len(index) == 2
+
+
+def test_lookup_keeps_cause_list(client, lookup):
+    url = '/cause-list/court/PHHC?from=01-01-2015&to=31-12-2016'
+    before = client.get(url).get_json()['events']
+    assert any(event['case_id'] == 'CR/1205/2016' for event in before)
+    assert lookup('CR', '1205', '2016').status_code == 200
+    assert client.get(url).get_json()['events'] == before
@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from case_id import CaseId
+from court_shards import CourtShards, court_for, limits_from_env
+from resilience import UpstreamUnavailable
+
+
+def test_court_routing_and_limits():
+    assert court_for('CR/1/2016') == 'PHHC'
+    assert court_for(CaseId.of('MACP', 1, 2025)) == 'MACT'
+    assert court_for('XYZ/1/2016') == 'DCF'
+    assert limits_from_env('phhc=8:32, MACT=2') == {'PHHC': (8, 32), 'MACT': (2, 16)}
+    assert limits_from_env('') == {}
+
+
+def test_shards_keep_separate_caches_and_history(tmp_path):
+    shards = CourtShards(lambda *parts: {'case_id': '/'.join(parts)}, str(tmp_path), {})
+    phhc, mact = CaseId.of('CR', 1, 2016), CaseId.of('MACP', 1, 2025)
+    shards.put(phhc, {'status': 'Pending'})
+    assert shards.get(phhc, 60) == {'status': 'Pending'}
+    assert shards.shard('MACT').cache.get(phhc, 60) is None
+    assert shards.history(mact).record(str(mact), {'status': 'Pending'})['version'] == 1
+    assert shards.history(phhc).latest_version(str(mact)) == 0
+    assert shards.courts() == ['MACT', 'PHHC']
+    assert shards.fetch('CR', '1', '2016') == {'case_id': 'CR/1/2016'}
+
+
+def test_saturated_court_refuses_without_affecting_others(tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def fetch(case_type, case_number, filing_year):
+        if case_type == 'CR':
+            started.set()
+            release.wait(5)
+        return {'case_id': f"{case_type}/{case_number}/{filing_year}"}
+
+    shards = CourtShards(fetch, str(tmp_path), {'PHHC': (1, 0)})
+    blocked = threading.Thread(target=shards.fetch, args=('CR', '1', '2016'))
+    blocked.start()
+    try:
+        assert started.wait(5)
+        # The only PHHC slot is taken; other courts still have theirs
+        with pytest.raises(UpstreamUnavailable):
+            shards.fetch('CR', '2', '2016')
+        assert shards.fetch('MACP', '1', '2025') == {'case_id': 'MACP/1/2025'}
+    finally:
+        release.set()
+        blocked.join(5)
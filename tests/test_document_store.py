@@ -0,0 +1,124 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import document_store
+from document_store import DocumentNotFound, DocumentStore, DocumentUnavailable
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    """A portal stand-in serving files from a directory, counting requests"""
+    root = tmp_path / 'portal'
+    (root / 'orders').mkdir(parents=True)
+    requests_seen = []
+
+    class Handler(SimpleHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            super().do_GET()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(Handler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", root / 'orders', requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_downloads_once_and_reloads_index(tmp_path, upstream):
+    url, orders, seen = upstream
+    (orders / 'a.pdf').write_bytes(b'%PDF a')
+    store = DocumentStore(str(tmp_path / 'cache'), upstream=url)
+    path = store.get('/orders/a.pdf')
+    assert open(path, 'rb').read() == b'%PDF a'
+    assert store.get('/orders/a.pdf') == path and seen == ['/orders/a.pdf']
+
+    reopened = DocumentStore(str(tmp_path / 'cache'), upstream=url)
+    assert reopened.get('/orders/a.pdf') == path and len(seen) == 1
+
+
+def test_rejects_unknown_and_unsafe_links(tmp_path, upstream):
+    url, orders, seen = upstream
+    store = DocumentStore(str(tmp_path / 'cache'), upstream=url)
+    for link in ('/orders/missing.pdf', '/orders/../secret.pdf', '/etc/passwd.pdf', '/orders/a.txt'):
+        with pytest.raises(DocumentNotFound):
+            store.get(link)
+    assert seen == ['/orders/missing.pdf']
+    # No partial download is left behind
+    assert sorted(os.listdir(str(tmp_path / 'cache'))) == ['blobs', 'index.db']
+
+
+def test_evicts_least_recently_used(tmp_path, upstream):
+    url, orders, seen = upstream
+    for name in 'abc':
+        (orders / f'{name}.pdf').write_bytes(name.encode() * 100)
+    store = DocumentStore(str(tmp_path / 'cache'), max_bytes=250, upstream=url)
+    first = store.get('/orders/a.pdf')
+    store.get('/orders/b.pdf')
+    store.get('/orders/a.pdf')
+    store.get('/orders/c.pdf')
+    # b was least recently used
+    assert os.path.exists(first)
+    store.get('/orders/b.pdf')
+    assert seen.count('/orders/b.pdf') == 2 and seen.count('/orders/a.pdf') == 1
+
+
+def test_route_serves_ranges(app_module, client, upstream, monkeypatch):
+    url, orders, seen = upstream
+    (orders / 'ranged.pdf').write_bytes(b'0123456789')
+    monkeypatch.setattr(app_module.document_store, 'upstream', url)
+    # Only documents a case links to are fetched
+    assert client.get('/documents/orders/ranged.pdf').status_code == 404
+    app_module.document_search.link_case('CR/5/2016', ['/orders/ranged.pdf'])
+    response = client.get('/documents/orders/ranged.pdf', headers={'Range': 'bytes=2-5'})
+    assert response.status_code == 206 and response.data == b'2345'
+    assert response.mimetype == 'application/pdf'
+    assert client.get('/documents/orders/none.pdf').status_code == 404
+
+
+def test_blob_evicted_by_another_worker_is_a_miss(tmp_path, upstream):
+    url, orders, seen = upstream
+    (orders / 'a.pdf').write_bytes(b'%PDF a')
+    first = DocumentStore(str(tmp_path / 'cache'), upstream=url)
+    second = DocumentStore(str(tmp_path / 'cache'), upstream=url)
+    path = first.get('/orders/a.pdf')
+    assert second.get('/orders/a.pdf') == path
+    os.remove(path)
+    assert open(second.get('/orders/a.pdf'), 'rb').read() == b'%PDF a'
+    assert len(seen) == 3
+
+
+def test_disallowed_links_are_not_fetched(tmp_path, upstream):
+    url, orders, seen = upstream
+    (orders / 'a.pdf').write_bytes(b'%PDF a')
+    store = DocumentStore(str(tmp_path / 'cache'), upstream=url, allow=lambda link: link == '/orders/b.pdf')
+    with pytest.raises(DocumentNotFound):
+        store.get('/orders/a.pdf')
+    assert seen == []
+
+
+def test_upstream_failures_are_unavailable(tmp_path, monkeypatch):
+    class Broken:
+        status_code = 200
+
+        def iter_content(self, chunk_size):
+            yield b'%PDF'
+            raise document_store.requests.ConnectionError('reset')
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+    monkeypatch.setattr(document_store.requests, 'get', lambda url, **kwargs: Broken())
+    store = DocumentStore(str(tmp_path / 'cache'), upstream='http://portal')
+    with pytest.raises(DocumentUnavailable):
+        store.get('/orders/a.pdf')
+    assert sorted(os.listdir(str(tmp_path / 'cache'))) == ['blobs', 'index.db']
@@ -0,0 +1,41 @@
+import pytest
+
+from case_history import CaseHistory
+from export import export_cases, export_queries
+from storage_router import StorageRouter
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def test_queries_export_is_incremental(tmp_path):
+    db = str(tmp_path / 'queries.db')
+    router = StorageRouter(db, str(tmp_path / 'replica.db'))
+    for number in range(5):
+        router.log_query('CR', str(number), '2016')
+    out = tmp_path / 'out'
+    out.mkdir()
+    rows, watermark = export_queries(db, str(out), 0, chunk_size=2)
+    assert (rows, watermark) == (5, 5)
+    table = pq.read_table(str(out / 'queries-000000000001.parquet'))
+    assert table.column('case_number').to_pylist() == ['0', '1', '2', '3', '4']
+    assert str(table.schema.field('case_type').type).startswith('dictionary')
+
+    router.log_query('MACP', '9', '2025')
+    assert export_queries(db, str(out), watermark, chunk_size=2) == (1, 6)
+    assert export_queries(db, str(out), 6, chunk_size=2) == (0, 6)
+    assert not (out / 'queries-000000000007.parquet').exists()
+
+
+def test_cases_export_latest_versions(tmp_path):
+    db = str(tmp_path / 'shard.db')
+    history = CaseHistory(db)
+    history.record('CR/1/2016', {'court': 'PHHC', 'status': 'Pending'})
+    history.record('CR/1/2016', {'court': 'PHHC', 'status': 'Disposed'})
+    history.record('CR/2/2016', {'court_name': 'PHHC', 'case_status': 'Pending'})
+    rows, watermark = export_cases(db, str(tmp_path), 0, chunk_size=10, name='cases-PHHC')
+    assert rows == 2
+    table = pq.read_table(str(tmp_path / 'cases-PHHC-000000000001.parquet')).to_pydict()
+    assert table['case_id'] == ['CR/1/2016', 'CR/2/2016']
+    assert table['case_status'] == ['Disposed', 'Pending'] and table['version'] == [2, 1]
+    assert table['court'] == ['PHHC', 'PHHC']
+    assert export_cases(db, str(tmp_path), watermark, chunk_size=10)[0] == 0
@@ -0,0 +1,66 @@
+import hashlib
+import os
+import time
+
+from document_store import DocumentNotFound, DocumentStore
+from extraction import DocumentSearch, document_urls, extract_chunks, fetch_linked, run
+
+PDF = (b"%PDF-1.4\n1 0 obj\n<< /Length 52 >>\nstream\n"
+       b"BT /F1 12 Tf (Appeal allowed with costs) Tj ET\n"
+       b"endstream\nendobj\n%%EOF\n")
+
+
+def cache_document(cache_dir, url, data):
+    """Put a document in a store's cache as if it had been downloaded"""
+    store = DocumentStore(cache_dir)
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = store.blob_path(sha256)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    conn = store._connect()
+    conn.execute("INSERT INTO documents (url, sha256, size, last_access) VALUES (?, ?, ?, ?)",
+                 (url, sha256, len(data), time.time()))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_extract_chunks(tmp_path):
+    path = cache_document(str(tmp_path), '/orders/a.pdf', PDF)
+    assert extract_chunks(path) == [(0, 'Appeal allowed with costs')]
+
+
+def test_document_urls():
+    record = {'documents': [{'url': '/mock/a.pdf'}, {'title': 'no link'}], 'pdf_order_link': '/orders/b.pdf'}
+    assert document_urls(record) == ['/mock/a.pdf', '/orders/b.pdf']
+    assert document_urls({'pdf_order_link': ''}) == []
+
+
+def test_cli_fetches_linked_documents_then_extracts(tmp_path, monkeypatch):
+    search = DocumentSearch(DocumentStore(str(tmp_path)))
+    search.link_case('CR/77/2023', ['/orders/new-case.pdf', '/orders/missing.pdf'])
+    assert sorted(search.unfetched_links()) == ['/orders/missing.pdf', '/orders/new-case.pdf']
+
+    def download(url):
+        if url != '/orders/new-case.pdf':
+            raise DocumentNotFound(url)
+        return cache_document(str(tmp_path), url, PDF)
+    monkeypatch.setattr(search.store, 'get', download)
+    assert fetch_linked(search) == 1
+    assert search.unfetched_links() == ['/orders/missing.pdf']
+
+    assert run(search.store, workers=1) == 1
+    results = search.search('allowed')
+    assert [(r['case_id'], r['url']) for r in results] == [('CR/77/2023', '/orders/new-case.pdf')]
+    assert search.pending_jobs() == []
+
+
+def test_lookup_links_case_documents_without_fetching(app_module, lookup):
+    assert lookup('CRM', '1234', '2020').status_code == 200
+    conn = app_module.document_search._connect()
+    urls = {url for (url,) in conn.execute("SELECT url FROM case_documents WHERE case_id = ?", ('CRM/1234/2020',))}
+    conn.close()
+    assert '/mock/judgments/nikita-tomar-judgment.pdf' in urls
+    # Linked documents wait for the offline run
+    assert '/mock/judgments/nikita-tomar-judgment.pdf' in app_module.document_search.unfetched_links()
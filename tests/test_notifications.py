@@ -0,0 +1,137 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import notifications
+from notifications import NotificationHub, relevant_changes, webhook_url_allowed
+
+VERSION = {'version': 2, 'recorded_at': '2026-01-01 00:00:00',
+           'changes': [{'path': ['status'], 'old': 'Pending', 'new': 'Disposed'}]}
+
+
+@pytest.fixture
+def hub(tmp_path):
+    hub = NotificationHub(str(tmp_path / 'hub.db'), batch_window=0.01,
+                          allowed_hosts=frozenset({'hooks.example.com'}))
+    hub.start()
+    return hub
+
+
+def test_relevant_changes():
+    changes = [{'path': ['status']}, {'path': ['court_fees']}, {'path': []}]
+    assert relevant_changes(changes) == [{'path': ['status']}]
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/hook', 'http://169.254.169.254/latest/meta-data', 'https://10.0.0.5/',
+    'http://[::1]:8080/', 'ftp://93.184.216.34/', 'http:///nohost', 'http://93.184.216.34:99999/',
+])
+def test_internal_and_malformed_urls_rejected(url):
+    assert not webhook_url_allowed(url)
+
+
+def test_public_address_allowed():
+    assert webhook_url_allowed('https://93.184.216.34/hook')
+
+
+def test_allowlist_replaces_address_check():
+    allowed = frozenset({'hooks.example.com'})
+    assert webhook_url_allowed('https://hooks.example.com/x', allowed)
+    assert not webhook_url_allowed('https://93.184.216.34/x', allowed)
+
+
+def test_add_webhook_rejects_disallowed_url(hub):
+    with pytest.raises(ValueError):
+        hub.add_webhook('http://127.0.0.1/hook', ['CR/1/2016'])
+
+
+def test_slow_webhook_does_not_delay_streams(hub, monkeypatch):
+    release = threading.Event()
+    posted = []
+
+    def slow_post(session, url, **kwargs):
+        posted.append(url)
+        release.wait(5)
+        raise notifications.requests.ConnectionError()
+
+    monkeypatch.setattr(notifications.requests.Session, 'post', slow_post)
+    hub.add_webhook('https://hooks.example.com/x', ['CR/1/2016'])
+    stream = hub.open_stream(['CR/1/2016'])
+    for version in (2, 3):
+        hub.publish('CR/1/2016', dict(VERSION, version=version))
+        start = time.monotonic()
+        assert stream.get(timeout=1)['version'] == version
+        assert time.monotonic() - start < 0.5
+    release.set()
+    assert posted
+
+
+def test_subscription_endpoint_rejects_internal_url(client):
+    response = client.post('/subscriptions', json={'url': 'http://169.254.169.254/', 'case_ids': ['CR/1/2016']})
+    assert response.status_code == 400
+
+
+def test_subscriptions_from_other_workers_are_picked_up(tmp_path):
+    hub = NotificationHub(str(tmp_path / 'hub.db'), subscription_ttl=0,
+                          allowed_hosts=frozenset({'hooks.example.com'}))
+    other = NotificationHub(str(tmp_path / 'hub.db'), allowed_hosts=frozenset({'hooks.example.com'}))
+    other.add_webhook('https://hooks.example.com/x', ['CR/1/2016'])
+    hub.publish('CR/1/2016', VERSION)
+    batch = hub._next_batch()
+    assert [event['case_id'] for event in batch] == ['CR/1/2016']
+    other.remove_webhook(hub._webhooks['CR/1/2016'].popitem()[0])
+    hub.publish('CR/1/2016', VERSION)
+    assert hub._events.empty()
+
+
+def test_dispatcher_survives_errors(hub, monkeypatch, caplog):
+    calls = []
+
+    def broken_fan_out(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+
+    monkeypatch.setattr(hub, '_fan_out', broken_fan_out)
+    hub._streams['CR/1/2016'] = set()
+    for version in (2, 3):
+        hub.publish('CR/1/2016', dict(VERSION, version=version))
+        for _ in range(100):
+            if len(calls) >= version - 1:
+                break
+            time.sleep(0.01)
+    assert len(calls) == 2
+    assert any(record.getMessage() == 'Notification dispatch failed' and record.exc_info
+               for record in caplog.records)
+
+
+def test_delivery_refuses_rebound_private_address(tmp_path):
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(self.path)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+    try:
+        # Public at check time, loopback when delivering
+        hub = NotificationHub(str(tmp_path / 'hub.db'), max_retries=1)
+        hub.url_allowed = lambda url: True
+        hub._deliver(url, [{'case_id': 'CR/1/2016'}], 0)
+        assert received == []
+        # The same delivery goes through when the host is allowlisted
+        trusted = NotificationHub(str(tmp_path / 'hub.db'), allowed_hosts=frozenset({'127.0.0.1'}))
+        trusted._deliver(url, [{'case_id': 'CR/1/2016'}], 0)
+        assert received == ['/hook']
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,109 @@
+import time
+
+import pytest
+import requests
+
+from portal_sessions import SessionPool
+from resilience import UpstreamUnavailable
+from upstream_stub import start_stub
+
+
+def test_refresh_failures_are_logged(caplog):
+    pool = SessionPool('http://portal.invalid', size=2)
+
+    def establish():
+        raise requests.ConnectionError('portal unreachable')
+    pool._establish = establish
+    pool._refresh()
+    failures = [record for record in caplog.records if record.getMessage() == 'Portal session refresh failed']
+    assert failures and failures[0].levelname == 'WARNING' and failures[0].exc_info
+    # The reservations were given back
+    assert pool._total == 0
+
+
+def test_sessions_are_reused_until_their_budget_runs_out():
+    server = start_stub(require_session=True, session_budget=2)
+    pool = SessionPool(f"http://127.0.0.1:{server.server_port}", size=1, max_size=2)
+    try:
+        for _ in range(4):
+            with pool.lease() as session:
+                assert session.get(f"{pool.base_url}/case/CR/1205/2016", timeout=5).status_code == 200
+        # Four searches with two per session
+        assert pool.status()['established'] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_rejected_sessions_are_not_reused():
+    server = start_stub(require_session=True)
+    pool = SessionPool(f"http://127.0.0.1:{server.server_port}", size=1)
+    try:
+        with pool.lease() as session:
+            session.invalidate()
+        with pool.lease() as session:
+            assert not session.rejected
+        assert pool.status()['established'] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unreachable_portal_is_unavailable():
+    pool = SessionPool('http://127.0.0.1:9', timeout=0.5)
+    with pytest.raises(UpstreamUnavailable):
+        with pool.lease():
+            pass
+    assert pool.status()['total'] == 0
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_background_refresh_replenishes_and_replaces_sessions():
+    server = start_stub(require_session=True, session_ttl=0.6)
+    pool = SessionPool(f"http://127.0.0.1:{server.server_port}", size=2, refresh_margin=0.3,
+                       refresh_interval=0.05)
+    try:
+        pool.start()
+        wait_for(lambda: pool.status()['idle'] == 2)
+        first = list(pool._idle)
+        # A leased session is replaced in the idle set while it is out
+        with pool.lease() as session:
+            wait_for(lambda: pool.status()['idle'] == 2)
+            assert session.get(f"{pool.base_url}/case/CR/1205/2016", timeout=5).status_code == 200
+        # Sessions near expiry are retired and replaced before they run out
+        wait_for(lambda: not any(session in pool._idle for session in first))
+        assert pool.status()['idle'] >= 2 and pool.status()['total'] <= pool.max_size
+        assert all(session.usable() for session in pool._idle)
+    finally:
+        pool.stop()
+        server.shutdown()
+        server.server_close()
+
+
+def test_unexpected_refresh_errors_give_reservations_back(caplog):
+    pool = SessionPool('http://portal.invalid', size=2, refresh_interval=0.02)
+    calls = []
+
+    def establish():
+        calls.append(1)
+        raise KeyError('ttl')
+    pool._establish = establish
+    with pytest.raises(KeyError):
+        pool._refresh()
+    assert pool._total == 0
+
+    # The background thread logs the error and keeps going
+    pool.start()
+    try:
+        wait_for(lambda: len(calls) >= 3)
+    finally:
+        pool.stop()
+        pool._thread.join(1)
+    assert any(record.getMessage() == 'Portal session refresh crashed' for record in caplog.records)
+    assert pool._total == 0
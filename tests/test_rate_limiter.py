@@ -0,0 +1,59 @@
+import sqlite3
+
+from flask import Flask
+
+from rate_limiter import MemoryBackend, RateLimiter, SQLiteBackend, client_keys, rate_limited
+
+
+def test_bucket_allows_burst_then_refills():
+    backend = MemoryBackend()
+    assert [backend.take('k', 1.0, 2, 0.0) for _ in range(2)] == [0.0, 0.0]
+    assert backend.take('k', 1.0, 2, 0.0) == 1.0
+    assert backend.take('k', 1.0, 2, 1.0) == 0.0
+
+
+def test_allowed_requests_respect_the_cap():
+    backend = MemoryBackend(max_buckets=10)
+    for n in range(100):
+        assert backend.take(f'ip:{n}', 1.0, 5, 0.0) == 0.0
+    assert len(backend) == 10
+
+
+def test_eviction_prefers_refilled_buckets_by_their_own_rule():
+    backend = MemoryBackend(max_buckets=2)
+    backend.take('slow', 0.001, 5, 0.0)
+    backend.take('fast', 100.0, 5, 0.0)
+    backend.take('new', 1.0, 5, 1.0)
+    # 'slow' is older but has not refilled under its own rule; 'fast' has
+    assert set(backend._buckets) == {'slow', 'new'}
+
+
+def test_sqlite_backend_shares_and_prunes(tmp_path):
+    path = str(tmp_path / 'limits.db')
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    assert first.take('k', 1.0, 1, 100.0) == 0.0
+    assert second.take('k', 1.0, 1, 100.0) == 1.0
+    second.take('old', 1.0, 1, 0.0)
+    second.prune(100.0 + SQLiteBackend.IDLE_TTL - 50)
+    keys = [key for key, in sqlite3.connect(path).execute("SELECT key FROM rate_buckets")]
+    assert keys == ['k']
+
+
+def test_client_keys_ignore_cookies():
+    app = Flask(__name__)
+    with app.test_request_context('/', environ_base={'REMOTE_ADDR': '10.1.2.3'},
+                                  headers={'Cookie': 'session=anything'}):
+        assert client_keys() == ['ip:10.1.2.3']
+
+
+def test_decorator_returns_429_and_honours_exemptions():
+    app = Flask(__name__)
+    limiter = RateLimiter({'r': (60, 1)}, exempt=['10.0.0.9'])
+    app.add_url_rule('/', 'view', rate_limited(limiter, 'r')(lambda: 'ok'))
+    client = app.test_client()
+    assert client.get('/').status_code == 200
+    response = client.get('/')
+    assert response.status_code == 429 and response.headers['Retry-After'] == '1'
+    exempt = app.test_client()
+    for _ in range(3):
+        assert exempt.get('/', environ_base={'REMOTE_ADDR': '10.0.0.9'}).status_code == 200
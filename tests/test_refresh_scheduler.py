@@ -0,0 +1,116 @@
+import time
+from datetime import datetime, timedelta
+
+from case_id import CaseId
+from refresh_scheduler import (CaseCache, CaseRefreshScheduler, HOUR, MINUTE, parse_hearing_date,
+                               refresh_interval)
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def scheduler(tmp_path, fetch=None):
+    return CaseRefreshScheduler(fetch or (lambda *parts: {}), CaseCache(), db_path=str(tmp_path / 'q.db'),
+                                jitter=0.0)
+
+
+def hearing_in(days):
+    return {'case_status': 'Pending', 'next_hearing_date': (NOW + timedelta(days=days)).strftime('%d-%m-%Y')}
+
+
+def test_parse_hearing_date():
+    assert parse_hearing_date('05-01-2026') == datetime(2026, 1, 5)
+    assert parse_hearing_date('2026-01-05') == datetime(2026, 1, 5)
+    assert parse_hearing_date('To be scheduled') is None
+
+
+def test_refresh_interval_by_status_and_hearing():
+    assert refresh_interval({'case_status': 'Disposed'}, NOW)[0] == 24 * HOUR
+    assert refresh_interval({'case_status': 'Pending'}, NOW)[0] == 30 * MINUTE
+    assert refresh_interval(hearing_in(2), NOW)[0] == 15 * MINUTE
+    assert refresh_interval(hearing_in(5), NOW)[0] == HOUR
+    assert refresh_interval(hearing_in(30), NOW)[0] == 6 * HOUR
+
+
+def test_priority_orders_equal_due_times(tmp_path):
+    s = scheduler(tmp_path)
+    due = time.time() + HOUR
+    s._schedule(CaseId.of('CR', 1, 2016), due, priority=float('inf'))
+    s._schedule(CaseId.of('CR', 2, 2016), due + 1, priority=0.5)
+    s._schedule(CaseId.of('CR', 3, 2016), due + 2, priority=3)
+    order = [entry[2].case_number for entry in sorted(s._heap)]
+    assert order == ['2', '3', '1']
+
+
+def test_watch_without_record_never_pulls_a_refresh_forward(tmp_path):
+    s = scheduler(tmp_path)
+    case_id = CaseId.of('CR', 1, 2016)
+    s.watch(case_id, {'case_status': 'Disposed'})
+    due = s._due[case_id]
+    for _ in range(5):
+        s.watch(case_id)
+    assert s._due[case_id] == due
+    # Nor while it is being refreshed
+    s._due[case_id] = float('inf')
+    s.watch(case_id)
+    assert s._due[case_id] == float('inf')
+
+
+def test_new_case_is_fetched_soon(tmp_path):
+    s = scheduler(tmp_path)
+    case_id = CaseId.of('CR', 1, 2016)
+    s.watch(case_id)
+    assert s._due[case_id] <= time.time() + MINUTE
+
+
+def test_refresh_caches_record(tmp_path):
+    seen = []
+    s = scheduler(tmp_path, lambda *parts: {'case_status': 'Pending', 'parts': parts})
+    s.on_record = lambda case_id, record: seen.append(case_id)
+    case_id = CaseId.of('CR', 1, 2016)
+    s._slots.acquire()
+    s._refresh(case_id)
+    assert s.cache.get(case_id, 60)['parts'] == ('CR', '1', '2016')
+    assert seen == [case_id] and s._due[case_id] > time.time() + 29 * MINUTE
+
+
+def test_error_records_stop_being_watched(tmp_path):
+    s = scheduler(tmp_path, lambda *parts: {'error': 'bad input'})
+    case_id = CaseId.of('CR', 1, 2016)
+    s.watch(case_id)
+    s._slots.acquire()
+    s._refresh(case_id)
+    assert case_id not in s._due
+
+
+def test_not_found_records_are_not_cached_or_recorded(tmp_path):
+    seen = []
+    s = scheduler(tmp_path, lambda *parts: {'status': 'Not Found', 'result': False})
+    s.on_record = lambda case_id, record: seen.append(case_id)
+    case_id = CaseId.of('CR', 1, 2016)
+    s._slots.acquire()
+    s._refresh(case_id)
+    assert s.cache.get(case_id, 60) is None and seen == []
+    assert s._due[case_id] > time.time()
+
+
+def test_case_cache_is_bounded_lru():
+    cache = CaseCache(max_entries=2)
+    first, second, third = (CaseId.of('CR', n, 2016) for n in (1, 2, 3))
+    cache.put(first, {'n': 1})
+    cache.put(second, {'n': 2})
+    assert cache.get(first, 60) == {'n': 1}
+    cache.put(third, {'n': 3})
+    assert len(cache) == 2
+    assert cache.get(second, float('inf')) is None
+    assert cache.get(first, 60) == {'n': 1} and cache.get(third, 60) == {'n': 3}
+
+
+def test_case_cache_drops_expired_entries_on_read():
+    cache = CaseCache(ttl=10)
+    case_id = CaseId.of('CR', 1, 2016)
+    cache._records[case_id] = ({'n': 1}, time.time() - 5)
+    # Older than max_age but within ttl: kept for stale reads
+    assert cache.get(case_id, 1) is None and cache.get(case_id, float('inf')) == {'n': 1}
+    cache._records[case_id] = ({'n': 1}, time.time() - 11)
+    assert cache.get(case_id, float('inf')) is None
+    assert len(cache) == 0
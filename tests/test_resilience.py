@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from case_id import CaseId
+from portal_client import PortalClient, is_upstream_failure
+from resilience import CircuitBreaker, LatencyTracker, ResilientCaller, UpstreamUnavailable
+from upstream_stub import start_stub
+
+CASE = CaseId.of('CR', 1205, 2016)
+
+
+@pytest.fixture
+def stub():
+    server = start_stub()
+    yield server
+    server.shutdown()
+
+
+def set_faults(server, **faults):
+    requests.post(f"http://127.0.0.1:{server.server_port}/_faults", json=faults, timeout=5).raise_for_status()
+
+
+def test_latency_percentile():
+    tracker = LatencyTracker(size=10)
+    for value in range(20):
+        tracker.add(value)
+    assert len(tracker) == 10
+    assert tracker.percentile(0.5) == 15
+
+
+def test_breaker_half_open_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedge_delay_is_capped_when_the_tail_is_wide():
+    caller = ResilientCaller(max_hedge_delay=0.2)
+    caller.breaker('case')
+    for n in range(100):
+        caller._latencies['case'].add(2.0 if n % 3 == 0 else 0.01)
+    assert caller.hedge_delay('case') == pytest.approx(0.2)
+
+
+def test_breaker_opens_after_failures_against_stub(stub):
+    caller = ResilientCaller(timeout=1, failure_threshold=3, reset_timeout=60, max_hedges=0)
+    client = PortalClient(f"http://127.0.0.1:{stub.server_port}", caller, timeout=1)
+    assert client.fetch_case(CASE)['case_id'] == str(CASE)
+    set_faults(stub, down=True)
+    for _ in range(3):
+        with pytest.raises(UpstreamUnavailable):
+            client.fetch_case(CASE)
+    assert caller.breaker('case').state == CircuitBreaker.OPEN
+    set_faults(stub, down=False)
+    with pytest.raises(UpstreamUnavailable, match='circuit open'):
+        client.fetch_case(CASE)
+
+
+def test_hedge_fires_after_delay_against_stub(stub):
+    # Every first attempt hits the slow tail; the stub answers the rest at once
+    set_faults(stub, slow_rate=1.0, slow_latency=2.0)
+    client = PortalClient(f"http://127.0.0.1:{stub.server_port}",
+                          ResilientCaller(timeout=5, initial_hedge_delay=0.1), timeout=5)
+    attempts = []
+    original = client._get_case
+
+    def get_case(case_id):
+        attempts.append(time.monotonic())
+        if len(attempts) == 2:
+            set_faults(stub, slow_rate=0.0)
+        return original(case_id)
+
+    client._get_case = get_case
+    started = time.monotonic()
+    assert client.fetch_case(CASE)['case_id'] == str(CASE)
+    assert time.monotonic() - started < 1.0
+    assert len(attempts) == 2 and attempts[1] - attempts[0] >= 0.09
+
+
+def test_hedging_trims_the_slow_tail_against_stub(stub):
+    set_faults(stub, slow_rate=0.2, slow_latency=2.0)
+    client = PortalClient(f"http://127.0.0.1:{stub.server_port}", ResilientCaller(timeout=5), timeout=5)
+    latencies = []
+    lock = threading.Lock()
+
+    def run():
+        for _ in range(15):
+            started = time.monotonic()
+            client.fetch_case(CASE)
+            with lock:
+                latencies.append(time.monotonic() - started)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Without hedging about 12 of the 60 would take 2 s; with two hedges ~0.5
+    assert sum(latency > 1.0 for latency in latencies) <= 4
+
+
+def test_client_errors_are_not_hedged_and_leave_the_breaker_closed(stub):
+    caller = ResilientCaller(timeout=1, failure_threshold=2, reset_timeout=60, is_failure=is_upstream_failure)
+    # The stub answers 404 for anything outside /case
+    client = PortalClient(f"http://127.0.0.1:{stub.server_port}/missing", caller, timeout=1)
+    attempts = []
+    original = client._get_case
+
+    def get_case(case_id):
+        attempts.append(case_id)
+        return original(case_id)
+
+    client._get_case = get_case
+    for _ in range(5):
+        with pytest.raises(requests.HTTPError):
+            client.fetch_case(CASE)
+    assert len(attempts) == 5
+    assert caller.breaker('case').state == CircuitBreaker.CLOSED
+
+    # 5xx answers still count
+    set_faults(stub, down=True)
+    client = PortalClient(f"http://127.0.0.1:{stub.server_port}", caller, timeout=1)
+    for _ in range(2):
+        with pytest.raises(UpstreamUnavailable):
+            client.fetch_case(CASE)
+    assert caller.breaker('case').state == CircuitBreaker.OPEN
+
+
+def test_client_error_ends_a_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_response()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+
+def test_portal_404_is_a_not_found_result(stub, monkeypatch):
+    import portal_client
+    from scraper_enhanced import fetch_case_data
+    client = PortalClient(f"http://127.0.0.1:{stub.server_port}/missing", timeout=1)
+    monkeypatch.setattr(portal_client, 'client_for', lambda court=None: client)
+    result = fetch_case_data('CR', '1205', '2016')
+    assert result['result'] is False and result['status'] == 'Not Found'
@@ -0,0 +1,72 @@
+import gzip
+import json
+
+from case_id import CaseId
+from serialization import EncodedCache
+
+
+def test_encoded_once_per_key():
+    cache = EncodedCache()
+    calls = []
+    build = lambda: calls.append(1) or {'case_id': 'CR/1/2016', 'title': 'Ā'}
+    first = cache.get(('CR/1/2016', 'v1', ()), build)
+    assert cache.get(('CR/1/2016', 'v1', ()), build) is first
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+    assert json.loads(first.body) == {'case_id': 'CR/1/2016', 'title': 'Ā'}
+    assert gzip.decompress(first.gzipped()) == first.body
+
+
+def test_source_identity_invalidates():
+    cache = EncodedCache()
+    record = {'status': 'Pending'}
+    first = cache.get('key', lambda: record, source=record)
+    assert cache.get('key', lambda: record, source=record) is first
+    refreshed = {'status': 'Disposed'}
+    second = cache.get('key', lambda: refreshed, source=refreshed)
+    assert second is not first and second.etag != first.etag
+
+
+def test_missing_record_is_not_cached():
+    cache = EncodedCache()
+    assert cache.get('key', lambda: None) is None
+    assert len(cache) == 0
+
+
+def test_etag_and_gzip_revalidation(client):
+    response = client.get('/api/cases/CRM/1234/2020')
+    assert response.status_code == 200 and response.headers['Vary'] == 'Accept-Encoding'
+    etag = response.headers['ETag']
+    assert client.get('/api/cases/CRM/1234/2020', headers={'If-None-Match': etag}).status_code == 304
+
+    zipped = client.get('/api/cases/CRM/1234/2020', headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert zipped.headers['ETag'] != etag
+    assert gzip.decompress(zipped.data) == response.data
+
+
+def test_fields_projection(client):
+    data = client.get('/api/cases/CRM/1234/2020?fields=case_id,judgment.missing').get_json()
+    assert data == {'case_id': 'CRM/1234/2020'}
+
+
+def test_api_serves_complete_fetched_record(app_module, client):
+    case_id = CaseId.of('CRM', '1234', '2020')
+    stored = client.get('/api/cases/CRM/1234/2020').get_json()
+    fetched = dict(stored, case_status='Disposed by fetch')
+    app_module.shards.put(case_id, fetched)
+    try:
+        assert client.get('/api/cases/CRM/1234/2020').get_json()['case_status'] == 'Disposed by fetch'
+        assert client.get('/api/cases/CRM/1234/2020?fields=case_status').get_json() == {
+            'case_status': 'Disposed by fetch'}
+    finally:
+        app_module.shards.put(case_id, stored)
+
+
+def test_not_found_lookup_is_404_and_not_kept(app_module, lookup, client):
+    response = lookup('WP', '4321', '2019')
+    assert response.status_code == 404 and b'Not Found' in response.data
+    # Neither cached, served by the API nor recorded as a version
+    assert app_module.shards.get(CaseId.of('WP', 4321, 2019), float('inf')) is None
+    assert client.get('/api/cases/WP/4321/2019').status_code == 404
+    app_module.shards.shard_for('WP/4321/2019').storage.refresh()
+    assert client.get('/history/WP/4321/2019').get_json()['versions'] == []
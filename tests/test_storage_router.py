@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+from storage_router import StorageRouter
+
+
+def test_replica_refresh_failures_are_logged(tmp_path, caplog):
+    router = StorageRouter(str(tmp_path / 'primary.db'), str(tmp_path / 'replica.db'), refresh_interval=0.01)
+    router.start()
+    try:
+        def refresh():
+            raise sqlite3.OperationalError('disk I/O error')
+        router.refresh = refresh
+        router._stop.wait(0.2)
+    finally:
+        router.stop()
+        router._thread.join(2)
+    failures = [record for record in caplog.records if record.getMessage().startswith('Replica refresh')]
+    assert failures and failures[0].levelname == 'ERROR' and failures[0].exc_info
+
+
+def test_reads_come_from_the_replica(tmp_path):
+    router = StorageRouter(str(tmp_path / 'primary.db'), str(tmp_path / 'replica.db'))
+    router.log_query('CR', '1', '2016')
+    router.log_query('CR', '1', '2016')
+    router.log_query('MACP', '2', '2025')
+    assert router.stats()['total_queries'] == 3
+    router.log_query('WP', '3', '2019')
+    # Not visible until the next refresh
+    assert router.stats()['total_queries'] == 3
+    router.refresh()
+    stats = router.stats()
+    assert stats['total_queries'] == 4
+    assert stats['top_cases'][0] == {'case_id': 'CR/1/2016', 'count': 2}
+    assert router.top_cases(7, 1) == [('CR', '1', '2016')]
+    conn = router.read()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO queries (case_type) VALUES ('X')")
+    finally:
+        conn.close()
@@ -0,0 +1,31 @@
+from suggest import SuggestIndex, party_names
+
+
+def test_party_names_from_both_layouts():
+    record = {'petitioner': 'A', 'parties': {'respondent': [{'name': 'B'}], 'witness': 'C'}}
+    assert party_names(record) == ['A', 'B', 'C']
+
+
+def test_prefix_matches_case_ids_and_inner_words():
+    index = SuggestIndex()
+    index.add_case('CR/1205/2016', ['Krishan Kumar'])
+    assert [hit['case_id'] for hit in index.search('cr/12')] == ['CR/1205/2016']
+    assert index.search('kumar')[0]['label'] == 'Krishan Kumar'
+    assert index.search('1205')[0]['kind'] == 'case'
+    assert index.search('  ') == []
+
+
+def test_duplicates_are_indexed_once():
+    index = SuggestIndex()
+    index.add_case('CR/1/2016', ['A B'])
+    size = len(index)
+    index.add_case('CR/1/2016', ['A B'])
+    assert len(index) == size
+
+
+def test_lookup_indexes_real_parties(client, lookup):
+    assert lookup('CR', '1205', '2016').status_code == 200
+    suggestions = client.get('/suggest?q=sunita').get_json()['suggestions']
+    assert 'CR/1205/2016' not in [hit['case_id'] for hit in suggestions]
+    suggestions = client.get('/suggest?q=krishan').get_json()['suggestions']
+    assert 'CR/1205/2016' in [hit['case_id'] for hit in suggestions]
@@ -0,0 +1,78 @@
+import json
+
+from flask import Flask, g
+
+from replay import Replayer, compare, load_events, stand_in_number, summarize
+from traffic_capture import TrafficCapture, log_files
+
+
+def capture_app(tmp_path, **kwargs):
+    app = Flask(__name__)
+    capture = TrafficCapture('secret', str(tmp_path / 'traffic'), sample_rate=1, **kwargs)
+    capture.init_app(app)
+
+    @app.route('/result', methods=['POST'])
+    def result():
+        g.captcha_failed = app.config.get('fail', False)
+        return 'ok'
+
+    @app.route('/stats')
+    def stats():
+        return 'not captured'
+
+    return app, capture
+
+
+def test_captures_anonymized_lookups(tmp_path):
+    app, capture = capture_app(tmp_path)
+    client = app.test_client()
+    client.post('/result', data={'case_type': 'CR', 'case_number': '1205', 'filing_year': '2016',
+                                 'captcha_token': 'tok', 'captcha': 'ANSWER'})
+    client.get('/stats')
+    app.config['fail'] = True
+    client.post('/result', data={'case_type': 'CR', 'case_number': '1205', 'filing_year': '2016'})
+    capture.stop()
+    events = load_events([str(tmp_path / 'traffic')])
+    assert len(events) == 2 and events[1]['params']['captcha_ok'] is False
+    event = events[0]
+    assert event['path'] == '/result' and event['status'] == 200
+    assert event['params'] == {'case_type': 'CR', 'case_number': capture.digest('1205'),
+                               'filing_year': '2016', 'captcha_ok': True}
+    text = json.dumps(event)
+    assert '1205' not in text and 'ANSWER' not in text and 'tok' not in text
+
+
+def test_rotation_keeps_backups(tmp_path):
+    app, capture = capture_app(tmp_path, max_bytes=200, backups=2)
+    client = app.test_client()
+    for _ in range(20):
+        client.post('/result', data={'case_type': 'CR', 'case_number': '1', 'filing_year': '2016'})
+    capture.stop()
+    files = log_files(str(tmp_path / 'traffic'))
+    assert len(files) == 3 and files[-1].endswith('capture.jsonl')
+
+
+def test_sampling_is_per_client():
+    capture = TrafficCapture('secret', sample_rate=0.5)
+    clients = [capture.digest(f'10.0.0.{n}') for n in range(200)]
+    sampled = [capture._sampled(client) for client in clients]
+    assert 50 < sum(sampled) < 150
+    assert sampled == [capture._sampled(client) for client in clients]
+
+
+def test_replay_helpers():
+    assert stand_in_number('ffffffff00') == stand_in_number('ffffffff11')
+    assert 1 <= int(stand_in_number('0123abcd')) <= 99999
+    assert summarize([]) == {'count': 0}
+    summary = summarize([float(n) for n in range(1, 101)])
+    assert summary['p50'] == 51 and summary['p99'] == 100 and summary['mean'] == 50.5
+    report = lambda p99: {'routes': {'/result': {'summary': {'count': 1, 'p50': 10, 'p90': 10,
+                                                             'p99': p99, 'mean': 10}}}}
+    lines = compare(report(20), report(30))
+    assert any(line.split()[:2] == ['/result', 'p99'] and line.endswith('+50.0%') for line in lines)
+
+
+def test_replayer_solves_captchas_locally(app_module):
+    replayer = Replayer('http://unused', app_module.app.secret_key)
+    token = app_module.captcha_tokens.issue()
+    assert replayer.tokens.text_for(token) == app_module.captcha_tokens.text_for(token)
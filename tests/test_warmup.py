@@ -0,0 +1,69 @@
+import threading
+import time
+
+from case_id import CaseId
+from warmup import CacheWarmer, RenderedResults
+
+
+def test_rendered_results_follow_record_identity():
+    pages = RenderedResults(max_entries=2)
+    case_id = CaseId.of('CR', 1, 2016)
+    record = {'status': 'Pending'}
+    pages.put(case_id, record, '<html>')
+    assert pages.get(case_id, record) == '<html>'
+    assert pages.get(case_id, dict(record)) is None
+    pages.put(CaseId.of('CR', 2, 2016), {}, '')
+    pages.put(CaseId.of('CR', 3, 2016), {}, '')
+    assert pages.get(case_id, record) is None
+
+
+def test_warmer_counts_outcomes():
+    cases = [CaseId.of('CR', n, 2016) for n in range(1, 7)]
+    warmer = CacheWarmer(lambda: cases, lambda case_id: int(case_id.case_number) % 3 != 0, concurrency=2)
+    assert warmer.ready
+    warmer.start()
+    warmer._thread.join(5)
+    assert warmer.ready
+    assert warmer.status()['warmed'] == 4 and warmer.status()['failed'] == 2
+
+
+def test_warmer_is_ready_after_timeout():
+    release = threading.Event()
+    warmer = CacheWarmer(lambda: [CaseId.of('CR', n, 2016) for n in range(1, 4)],
+                         lambda case_id: release.wait(5), concurrency=1, timeout=0.1)
+    warmer.start()
+    assert not warmer.ready
+    time.sleep(0.15)
+    assert warmer.ready
+    release.set()
+    warmer._thread.join(5)
+    assert warmer.status()['skipped'] == 2
+
+
+def test_ready_endpoint(client):
+    response = client.get('/ready')
+    assert response.status_code == 200 and response.get_json()['ready']
+
+
+def test_invalid_input_is_not_fetched_or_cached(app_module, lookup):
+    before = len(app_module.rendered_results)
+    response = lookup('', '12', '2016')
+    assert b'Case type is required' in response.data
+    assert b'NONE/12/2016' not in response.data
+    assert b'Case number must be numeric' in lookup('CR', 'abc', '2016').data
+    assert len(app_module.rendered_results) == before
+
+
+def test_warmer_logs_failures_with_traceback(caplog):
+    def warm(case_id):
+        raise RuntimeError('upstream down')
+
+    def cases():
+        raise OSError('query log missing')
+
+    for warmer in (CacheWarmer(lambda: [CaseId.of('CR', 1, 2016)], warm), CacheWarmer(cases, warm)):
+        warmer.start()
+        warmer._thread.join(5)
+    messages = [(record.levelname, record.getMessage()) for record in caplog.records if record.exc_info]
+    assert ('ERROR', 'Warm-up of CR/1/2016 failed') in messages
+    assert ('ERROR', 'Warm-up case list unavailable') in messages
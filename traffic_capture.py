@@ -0,0 +1,158 @@
+"""
+Sampled capture of production traffic for replay
+A sampled share of clients has its requests to /, /captcha and /result written
+to a rotating JSONL log under traffic/, with the time taken and anonymized
+parameters: case numbers and client addresses become keyed digests (the same
+case or client always gets the same digest), CAPTCHA tokens and answers are
+dropped. Clients rather than requests are sampled so a captured visitor's whole
+page -> CAPTCHA -> lookup flow is kept. Lines are written by a background
+thread, so a request never waits on the disk. replay.py re-drives the log.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from flask import Flask, g, request
+
+CAPTURED_PATHS = ('/', '/captcha', '/result')
+CURRENT_FILE = 'capture.jsonl'
+
+
+class TrafficCapture:
+    """Flask hooks that sample requests into a size-rotated JSONL log"""
+
+    def __init__(self, secret_key: str, log_dir: Optional[str] = None, sample_rate: Optional[float] = None,
+                 max_bytes: int = 64 * 1024 * 1024, backups: int = 10):
+        # backups: rotated files kept besides the current one (at least 1)
+        self._key = hashlib.sha256(b'traffic:' + secret_key.encode('utf-8')).digest()
+        self.log_dir = log_dir or os.environ.get('TRAFFIC_DIR', 'traffic')
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.environ.get('TRAFFIC_SAMPLE_RATE', 0))
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.captured = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=10000)
+        self._thread = None
+
+    def digest(self, value: str) -> str:
+        """Stable keyed digest standing in for an identifying value"""
+        return hmac.new(self._key, value.encode('utf-8'), hashlib.sha256).hexdigest()[:16]
+
+    def _sampled(self, client: str) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        # The digest is uniform, so its leading bits decide consistently per client
+        return int(client[:8], 16) < self.sample_rate * 0xFFFFFFFF
+
+    def init_app(self, app: Flask):
+        """Register the capture hooks; does nothing while the sample rate is 0"""
+        if self.sample_rate <= 0:
+            return
+        app.before_request(self._before)
+        app.after_request(self._after)
+        self.start()
+
+    def _before(self):
+        if request.path in CAPTURED_PATHS:
+            client = self.digest(request.remote_addr or '')
+            if self._sampled(client):
+                g.traffic_capture = (client, time.time(), time.perf_counter())
+
+    def _after(self, response):
+        captured = g.pop('traffic_capture', None)
+        if captured is not None:
+            client, started, start = captured
+            self._enqueue({
+                't': round(started, 3),
+                'ms': round((time.perf_counter() - start) * 1000, 2),
+                'client': client,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'params': self._params(),
+            })
+        return response
+
+    def _params(self) -> Dict[str, Any]:
+        if request.path != '/result':
+            return {}
+        form = request.form
+        # Case type and year are coarse enough to keep; the number identifies a case
+        return {
+            'case_type': form.get('case_type', ''),
+            'case_number': self.digest(form.get('case_number', '')),
+            'filing_year': form.get('filing_year', ''),
+            # Set by the view, so replay reproduces failed attempts as failures
+            'captcha_ok': not g.get('captcha_failed', False),
+        }
+
+    def _enqueue(self, event: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Losing samples beats slowing the request down
+            self.dropped += 1
+
+    def _path(self) -> str:
+        return os.path.join(self.log_dir, CURRENT_FILE)
+
+    def _rotate(self):
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        os.replace(self._path(), os.path.join(self.log_dir, f"capture-{stamp}.jsonl"))
+        # The current file was just moved, so everything listed is a rotated file
+        for old in log_files(self.log_dir)[:-self.backups]:
+            os.remove(old)
+
+    def _run(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        log = open(self._path(), 'a', encoding='ascii')
+        size = log.tell()
+        try:
+            while True:
+                event = self._queue.get()
+                if event is None:
+                    break
+                line = json.dumps(event, separators=(',', ':')) + '\n'
+                log.write(line)
+                size += len(line)
+                self.captured += 1
+                if size >= self.max_bytes:
+                    log.close()
+                    self._rotate()
+                    log = open(self._path(), 'a', encoding='ascii')
+                    size = 0
+                elif self._queue.empty():
+                    log.flush()
+        finally:
+            log.close()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Write out queued events and close the log"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def status(self) -> Dict[str, Any]:
+        return {'sample_rate': self.sample_rate, 'captured': self.captured, 'dropped': self.dropped}
+
+
+def log_files(log_dir: str) -> List[str]:
+    """Capture files in a directory, oldest first, the current file last"""
+    rotated = sorted(name for name in os.listdir(log_dir)
+                     if name.startswith('capture-') and name.endswith('.jsonl'))
+    if os.path.exists(os.path.join(log_dir, CURRENT_FILE)):
+        rotated.append(CURRENT_FILE)
+    return [os.path.join(log_dir, name) for name in rotated]
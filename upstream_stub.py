@@ -0,0 +1,214 @@
+"""
+Local stand-in for the court portal, with fault injection
+Serves GET /case/<type>/<number>/<year> from the mock case data so the portal
+client and resilience layer can be exercised without the real site. Faults
+(added latency, slow tail, errors, full outage) are set on the command line
+or changed at runtime with POST /_faults and a JSON body.
+
+With --require-session it also gates searches like the real portal: GET /session
+sets a session cookie and names a CAPTCHA, GET /captcha/<id> serves its text,
+and POST /session/verify with {"answer": ...} unlocks the session for a
+limited time and number of searches.
+
+Usage: python upstream_stub.py [--port 9100] [--latency 0.05] [--slow-rate 0.05]
+                               [--slow-latency 3] [--error-rate 0] [--down]
+                               [--require-session] [--session-ttl 300]
+                               [--session-budget 100] [--session-delay 0.5]
+"""
+
+import argparse
+import json
+import random
+import secrets
+import string
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+from scraper_enhanced import mock_case_data
+
+SESSION_COOKIE = 'PORTALSESSID'
+
+
+class Faults:
+    """Fault settings shared by all request handlers"""
+
+    FIELDS = ('latency', 'slow_rate', 'slow_latency', 'error_rate', 'down')
+
+    def __init__(self, latency: float = 0.0, slow_rate: float = 0.0, slow_latency: float = 3.0,
+                 error_rate: float = 0.0, down: bool = False):
+        self.latency = latency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.down = down
+
+    def update(self, values: Dict[str, Any]):
+        for name in self.FIELDS:
+            if name in values:
+                setattr(self, name, type(getattr(self, name))(values[name]))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class PortalSessions:
+    """The stub's server-side session table"""
+
+    def __init__(self, required: bool = False, ttl: float = 300.0, budget: int = 100, delay: float = 0.0):
+        self.required = required
+        self.ttl = ttl
+        self.budget = budget
+        self.delay = delay
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self) -> str:
+        session_id = secrets.token_hex(16)
+        captcha = ''.join(random.choices(string.ascii_uppercase + string.digits, k=5))
+        with self._lock:
+            self._sessions[session_id] = {'captcha': captcha, 'verified': False,
+                                          'expires': time.time() + self.ttl, 'remaining': self.budget}
+        return session_id
+
+    def captcha(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+        return session['captcha'] if session else None
+
+    def verify(self, session_id: str, answer: str) -> bool:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session or session['verified'] or answer.upper() != session['captcha']:
+                return False
+            session['verified'] = True
+            return True
+
+    def use(self, session_id: Optional[str]) -> bool:
+        """Spend one search from a session's budget; False if it is not usable"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session or not session['verified']:
+                return False
+            if session['expires'] < time.time() or session['remaining'] <= 0:
+                del self._sessions[session_id]
+                return False
+            session['remaining'] -= 1
+            return True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = 'PortalStub/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: Dict[str, Any], session_id: Optional[str] = None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if session_id:
+            self.send_header('Set-Cookie', f"{SESSION_COOKIE}={session_id}; Path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _session_id(self) -> Optional[str]:
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _inject_faults(self) -> bool:
+        """Apply the configured faults; returns False if the request should fail"""
+        faults = self.server.faults
+        if faults.down:
+            self._send_json(503, {'error': 'Service unavailable'})
+            return False
+        delay = faults.latency
+        if random.random() < faults.slow_rate:
+            delay += faults.slow_latency
+        time.sleep(delay)
+        if random.random() < faults.error_rate:
+            self._send_json(500, {'error': 'Internal server error'})
+            return False
+        return True
+
+    def do_GET(self):
+        sessions = self.server.sessions
+        parts = self.path.strip('/').split('/')
+        if parts == ['session']:
+            # Establishing a session is the slow part of a real portal
+            time.sleep(sessions.delay)
+            session_id = sessions.create()
+            self._send_json(200, {'captcha_url': f"/captcha/{session_id}"}, session_id)
+        elif len(parts) == 2 and parts[0] == 'captcha' and sessions.captcha(parts[1]):
+            payload = sessions.captcha(parts[1]).encode('ascii')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        elif len(parts) == 4 and parts[0] == 'case':
+            if sessions.required and not sessions.use(self._session_id()):
+                self._send_json(401, {'error': 'Session expired'})
+            elif self._inject_faults():
+                self._send_json(200, mock_case_data(*parts[1:]))
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        sessions = self.server.sessions
+        if self.path == '/_faults':
+            self.server.faults.update(self._read_json())
+            self._send_json(200, self.server.faults.as_dict())
+        elif self.path == '/session/verify':
+            if sessions.verify(self._session_id() or '', str(self._read_json().get('answer', ''))):
+                self._send_json(200, {'ttl': sessions.ttl, 'budget': sessions.budget})
+            else:
+                self._send_json(403, {'error': 'Invalid CAPTCHA'})
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+
+def start_stub(port: int = 0, verbose: bool = False, require_session: bool = False,
+               session_ttl: float = 300.0, session_budget: int = 100, session_delay: float = 0.0,
+               **faults) -> ThreadingHTTPServer:
+    """Start a stub portal in a background thread; its URL is http://127.0.0.1:<server_port>"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.faults = Faults(**faults)
+    server.sessions = PortalSessions(require_session, session_ttl, session_budget, session_delay)
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fault-injecting court portal stub")
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--slow-rate', type=float, default=0.0)
+    parser.add_argument('--slow-latency', type=float, default=3.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--down', action='store_true')
+    parser.add_argument('--require-session', action='store_true')
+    parser.add_argument('--session-ttl', type=float, default=300.0)
+    parser.add_argument('--session-budget', type=int, default=100)
+    parser.add_argument('--session-delay', type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = start_stub(args.port, verbose=True, require_session=args.require_session,
+                        session_ttl=args.session_ttl, session_budget=args.session_budget,
+                        session_delay=args.session_delay, latency=args.latency, slow_rate=args.slow_rate,
+                        slow_latency=args.slow_latency, error_rate=args.error_rate, down=args.down)
+    print(f"Portal stub on http://127.0.0.1:{server.server_port} with faults {server.faults.as_dict()}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,114 @@
+"""
+Cache warm-up after a deploy
+On boot the most searched cases of the last few days (from the query log) are
+resolved through the normal fetch path, a few at a time, and their result pages
+rendered, so the first visitors after a restart find warm caches instead of
+queueing behind upstream fetches. Progress is reported by /ready; warm-up that
+runs past its deadline stops and the instance reports ready anyway.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional
+
+from case_id import CaseId
+
+logger = logging.getLogger(__name__)
+
+
+class RenderedResults:
+    """LRU of rendered result pages, valid while the cached record is the same object"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, case_id: CaseId, record: Dict[str, Any]) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(case_id)
+            # A refreshed record is a new dict, which invalidates the page
+            if entry is None or entry[0] is not record:
+                return None
+            self._entries.move_to_end(case_id)
+            return entry[1]
+
+    def put(self, case_id: CaseId, record: Dict[str, Any], html: str):
+        with self._lock:
+            self._entries[case_id] = (record, html)
+            self._entries.move_to_end(case_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class CacheWarmer:
+    """Warms a list of cases with bounded concurrency and tracks progress"""
+
+    PENDING, WARMING, DONE = 'pending', 'warming', 'done'
+
+    def __init__(self, cases: Callable[[], List[CaseId]], warm: Callable[[CaseId], bool],
+                 concurrency: int = 4, timeout: float = 120.0):
+        # warm(case_id) returns False for cases that could not be warmed
+        self.cases = cases
+        self.warm = warm
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.state = self.PENDING
+        self.total = self.warmed = self.failed = self.skipped = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _elapsed(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        return (self._finished_at or time.monotonic()) - self._started_at
+
+    def _warm_one(self, case_id: CaseId):
+        if self._elapsed() > self.timeout:
+            outcome = 'skipped'
+        else:
+            try:
+                outcome = 'warmed' if self.warm(case_id) else 'failed'
+            except Exception:
+                logger.exception("Warm-up of %s failed", case_id)
+                outcome = 'failed'
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def _run(self):
+        try:
+            cases = self.cases()
+        except Exception:
+            logger.exception("Warm-up case list unavailable")
+            cases = []
+        self.total = len(cases)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='warmup') as pool:
+            pool.map(self._warm_one, cases)
+        self._finished_at = time.monotonic()
+        self.state = self.DONE
+
+    def start(self):
+        if self._thread is None:
+            self._started_at = time.monotonic()
+            self.state = self.WARMING
+            self._thread = threading.Thread(target=self._run, name='cache-warmup', daemon=True)
+            self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        """Done, or out of time; a warm-up that never started does not hold readiness back"""
+        return self.state != self.WARMING or self._elapsed() > self.timeout
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'state': self.state, 'total': self.total, 'warmed': self.warmed,
+                    'failed': self.failed, 'skipped': self.skipped,
+                    'elapsed': round(self._elapsed(), 2)}